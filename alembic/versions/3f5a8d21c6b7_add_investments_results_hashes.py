@@ -0,0 +1,52 @@
+"""add investments results hashes
+
+Revision ID: 3f5a8d21c6b7
+Revises: 7c1e9b4f2a10
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3f5a8d21c6b7'
+down_revision: Union[str, None] = '7c1e9b4f2a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'investments_results',
+        sa.Column('file_hash', sa.String(length=64), nullable=True)
+    )
+    op.add_column(
+        'investments_results',
+        sa.Column('content_hash', sa.String(length=64), nullable=True)
+    )
+    op.create_index(
+        'ix_investments_results_file_hash',
+        'investments_results',
+        ['file_hash']
+    )
+    op.create_index(
+        'ix_investments_results_content_hash',
+        'investments_results',
+        ['content_hash']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'ix_investments_results_content_hash',
+        table_name='investments_results'
+    )
+    op.drop_index(
+        'ix_investments_results_file_hash',
+        table_name='investments_results'
+    )
+    op.drop_column('investments_results', 'content_hash')
+    op.drop_column('investments_results', 'file_hash')
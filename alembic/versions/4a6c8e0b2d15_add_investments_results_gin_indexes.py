@@ -0,0 +1,39 @@
+"""add investments results gin indexes
+
+Revision ID: 4a6c8e0b2d15
+Revises: 8d3f1b6e2c47
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '4a6c8e0b2d15'
+down_revision: Union[str, None] = '8d3f1b6e2c47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Индекс по created_at отдельно не создаётся: его роль выполняет
+# ix_investments_results_created_at_id (created_at — ведущая колонка)
+GIN_COLUMNS = ('distribution', 'enterprise_details')
+
+
+def upgrade() -> None:
+    for column in GIN_COLUMNS:
+        op.create_index(
+            f'ix_investments_results_{column}',
+            'investments_results',
+            [column],
+            postgresql_using='gin',
+            postgresql_ops={column: 'jsonb_path_ops'}
+        )
+
+
+def downgrade() -> None:
+    for column in GIN_COLUMNS:
+        op.drop_index(
+            f'ix_investments_results_{column}',
+            table_name='investments_results'
+        )
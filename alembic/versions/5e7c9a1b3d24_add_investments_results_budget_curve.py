@@ -0,0 +1,29 @@
+"""add investments results budget curve
+
+Revision ID: 5e7c9a1b3d24
+Revises: 9b2d4e6f8a13
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '5e7c9a1b3d24'
+down_revision: Union[str, None] = '9b2d4e6f8a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'investments_results',
+        sa.Column('budget_curve', sa.LargeBinary(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('investments_results', 'budget_curve')
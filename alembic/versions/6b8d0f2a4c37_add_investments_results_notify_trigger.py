@@ -0,0 +1,56 @@
+"""add investments results notify trigger
+
+Revision ID: 6b8d0f2a4c37
+Revises: 4a6c8e0b2d15
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '6b8d0f2a4c37'
+down_revision: Union[str, None] = '4a6c8e0b2d15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Совпадает с src.backend.services.read_cache.INVALIDATION_CHANNEL
+CHANNEL = 'investments_results_changed'
+
+
+def upgrade() -> None:
+    op.execute(f"""
+        CREATE FUNCTION notify_investments_results_changed() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                PERFORM pg_notify('{CHANNEL}', '');
+            ELSE
+                PERFORM pg_notify('{CHANNEL}', OLD.id::text);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    # Вставка меняет только последний результат, поэтому одно
+    # уведомление на оператор; изменение и удаление — по каждой записи
+    op.execute("""
+        CREATE TRIGGER investments_results_notify_insert
+        AFTER INSERT ON investments_results
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_investments_results_changed()
+    """)
+    op.execute("""
+        CREATE TRIGGER investments_results_notify_change
+        AFTER UPDATE OR DELETE ON investments_results
+        FOR EACH ROW EXECUTE FUNCTION notify_investments_results_changed()
+    """)
+
+
+def downgrade() -> None:
+    op.execute(
+        "DROP TRIGGER investments_results_notify_change ON investments_results"
+    )
+    op.execute(
+        "DROP TRIGGER investments_results_notify_insert ON investments_results"
+    )
+    op.execute("DROP FUNCTION notify_investments_results_changed()")
@@ -0,0 +1,51 @@
+"""create optimization jobs
+
+Revision ID: 7c1e9b4f2a10
+Revises: d2a3e54a402b
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e9b4f2a10'
+down_revision: Union[str, None] = 'd2a3e54a402b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'optimization_jobs',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column('file_name', sa.String(), nullable=False),
+        sa.Column('engine', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('payload', sa.LargeBinary(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('result', JSONB(), nullable=True),
+        sa.Column(
+            'result_id',
+            UUID(as_uuid=True),
+            sa.ForeignKey('investments_results.id', ondelete='SET NULL'),
+            nullable=True,
+        ),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(),
+                  onupdate=sa.func.now(), nullable=False)
+    )
+    op.create_index(
+        'ix_optimization_jobs_status', 'optimization_jobs', ['status']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_optimization_jobs_status', table_name='optimization_jobs')
+    op.drop_table('optimization_jobs')
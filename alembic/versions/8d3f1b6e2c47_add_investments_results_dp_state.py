@@ -0,0 +1,29 @@
+"""add investments results dp state
+
+Revision ID: 8d3f1b6e2c47
+Revises: 5e7c9a1b3d24
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3f1b6e2c47'
+down_revision: Union[str, None] = '5e7c9a1b3d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'investments_results',
+        sa.Column('dp_state', sa.LargeBinary(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('investments_results', 'dp_state')
@@ -0,0 +1,31 @@
+"""add investments results keyset index
+
+Revision ID: 9b2d4e6f8a13
+Revises: 3f5a8d21c6b7
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '9b2d4e6f8a13'
+down_revision: Union[str, None] = '3f5a8d21c6b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_investments_results_created_at_id',
+        'investments_results',
+        ['created_at', 'id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'ix_investments_results_created_at_id',
+        table_name='investments_results'
+    )
@@ -0,0 +1,29 @@
+"""add optimization jobs locked_until
+
+Revision ID: a7e2c4f6b8d1
+Revises: 6b8d0f2a4c37
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7e2c4f6b8d1'
+down_revision: Union[str, None] = '6b8d0f2a4c37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'optimization_jobs',
+        sa.Column('locked_until', sa.DateTime(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('optimization_jobs', 'locked_until')
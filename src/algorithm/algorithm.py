@@ -1,109 +1,169 @@
-from io import BytesIO
+from array import array
 
-import pandas as pd
-
-from src.backend.db.schemas.investments_results import \
-    InvestmentStatisticsSchema
+from src.algorithm.engines import (
+    OptimizationEngine,
+    choice_dtype,
+    optimize_numpy,
+    optimize_sparse,
+    top_k_allocations,
+)
+from src.algorithm.loaders import load_profit_table
+from src.algorithm.profit_table import ProfitTable
+from src.backend.db.schemas.investments_results import InvestmentStatisticsSchema
 
 
 class InvestmentOptimizer:
 
     @classmethod
-    def load_data_from_excel(cls, file_path):
+    def load_data_from_excel(cls, file_path) -> ProfitTable:
         """
-        Загружает данные из Excel файла по пути.
+        Загружает данные из файла по пути.
+        Помимо Excel принимает CSV, Parquet и .npy.
 
         Args:
-            file_path (str): Путь к Excel файлу с данными
+            file_path (str): Путь к файлу с данными
 
         Returns:
-            tuple: (investments, profits)
+            ProfitTable: Таблица инвестиций и прибыли
         """
-        df = pd.read_excel(file_path, header=None)
-        profit_table = df.values.tolist()
-
-        investments = [row[0] for row in profit_table]
-        profits = [row[1:] for row in profit_table]
-        return investments, profits
+        return load_profit_table(file_path)
 
     @classmethod
-    def load_data_from_excel_bytes(cls, file_bytes):
+    def load_data_from_excel_bytes(cls, file_bytes) -> ProfitTable:
         """
-        Загружает данные из Excel файла, переданного в виде байтов.
+        Загружает данные из файла, переданного в виде байтов.
+        Помимо Excel принимает CSV, Parquet и .npy.
 
         Args:
-            file_bytes (bytes): Байты Excel файла
+            file_bytes (bytes): Байты файла
 
         Returns:
-            tuple: (investments, profits)
+            ProfitTable: Таблица инвестиций и прибыли
         """
         try:
-            excel_io = BytesIO(file_bytes)
-            df = pd.read_excel(excel_io, header=None)
+            return load_profit_table(file_bytes)
+        except ValueError:
+            raise
         except Exception as e:
-            raise ValueError(f"Ошибка при чтении Excel: {e}")
-
-        profit_table = df.values.tolist()
-        investments = [row[0] for row in profit_table]
-        profits = [row[1:] for row in profit_table]
-        return investments, profits
+            raise ValueError(f"Ошибка при чтении файла: {e}") from e
 
     @classmethod
-    def load_data_from_array(cls, data_array):
+    def load_data_from_array(cls, data_array) -> ProfitTable:
         """
         Загружает данные из двумерного массива.
         """
-        investments = [row[0] for row in data_array]
-        profits = [row[1:] for row in data_array]
-        return investments, profits
+        return ProfitTable.from_rows(data_array)
 
     @classmethod
-    def get_profit(cls, profits, investments, e, x):
+    def get_profit(cls, table: ProfitTable, e, x):
         """
         Получает прибыль, если вложить x млн в e-е предприятие.
         """
-        i = investments.index(x)
-        return profits[i][e]
+        return table.get_profit(e, x)
 
     @classmethod
-    def optimize_investments(cls, investments, profits):
+    def optimize_investments(
+        cls,
+        table: ProfitTable,
+        engine=OptimizationEngine.NUMPY,
+        low_memory: bool | None = None,
+        progress=None
+    ):
         """
         Оптимизирует распределение инвестиций между предприятиями с использованием динамического программирования.
-        """
-        num_enterprises = len(profits[0])
-        num_invest_levels = len(investments)
 
-        dp = [[0] * num_invest_levels for _ in range(num_enterprises + 1)]
-        choice = [[0] * num_invest_levels for _ in range(num_enterprises + 1)]
+        Args:
+            table (ProfitTable): Таблица инвестиций и прибыли
+            engine (OptimizationEngine): Реализация ДП
+            low_memory (bool | None): Восстанавливать ответ по контрольным
+                точкам вместо хранения всех выборов (только для NumPy,
+                None — автоматически по размеру таблицы)
+            progress (callable | None): Хук progress(done, total), вызывается
+                после каждого предприятия; исключение из него прерывает расчёт
 
-        for i in range(1, num_enterprises + 1):
+        Returns:
+            tuple: (max_profit, distribution)
+        """
+        if not table.has_uniform_grid:
+            # Неравномерная сетка или свои точки у предприятий
+            return optimize_sparse(table, progress=progress)
+        if OptimizationEngine(engine) == OptimizationEngine.NUMPY:
+            return optimize_numpy(
+                table, low_memory=low_memory, progress=progress
+            )
+        return cls._optimize_python(table, progress=progress)
+
+    @classmethod
+    def _optimize_python(cls, table: ProfitTable, progress=None):
+        """
+        Эталонная реализация ДП на чистом Python.
+        """
+        investments = table.investments.tolist()
+        profits = table.profits.tolist()
+        num_enterprises = table.num_enterprises
+        num_invest_levels = table.num_levels
+
+        # Из строк ДП нужна только предыдущая, а выборы хранятся
+        # в самом узком беззнаковом типе
+        typecode = choice_dtype(num_invest_levels).char
+        prev = [0] * num_invest_levels
+        choice = []
+
+        for i in range(num_enterprises):
+            current = [0] * num_invest_levels
+            row_choice = array(typecode, bytes(
+                num_invest_levels * array(typecode).itemsize
+            ))
             for j in range(num_invest_levels):
                 best_profit = 0
                 best_k = 0
                 for k in range(j + 1):
-                    invest_in_this = investments[k]
-                    current_profit = dp[i-1][j-k] + cls.get_profit(profits, investments, i-1, invest_in_this)
+                    current_profit = prev[j-k] + profits[k][i]
                     if current_profit > best_profit:
                         best_profit = current_profit
                         best_k = k
-                dp[i][j] = best_profit
-                choice[i][j] = best_k
-
-        max_profit = dp[num_enterprises][num_invest_levels - 1]
+                current[j] = best_profit
+                row_choice[j] = best_k
+            prev = current
+            choice.append(row_choice)
+            if progress is not None:
+                progress(i + 1, num_enterprises)
+
+        max_profit = prev[num_invest_levels - 1]
         distribution = [0] * num_enterprises
         remaining_j = num_invest_levels - 1
-        for i in range(num_enterprises, 0, -1):
+        for i in range(num_enterprises - 1, -1, -1):
             k = choice[i][remaining_j]
-            distribution[i - 1] = investments[k]
+            distribution[i] = investments[k]
             remaining_j -= k
 
         return max_profit, distribution
 
+    @classmethod
+    def find_top_allocations(cls, table: ProfitTable, top_k: int, progress=None):
+        """
+        Находит top_k лучших различных распределений за один проход ДП.
+
+        Args:
+            table (ProfitTable): Таблица инвестиций и прибыли
+            top_k (int): Сколько распределений вернуть
+            progress (callable | None): Хук progress(done, total), вызывается
+                после каждого предприятия; исключение из него прерывает расчёт
+
+        Returns:
+            list: [{'profit': ..., 'distribution': [...]}, ...] по убыванию прибыли
+        """
+        return [
+            {'profit': profit, 'distribution': distribution}
+            for profit, distribution in top_k_allocations(
+                table, top_k, progress=progress
+            )
+        ]
+
     @classmethod
     def get_investment_stats(
         cls,
-        investments,
-        profits,
+        table: ProfitTable,
         distribution
     ) -> InvestmentStatisticsSchema:
         """
@@ -116,7 +176,8 @@ class InvestmentOptimizer:
         total_profit = 0
 
         for i, invest in enumerate(distribution):
-            profit = cls.get_profit(profits, investments, i, invest) if invest in investments else 0
+            row = table.row_of(invest)
+            profit = table.get_profit(i, invest) if row is not None else 0
             total_profit += profit
             enterprise_details.append({
                 'enterprise_id': i + 1,
@@ -132,36 +193,35 @@ class InvestmentOptimizer:
         return stats
 
     @classmethod
-    def run_investment_optimization(cls, data_source, is_file=True):
+    def run_investment_optimization(
+        cls,
+        data_source,
+        is_file=True,
+        engine=OptimizationEngine.NUMPY,
+        top_k=None
+    ):
         """
         Запускает полный процесс оптимизации инвестиций.
+
+        При заданном top_k в результат добавляются alternatives —
+        top_k лучших различных распределений, включая оптимальное.
         """
         if is_file:
             # data_source - путь к файлу
-            investments, profits = cls.load_data_from_excel(data_source)
+            table = cls.load_data_from_excel(data_source)
         else:
             # data_source - двумерный массив
-            investments, profits = cls.load_data_from_array(data_source)
+            table = cls.load_data_from_array(data_source)
 
-        max_profit, distribution = cls.optimize_investments(investments, profits)
+        max_profit, distribution = cls.optimize_investments(
+            table, engine=engine
+        )
         result = {
             'max_profit': max_profit,
             'distribution': distribution,
-            'statistics': cls.get_investment_stats(investments, profits, distribution)
+            'statistics': cls.get_investment_stats(table, distribution)
         }
+        if top_k:
+            result['alternatives'] = cls.find_top_allocations(table, top_k)
         return result
 
-
-# Пример использования
-if __name__ == "__main__":
-    # Запуск оптимизации напрямую с массивом данных
-    result = InvestmentOptimizer.run_investment_optimization(
-        data_source='example.xlsx',
-        is_file=True
-    )
-
-    # Вывод результатов
-    print(f"Максимальная суммарная прибыль: {result['max_profit']}")
-    print("\nОптимальное распределение инвестиций:")
-    for idx, val in enumerate(result['distribution'], start=1):
-        print(f"Предприятие {idx}: {val} млн")
@@ -0,0 +1,95 @@
+import io
+
+import numpy as np
+
+from src.algorithm.engines import backtrack, forward_choices
+
+
+class BudgetCurve:
+    """
+    Оптимальная прибыль для каждого уровня бюджета из одного прохода ДП.
+
+    Хранит последнюю строку ДП и матрицу выборов, поэтому распределение
+    для конкретного бюджета восстанавливается только по запросу за O(E).
+    """
+
+    __slots__ = ("choice", "investments", "profits")
+
+    def __init__(self, investments, profits, choice):
+        self.investments = np.asarray(investments)
+        self.profits = np.asarray(profits)
+        self.choice = np.asarray(choice)
+
+    @classmethod
+    def from_table(cls, table, progress=None) -> "BudgetCurve":
+        profits, choice = forward_choices(table, progress=progress)
+        return cls(table.investments, profits, choice)
+
+    @property
+    def num_levels(self) -> int:
+        return self.profits.shape[0]
+
+    def level_of(self, budget) -> int:
+        """
+        Номер наибольшего уровня, не превышающего бюджет.
+
+        Raises:
+            ValueError: Если бюджет меньше минимального уровня
+        """
+        level = int(np.searchsorted(self.investments, budget, side="right")) - 1
+        if level < 0:
+            raise ValueError(
+                f"Бюджет {budget} меньше минимального уровня "
+                f"{self.investments[0].item()}"
+            )
+        return min(level, self.num_levels - 1)
+
+    def allocation(self, level: int):
+        """
+        Оптимальная прибыль и распределение для уровня бюджета.
+        """
+        return (
+            self.profits[level].item(),
+            backtrack(self.investments, self.choice, level),
+        )
+
+    def at_budget(self, budget):
+        """
+        Оптимальная прибыль и распределение при бюджете budget.
+        """
+        return self.allocation(self.level_of(budget))
+
+    def points(self):
+        """
+        Кривая без распределений: [{'budget': ..., 'max_profit': ...}, ...].
+        """
+        return [
+            {'budget': budget, 'max_profit': profit}
+            for budget, profit in zip(
+                self.investments.tolist(), self.profits.tolist()
+            )
+        ]
+
+    def to_bytes(self) -> bytes:
+        """
+        Сжатое представление для хранения в БД.
+        """
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            investments=self.investments,
+            profits=self.profits,
+            choice=self.choice,
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BudgetCurve":
+        with np.load(io.BytesIO(data), allow_pickle=False) as arrays:
+            return cls(arrays["investments"], arrays["profits"], arrays["choice"])
+
+    def __repr__(self) -> str:
+        return (
+            f"<BudgetCurve(levels={self.num_levels}, "
+            f"enterprises={self.choice.shape[0]})>"
+        )
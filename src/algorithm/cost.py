@@ -0,0 +1,87 @@
+import math
+
+import numpy as np
+
+from src.algorithm.engines import LOW_MEMORY_CHOICE_CELLS, OptimizationEngine
+
+# Во сколько раз чистый Python медленнее NumPy на одну ячейку перебора
+PYTHON_ENGINE_WEIGHT = 30
+
+
+def estimate_cost(
+    table,
+    engine=OptimizationEngine.NUMPY,
+    top_k=None,
+    budget_curve=False,
+    dp_state=False,
+) -> float:
+    """
+    Оценка стоимости оптимизации в «ячейках перебора NumPy» по форме таблицы.
+
+    Плотная сетка: E · L(L + 1) / 2 (полный перебор, быстрый путь для
+    вогнутых столбцов не учитывается — оценка сверху). Разреженная —
+    см. sparse_cost. Режим с контрольными точками, таблицы ДП для what-if
+    и top-K добавляют свои проходы.
+    """
+    num_levels, num_enterprises = table.profits.shape
+    if not table.has_uniform_grid:
+        return sparse_cost(table)
+
+    dense_pass = num_enterprises * num_levels * (num_levels + 1) / 2
+    cost = dense_pass
+    if OptimizationEngine(engine) == OptimizationEngine.PYTHON and not (
+        budget_curve or dp_state
+    ):
+        cost *= PYTHON_ENGINE_WEIGHT
+    elif num_enterprises * num_levels > LOW_MEMORY_CHOICE_CELLS:
+        cost *= 2
+    if dp_state:
+        cost += dense_pass
+    if top_k:
+        cost += dense_pass * top_k
+    return cost
+
+
+def sparse_cost(table) -> float:
+    """
+    Оценка optimize_sparse сверху.
+
+    На шаге i граница Парето размера F склеивается со всеми B_i точками
+    предприятия и сортируется: F · B_i кандидатов, сортировка добавляет
+    множитель log2. F не больше произведения B_j уже пройденных
+    предприятий и числа различимых состояний: сумм трат до бюджета при
+    целых суммах и значений прибыли при целой прибыли. Если целых нет,
+    граница оценивается как L · E.
+    """
+    num_levels, num_enterprises = table.profits.shape
+    if table.is_sparse:
+        points = np.count_nonzero(~np.isnan(table.profits), axis=0) + 1
+    else:
+        points = np.full(num_enterprises, num_levels + 1)
+
+    max_frontier = math.inf
+    investments = table.investments
+    if investments.dtype.kind in "iu":
+        positive = investments[investments > 0]
+        step = int(np.gcd.reduce(positive)) if positive.size else 1
+        max_frontier = int(investments.max()) // step + 1
+    profits = table.profits
+    finite = profits[~np.isnan(profits)] if profits.dtype.kind == "f" else profits
+    if finite.size and np.all(np.mod(finite, 1) == 0):
+        if profits.dtype.kind == "f":
+            spread = np.nanmax(profits, axis=0) - np.minimum(
+                np.nanmin(profits, axis=0), 0
+            )
+        else:
+            spread = profits.max(axis=0) - np.minimum(profits.min(axis=0), 0)
+        max_frontier = min(max_frontier, float(spread.sum()) + 1)
+    if math.isinf(max_frontier):
+        max_frontier = num_levels * num_enterprises
+
+    cost = 0.0
+    frontier = 1.0
+    for count in points.tolist():
+        candidates = frontier * count
+        cost += candidates * max(1.0, math.log2(candidates))
+        frontier = min(candidates, max_frontier)
+    return cost
@@ -0,0 +1,490 @@
+import math
+from enum import Enum
+
+import numpy as np
+
+# Целые значения float64 до 2**52 складываются без округления,
+# поэтому на таких таблицах быстрый путь даёт тот же результат, что и эталон.
+_EXACT_FLOAT_LIMIT = 2.0 ** 52
+
+# Потолок размера временных матриц полного перебора (ячеек на блок строк)
+_DENSE_BLOCK_CELLS = 4_000_000
+
+# На коротких столбцах накладные расходы «разделяй и властвуй» больше,
+# чем выигрыш, и полный перебор оказывается быстрее
+_CONCAVE_MIN_LEVELS = 256
+
+# Начиная с такого размера матрицы выборов (E × L) включается режим
+# с контрольными точками вместо хранения всех выборов
+LOW_MEMORY_CHOICE_CELLS = 50_000_000
+
+
+class OptimizationEngine(str, Enum):
+    """Доступные реализации динамического программирования."""
+
+    PYTHON = "python"
+    NUMPY = "numpy"
+
+
+def is_concave(column: np.ndarray) -> bool:
+    """
+    Проверяет, что прибыль вогнута по сумме инвестиций:
+    приросты между соседними уровнями не возрастают.
+    """
+    if column.shape[0] < 3:
+        return True
+    return bool(np.all(np.diff(column, n=2) <= 0))
+
+
+def _is_exact(profits: np.ndarray) -> bool:
+    """
+    Быстрый путь опирается на неравенство Монжа, которое в арифметике
+    с плавающей точкой может нарушаться на ничьих. Поэтому он включается
+    только там, где сложение точное.
+    """
+    if profits.dtype.kind in "iu":
+        return True
+    if profits.dtype.kind != "f" or profits.size == 0:
+        return False
+    return bool(
+        np.all(np.mod(profits, 1) == 0)
+        and np.abs(profits).max() < _EXACT_FLOAT_LIMIT
+    )
+
+
+class _DenseConvolution:
+    """
+    Max-plus свёртка полным перебором точек разбиения: O(L²) на шаг.
+
+    Строки j обрабатываются блоками, чтобы временные матрицы занимали
+    не больше max_cells ячеек, а не L² целиком. Если вся матрица
+    помещается в один блок, индексы j - k строятся один раз.
+    """
+
+    def __init__(self, num_levels: int, max_cells: int = _DENSE_BLOCK_CELLS):
+        self.levels = np.arange(num_levels)
+        self.block_rows = max(1, min(num_levels, max_cells // max(num_levels, 1)))
+        self._index = None
+        if self.block_rows == num_levels:
+            self._index = self._block_index(self.levels)
+
+    def _block_index(self, rows: np.ndarray):
+        # Все k > j лежат правее диагонали, поэтому блок ограничен по k
+        ks = self.levels[:rows[-1] + 1]
+        shift = rows[:, None] - ks[None, :]
+        valid = shift >= 0
+        return ks, np.where(valid, shift, 0), valid
+
+    def __call__(self, prev: np.ndarray, column: np.ndarray):
+        if self._index is not None:
+            return self._convolve_block(prev, column, self.levels, self._index)
+
+        num_levels = self.levels.shape[0]
+        best_profit = np.empty(num_levels, dtype=np.result_type(prev, column))
+        best_k = np.empty(num_levels, dtype=np.intp)
+        for start in range(0, num_levels, self.block_rows):
+            rows = self.levels[start:start + self.block_rows]
+            best_profit[rows], best_k[rows] = self._convolve_block(
+                prev, column, rows, self._block_index(rows)
+            )
+        return best_profit, best_k
+
+    @staticmethod
+    def _convolve_block(prev, column, rows, index):
+        ks, shift, valid = index
+        # Недопустимые ячейки (k > j) заполняются нулём: выигрывать
+        # может только строго положительная прибыль, как в эталоне.
+        candidates = np.where(valid, prev[shift] + column[ks], 0)
+        block_k = candidates.argmax(axis=1)
+        return candidates[np.arange(rows.shape[0]), block_k], block_k
+
+
+def _concave_convolution(prev: np.ndarray, column: np.ndarray):
+    """
+    Max-plus свёртка с вогнутым столбцом за O(L log L).
+
+    Для вогнутого p матрица prev[i] + p[j - i] (строка j, источник i ≤ j)
+    удовлетворяет обратному условию Монжа, поэтому самый правый argmax
+    по i не убывает с ростом j. Строки обрабатываются методом «разделяй
+    и властвуй», причём все отрезки одного уровня рекурсии считаются
+    одной векторной операцией. Самый правый i соответствует наименьшему
+    k = j - i — то же правило выбора, что и в эталоне.
+    """
+    num_levels = prev.shape[0]
+    opt = np.zeros(num_levels, dtype=np.intp)
+
+    rows_lo = np.array([0], dtype=np.intp)
+    rows_hi = np.array([num_levels - 1], dtype=np.intp)
+    cols_lo = np.array([0], dtype=np.intp)
+    cols_hi = np.array([num_levels - 1], dtype=np.intp)
+
+    while rows_lo.size:
+        mid = (rows_lo + rows_hi) // 2
+        hi = np.minimum(cols_hi, mid)
+        lengths = hi - cols_lo + 1
+        starts = np.cumsum(lengths) - lengths
+
+        segment = np.repeat(np.arange(mid.size), lengths)
+        cols = np.arange(lengths.sum()) - starts[segment] + cols_lo[segment]
+        values = prev[cols] + column[mid[segment] - cols]
+
+        best = np.maximum.reduceat(values, starts)
+        rightmost = np.maximum.reduceat(
+            np.where(values == best[segment], cols, -1), starts
+        )
+        opt[mid] = rightmost
+
+        left = rows_lo < mid
+        right = mid < rows_hi
+        rows_lo, rows_hi, cols_lo, cols_hi = (
+            np.concatenate([rows_lo[left], mid[right] + 1]),
+            np.concatenate([mid[left] - 1, rows_hi[right]]),
+            np.concatenate([cols_lo[left], rightmost[right]]),
+            np.concatenate([rightmost[left], cols_hi[right]]),
+        )
+
+    best_k = np.arange(num_levels) - opt
+    return prev[opt] + column[best_k], best_k
+
+
+def choice_dtype(num_levels: int) -> np.dtype:
+    """
+    Самый узкий беззнаковый тип, в который помещается номер уровня.
+    """
+    return np.min_scalar_type(max(num_levels - 1, 0))
+
+
+class _Stepper:
+    """
+    Один шаг ДП по предприятию: свёртка и правило выбора эталона.
+    """
+
+    def __init__(self, profits: np.ndarray, concave_fast_path: bool):
+        self.profits = profits
+        self.fast_path = (
+            concave_fast_path
+            and profits.shape[0] >= _CONCAVE_MIN_LEVELS
+            and _is_exact(profits)
+        )
+        self.dense = None
+        self.choice_dtype = choice_dtype(profits.shape[0])
+
+    def __call__(self, prev: np.ndarray, enterprise: int):
+        column = self.profits[:, enterprise]
+        if self.fast_path and is_concave(column):
+            best_profit, best_k = _concave_convolution(prev, column)
+        else:
+            if self.dense is None:
+                self.dense = _DenseConvolution(self.profits.shape[0])
+            best_profit, best_k = self.dense(prev, column)
+        positive = best_profit > 0
+        prev = np.where(positive, best_profit, 0).astype(self.profits.dtype)
+        choice = np.where(positive, best_k, 0).astype(self.choice_dtype)
+        return prev, choice
+
+
+def optimize_numpy(
+    table,
+    concave_fast_path: bool = True,
+    low_memory: bool | None = None,
+    progress=None,
+):
+    """
+    Векторизованная реализация ДП на NumPy.
+
+    Каждый шаг по предприятию считается как max-plus свёртка предыдущей
+    строки ДП со столбцом прибыли, а выбор k берётся через argmax.
+    Правило выбора совпадает с эталоном: берётся наименьшее k с
+    максимальной прибылью, а неположительный максимум даёт 0 и k = 0.
+
+    Вогнутые столбцы при точной арифметике и достаточном числе уровней
+    сворачиваются за O(L log L), остальные — полным перебором за O(L²).
+
+    Хранятся только текущая строка ДП и выборы в самом узком беззнаковом
+    типе. При low_memory=True выборы не хранятся вовсе: запоминаются
+    строки ДП через каждые ~√E предприятий, а при восстановлении ответа
+    выборы пересчитываются поблочно — память O(L·√E) ценой второго
+    прохода. None включает этот режим автоматически на больших таблицах.
+
+    progress(done, total), если задан, вызывается после каждого
+    предприятия и может прервать вычисление исключением.
+    """
+    profits = table.profits
+    num_invest_levels, num_enterprises = profits.shape
+    step = _Stepper(profits, concave_fast_path)
+
+    if low_memory is None:
+        low_memory = num_enterprises * num_invest_levels > LOW_MEMORY_CHOICE_CELLS
+
+    if low_memory:
+        prev = np.zeros(num_invest_levels, dtype=profits.dtype)
+        return _optimize_with_checkpoints(table, step, prev, progress)
+
+    dp, choice = _forward(
+        step, num_enterprises, num_invest_levels, progress=progress
+    )
+    distribution = backtrack(table.investments, choice, num_invest_levels - 1)
+    return dp[num_invest_levels - 1].item(), distribution
+
+
+def _forward(
+    step: _Stepper,
+    num_enterprises: int,
+    num_invest_levels: int,
+    keep_rows: bool = False,
+    progress=None,
+):
+    """
+    Прямой проход ДП: строка ДП и матрица выборов.
+    При keep_rows=True возвращаются все E + 1 строк ДП, а не только последняя.
+    """
+    prev = np.zeros(num_invest_levels, dtype=step.profits.dtype)
+    choice = np.zeros((num_enterprises, num_invest_levels), dtype=step.choice_dtype)
+    rows = None
+    if keep_rows:
+        rows = np.zeros(
+            (num_enterprises + 1, num_invest_levels), dtype=step.profits.dtype
+        )
+    for i in range(num_enterprises):
+        prev, choice[i] = step(prev, i)
+        if rows is not None:
+            rows[i + 1] = prev
+        if progress is not None:
+            progress(i + 1, num_enterprises)
+    return (rows if keep_rows else prev), choice
+
+
+def backtrack(investments: np.ndarray, choice: np.ndarray, level: int):
+    """
+    Восстанавливает распределение для бюджета с номером уровня level.
+    """
+    num_enterprises = choice.shape[0]
+    distribution = [0] * num_enterprises
+    remaining_j = level
+    for i in range(num_enterprises - 1, -1, -1):
+        k = int(choice[i, remaining_j])
+        distribution[i] = investments[k].item()
+        remaining_j -= k
+    return distribution
+
+
+def forward_choices(
+    table,
+    concave_fast_path: bool = True,
+    keep_rows: bool = False,
+    progress=None,
+):
+    """
+    Последняя строка ДП (оптимум для каждого бюджета) и матрица выборов
+    в узком беззнаковом типе, по которой восстанавливается распределение
+    для любого уровня бюджета. При keep_rows=True вместо последней строки
+    возвращаются все строки ДП — префиксы по предприятиям.
+    """
+    require_uniform_grid(table, "Построение кривой бюджета и таблиц ДП")
+    num_invest_levels, num_enterprises = table.profits.shape
+    step = _Stepper(table.profits, concave_fast_path)
+    return _forward(step, num_enterprises, num_invest_levels, keep_rows, progress)
+
+
+def step_column(prev: np.ndarray, column: np.ndarray, concave_fast_path: bool = True):
+    """
+    Один шаг ДП со столбцом, которого нет в таблице.
+    """
+    step = _Stepper(np.asarray(column)[:, None], concave_fast_path)
+    return step(prev.astype(step.profits.dtype), 0)
+
+
+def _optimize_with_checkpoints(table, step: _Stepper, prev: np.ndarray, progress=None):
+    num_invest_levels, num_enterprises = table.profits.shape
+    block = max(1, math.isqrt(num_enterprises - 1) + 1) if num_enterprises else 1
+
+    checkpoints = {}
+    for i in range(num_enterprises):
+        if i % block == 0:
+            checkpoints[i] = prev
+        prev, _ = step(prev, i)
+        if progress is not None:
+            # Восстановление повторяет проход, поэтому всего шагов 2E
+            progress(i + 1, 2 * num_enterprises)
+    max_profit = prev[num_invest_levels - 1].item()
+
+    distribution = [0] * num_enterprises
+    remaining_j = num_invest_levels - 1
+    recomputed = 0
+    for start in sorted(checkpoints, reverse=True):
+        stop = min(start + block, num_enterprises)
+        row = checkpoints.pop(start)
+        choice = np.empty((stop - start, num_invest_levels), dtype=step.choice_dtype)
+        for i in range(start, stop):
+            row, choice[i - start] = step(row, i)
+        if progress is not None:
+            recomputed += stop - start
+            progress(num_enterprises + recomputed, 2 * num_enterprises)
+        for i in range(stop - 1, start - 1, -1):
+            k = int(choice[i - start, remaining_j])
+            distribution[i] = table.investments[k].item()
+            remaining_j -= k
+
+    return max_profit, distribution
+
+
+def top_k_allocations(table, top_k: int, progress=None):
+    """
+    K лучших различных распределений за один проход ДП.
+
+    Для каждого уровня j хранятся до K лучших значений для первых i
+    предприятий при суммарном номере уровня ровно j, а также обратные
+    ссылки (k, ранг в предыдущей строке). Разные пути дают разные
+    распределения, поэтому дубликатов не бывает. Время O(E·L²·K),
+    память под ссылки — O(E·L·K) в узких беззнаковых типах.
+    progress(done, total) вызывается после каждого предприятия.
+
+    Returns:
+        list: [(profit, distribution), ...] по убыванию прибыли
+    """
+    if top_k < 1:
+        raise ValueError("top_k должен быть положительным")
+    require_uniform_grid(table, "Поиск лучших распределений")
+
+    profits = table.profits
+    num_invest_levels, num_enterprises = profits.shape
+    levels = np.arange(num_invest_levels)
+    block_rows = max(1, _DENSE_BLOCK_CELLS // (num_invest_levels * top_k))
+
+    values = np.full((num_invest_levels, top_k), -np.inf)
+    values[0, 0] = 0
+    back_k = np.zeros(
+        (num_enterprises, num_invest_levels, top_k),
+        dtype=choice_dtype(num_invest_levels)
+    )
+    back_r = np.zeros(
+        (num_enterprises, num_invest_levels, top_k),
+        dtype=choice_dtype(top_k)
+    )
+
+    for i in range(num_enterprises):
+        column = profits[:, i].astype(np.float64)
+        current = np.full_like(values, -np.inf)
+        for start in range(0, num_invest_levels, block_rows):
+            rows = levels[start:start + block_rows]
+            ks = levels[:rows[-1] + 1]
+            shift = rows[:, None] - ks[None, :]
+            valid = shift >= 0
+            candidates = np.where(
+                valid[:, :, None],
+                values[np.where(valid, shift, 0)] + column[ks][None, :, None],
+                -np.inf,
+            ).reshape(rows.shape[0], -1)
+            best = _top_indices(candidates, top_k)
+            taken = np.take_along_axis(candidates, best, axis=1)
+            current[rows, :best.shape[1]] = taken
+            back_k[i, rows, :best.shape[1]] = best // top_k
+            back_r[i, rows, :best.shape[1]] = best % top_k
+        values = current
+        if progress is not None:
+            progress(i + 1, num_enterprises)
+
+    flat = values.reshape(1, -1)
+    best = _top_indices(flat, top_k)[0]
+    best = best[np.isfinite(flat[0, best])]
+
+    allocations = []
+    for index in best.tolist():
+        j, r = divmod(index, top_k)
+        distribution = [0] * num_enterprises
+        profit = 0
+        for i in range(num_enterprises - 1, -1, -1):
+            k = int(back_k[i, j, r])
+            r = int(back_r[i, j, r])
+            distribution[i] = table.investments[k].item()
+            profit += profits[k, i].item()
+            j -= k
+        allocations.append((profit, distribution))
+    return allocations
+
+
+def _top_indices(candidates: np.ndarray, top_k: int) -> np.ndarray:
+    """
+    Индексы top_k наибольших значений в каждой строке по убыванию.
+    Среди равных значений раньше идёт меньший индекс, то есть меньшее k.
+    """
+    width = candidates.shape[1]
+    if top_k < width:
+        part = np.argpartition(-candidates, top_k - 1, axis=1)[:, :top_k]
+    else:
+        part = np.broadcast_to(np.arange(width), candidates.shape)
+    taken = np.take_along_axis(candidates, part, axis=1)
+    order = np.lexsort((part, -taken), axis=1)
+    return np.take_along_axis(part, order, axis=1)
+
+
+def optimize_sparse(table, progress=None):
+    """
+    ДП по объединённому множеству достижимых бюджетов.
+
+    Подходит для неравномерной сетки и разных точек у предприятий.
+    Бюджет — наибольшая сумма в таблице. После каждого предприятия
+    хранится только граница Парето: состояния (потрачено, прибыль), где
+    прибыль строго растёт с бюджетом. Любое доминируемое состояние
+    заменяется состоянием с меньшими тратами и не меньшей прибылью.
+    Поэтому время и память зависят от числа реальных точек, а не от
+    размера сетки.
+    """
+    budget = table.investments.max()
+    tolerance = 1e-9 * max(1.0, abs(float(budget)))
+
+    spent = np.zeros(1, dtype=table.investments.dtype)
+    values = np.zeros(1, dtype=np.float64 if table.is_sparse else table.profits.dtype)
+    history = []
+
+    for i in range(table.num_enterprises):
+        amounts, profits = table.breakpoints(i)
+        candidate_spent = (spent[:, None] + amounts[None, :]).ravel()
+        candidate_values = (values[:, None] + profits[None, :]).ravel()
+        parent = np.repeat(np.arange(spent.shape[0]), amounts.shape[0])
+        chosen = np.tile(np.arange(amounts.shape[0]), spent.shape[0])
+
+        within = candidate_spent <= budget + tolerance
+        candidate_spent = candidate_spent[within]
+        candidate_values = candidate_values[within]
+
+        # По возрастанию трат, при равных тратах — по убыванию прибыли
+        order = np.lexsort((-candidate_values, candidate_spent))
+        candidate_values = candidate_values[order]
+        best_before = np.maximum.accumulate(candidate_values)
+        keep = np.empty(order.shape[0], dtype=bool)
+        keep[0] = True
+        keep[1:] = candidate_values[1:] > best_before[:-1]
+
+        order = order[keep]
+        spent = candidate_spent[order]
+        values = candidate_values[keep]
+        history.append((
+            parent[within][order],
+            amounts[chosen[within][order]],
+        ))
+        if progress is not None:
+            progress(i + 1, table.num_enterprises)
+
+    state = values.shape[0] - 1
+    distribution = [0] * table.num_enterprises
+    for i in range(table.num_enterprises - 1, -1, -1):
+        parents, chosen_amounts = history[i]
+        distribution[i] = chosen_amounts[state].item()
+        state = int(parents[state])
+
+    return values[-1].item(), distribution
+
+
+def require_uniform_grid(table, feature: str) -> None:
+    """
+    Проверяет, что таблица подходит движкам с индексацией по j - k.
+
+    Raises:
+        ValueError: Если сетка неравномерная или в таблице есть пропуски
+    """
+    if not table.has_uniform_grid:
+        raise ValueError(
+            f"{feature} поддерживается только для общей равномерной "
+            f"сетки инвестиций без пропусков"
+        )
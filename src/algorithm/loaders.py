@@ -0,0 +1,260 @@
+import csv
+import io
+import math
+import os
+from enum import Enum
+
+import numpy as np
+
+from src.algorithm.profit_table import ProfitTable
+
+_XLSX_MAGIC = b"PK\x03\x04"
+_XLS_MAGIC = b"\xd0\xcf\x11\xe0"
+_PARQUET_MAGIC = b"PAR1"
+_NPY_MAGIC = b"\x93NUMPY"
+
+
+class InputFormat(str, Enum):
+    XLSX = "xlsx"
+    CSV = "csv"
+    PARQUET = "parquet"
+    NPY = "npy"
+
+
+class _RowBuffer:
+    """
+    Растущий двумерный буфер для построчного чтения.
+
+    Строки пишутся сразу в массив float64 с удвоением ёмкости, поэтому
+    промежуточный список строк не создаётся. Если все значения целые
+    (в том числе 10.0), итоговая таблица приводится к int64 — как это
+    делал pandas.
+
+    Пустая ячейка прибыли означает, что у предприятия нет такой точки
+    (хранится как NaN), пустая или бесконечная сумма инвестиций — ошибка.
+
+    При ragged=True строки могут быть разной длины: недостающие ячейки
+    считаются пустыми. Пустые столбцы справа отбрасываются.
+    """
+
+    def __init__(self, capacity: int = 64, ragged: bool = False):
+        self._data = None
+        self._capacity = max(capacity, 1)
+        self._size = 0
+        self._all_int = True
+        self._ragged = ragged
+
+    def append(self, values) -> None:
+        if self._data is None:
+            self._data = np.empty((self._capacity, len(values)), dtype=np.float64)
+        elif len(values) != self._data.shape[1]:
+            if not self._ragged:
+                raise ValueError(
+                    f"Строка {self._size + 1}: ожидалось {self._data.shape[1]} "
+                    f"значений, получено {len(values)}"
+                )
+            if len(values) > self._data.shape[1]:
+                # У прежних строк в новых столбцах пустые ячейки
+                wider = np.full(
+                    (self._data.shape[0], len(values)), np.nan, dtype=np.float64
+                )
+                wider[:, :self._data.shape[1]] = self._data
+                self._data = wider
+            else:
+                values = list(values) + [None] * (self._data.shape[1] - len(values))
+        if self._size == self._data.shape[0]:
+            grown = np.empty(
+                (self._data.shape[0] * 2, self._data.shape[1]),
+                dtype=np.float64
+            )
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+
+        row = self._data[self._size]
+        for i, value in enumerate(values):
+            if value is None:
+                if i == 0:
+                    raise ValueError(
+                        f"Строка {self._size + 1}: пустая сумма инвестиций"
+                    )
+                row[i] = np.nan
+                continue
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                # Ошибка данных книги, а не аргумента: API отвечает на неё 400
+                raise ValueError(  # noqa: TRY004
+                    f"Строка {self._size + 1}: нечисловое значение {value!r}"
+                )
+            if isinstance(value, float) and not math.isfinite(value):
+                if i == 0 or not math.isnan(value):
+                    raise ValueError(
+                        f"Строка {self._size + 1}: значение {value!r} "
+                        f"не является конечным числом"
+                    )
+                # NaN в прибыли — та же пустая ячейка
+                row[i] = np.nan
+                continue
+            if isinstance(value, float) and not (
+                value.is_integer() and abs(value) < 2 ** 53
+            ):
+                self._all_int = False
+            row[i] = value
+        self._size += 1
+
+    def to_table(self) -> ProfitTable:
+        if self._data is None:
+            raise ValueError("Файл не содержит данных")
+        data = self._data[:self._size]
+        width = data.shape[1]
+        while width > 1 and np.isnan(data[:, width - 1]).all():
+            width -= 1
+        data = data[:, :width]
+        if np.isnan(data[:, 1:]).any():
+            investments = data[:, 0]
+            if np.all(np.mod(investments, 1) == 0):
+                investments = investments.astype(np.int64)
+            return ProfitTable(investments, data[:, 1:])
+        if self._all_int:
+            data = data.astype(np.int64)
+        return ProfitTable.from_rows(data)
+
+
+def _from_array(data) -> ProfitTable:
+    """
+    Таблица из двумерного массива [инвестиция, прибыль_1, ..., прибыль_E]
+    с теми же проверками, что и при построчном чтении: суммы инвестиций
+    конечные, прибыль конечная или NaN (нет такой точки).
+    """
+    table = ProfitTable.from_rows(data)
+    if table.investments.dtype.kind == "f":
+        if not np.isfinite(table.investments).all():
+            raise ValueError("Суммы инвестиций должны быть конечными числами")
+        if np.isinf(table.profits).any():
+            raise ValueError("Прибыль должна быть конечным числом")
+    return table
+
+
+def sniff_format(head: bytes) -> InputFormat:
+    """
+    Определяет формат по первым байтам файла.
+    """
+    if head.startswith(_XLSX_MAGIC):
+        return InputFormat.XLSX
+    if head.startswith(_PARQUET_MAGIC):
+        return InputFormat.PARQUET
+    if head.startswith(_NPY_MAGIC):
+        return InputFormat.NPY
+    if head.startswith(_XLS_MAGIC):
+        raise ValueError("Формат .xls не поддерживается, сохраните файл как .xlsx")
+    return InputFormat.CSV
+
+
+def load_xlsx(source) -> ProfitTable:
+    """
+    Потоково читает первый лист книги через openpyxl в режиме read_only.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        buffer = _RowBuffer(
+            capacity=min(sheet.max_row or 64, 1 << 16), ragged=True
+        )
+        for values in sheet.iter_rows(values_only=True):
+            if all(value is None for value in values):
+                continue
+            buffer.append(values)
+    finally:
+        workbook.close()
+    return buffer.to_table()
+
+
+def _parse_number(value: str):
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value.replace(",", "."))
+    except ValueError:
+        raise ValueError(f"Нечисловое значение {value!r}")
+
+
+def load_csv(stream) -> ProfitTable:
+    """
+    Построчно читает CSV без заголовка. Разделитель определяется автоматически.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    sample = text.read(4096)
+    text.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+
+    buffer = _RowBuffer()
+    for cells in csv.reader(text, dialect):
+        if not any(cell.strip() for cell in cells):
+            continue
+        buffer.append([_parse_number(cell) for cell in cells])
+    text.detach()
+    return buffer.to_table()
+
+
+def load_parquet(stream) -> ProfitTable:
+    """
+    Читает Parquet: первая колонка — инвестиции, остальные — предприятия.
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError(
+            "Для чтения Parquet нужен пакет pyarrow (extra parquet)"
+        )
+
+    table = pq.read_table(stream)
+    # Пустые значения становятся NaN — как пустые ячейки книги
+    columns = [
+        column.to_numpy(zero_copy_only=False) for column in table.columns
+    ]
+    if not columns:
+        raise ValueError("Файл не содержит данных")
+    return _from_array(np.column_stack(columns))
+
+
+def load_npy(stream) -> ProfitTable:
+    """
+    Читает двумерный массив .npy в том же формате, что и строки книги.
+    """
+    return _from_array(np.load(stream, allow_pickle=False))
+
+
+_LOADERS = {
+    InputFormat.XLSX: load_xlsx,
+    InputFormat.CSV: load_csv,
+    InputFormat.PARQUET: load_parquet,
+    InputFormat.NPY: load_npy,
+}
+
+
+def load_profit_table(source) -> ProfitTable:
+    """
+    Загружает таблицу прибыли из байтов, пути или бинарного потока.
+
+    Формат (XLSX, CSV, Parquet, NPY) определяется по содержимому,
+    а не по расширению.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        stream = io.BytesIO(source)
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return load_profit_table(f)
+    else:
+        stream = source
+
+    head = stream.read(8)
+    stream.seek(0)
+    return _LOADERS[sniff_format(head)](stream)
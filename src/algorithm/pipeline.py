@@ -0,0 +1,200 @@
+import time
+
+from src.algorithm.algorithm import InvestmentOptimizer
+from src.algorithm.budget_curve import BudgetCurve
+from src.algorithm.engines import OptimizationEngine
+from src.algorithm.progress import OptimizationCancelled
+from src.algorithm.what_if import DPState
+
+# Функции объявлены на уровне модуля, чтобы их можно было передавать
+# в пул процессов. Метрики Prometheus из дочернего процесса не видны,
+# поэтому длительности этапов и размер входа возвращаются в profile
+# и учитываются уже в основном процессе.
+
+
+def parse_workbook(file_bytes, progress=None):
+    """
+    Разбирает книгу и считает хэш нормализованной таблицы прибыли.
+    progress — необязательный ProgressReporter.
+
+    Returns:
+        tuple: (ProfitTable, content_hash, profile)
+
+    Raises:
+        ValueError: Если файл не удалось разобрать
+    """
+    if progress is not None:
+        progress.stage('parse')
+    start = time.perf_counter()
+    table = InvestmentOptimizer.load_data_from_excel_bytes(
+        file_bytes=file_bytes
+    )
+    parsed = time.perf_counter()
+    content_hash = table.fingerprint()
+    profile = {
+        'stages': {
+            'parse': parsed - start,
+            'hash': time.perf_counter() - parsed,
+        },
+        'enterprises': table.num_enterprises,
+        'levels': table.num_levels,
+    }
+    return table, content_hash, profile
+
+
+def optimize_table(
+    table,
+    engine=OptimizationEngine.NUMPY,
+    top_k=None,
+    budget_curve=False,
+    dp_state=False,
+    progress=None,
+):
+    """
+    Оптимизация и статистика по уже разобранной таблице.
+    При заданном top_k добавляются alternatives — лучшие распределения.
+    При budget_curve=True оптимизация идёт через BudgetCurve (движок NumPy)
+    и добавляются budget_curve — оптимум для каждого уровня бюджета —
+    и budget_curve_data — сжатая кривая для хранения.
+    При dp_state=True добавляется dp_state_data — таблица с префиксными
+    и суффиксными строками ДП для what-if пересчётов.
+    progress — необязательный ProgressReporter: получает этапы и прогресс
+    ДП по предприятиям и может отменить вычисление.
+
+    Raises:
+        ValueError: Если режим не поддерживается для такой таблицы
+        OptimizationCancelled: Если клиент отменил вычисление
+        RuntimeError: Если упала оптимизация
+    """
+    def stage(name):
+        if progress is not None:
+            progress.stage(name)
+
+    try:
+        stage('optimize')
+        start = time.perf_counter()
+        curve = None
+        state = None
+        if dp_state:
+            # Оптимум и кривая берутся из того же прямого прохода
+            state = DPState.from_table(table, progress=progress)
+            max_profit, distribution = state.optimum()
+            if budget_curve:
+                curve = state.budget_curve()
+        elif budget_curve:
+            # Кривая строится тем же проходом ДП, оптимум — её последняя точка
+            curve = BudgetCurve.from_table(table, progress=progress)
+            max_profit, distribution = curve.allocation(table.num_levels - 1)
+        else:
+            max_profit, distribution = InvestmentOptimizer.optimize_investments(
+                table=table,
+                engine=engine,
+                progress=progress
+            )
+        optimized = time.perf_counter()
+        stage('stats')
+        stats = InvestmentOptimizer.get_investment_stats(
+            table=table,
+            distribution=distribution
+        )
+        finished = time.perf_counter()
+        alternatives = None
+        if top_k:
+            stage('top_k')
+            alternatives = InvestmentOptimizer.find_top_allocations(
+                table=table,
+                top_k=top_k,
+                progress=progress
+            )
+    except (ValueError, OptimizationCancelled):
+        # Таблица не подходит для запрошенного режима или расчёт отменён
+        raise
+    except Exception as e:
+        raise RuntimeError(f"Ошибка оптимизации: {e}") from e
+
+    stages = {
+        'optimize': optimized - start,
+        'stats': finished - optimized,
+    }
+    result = {
+        'max_profit': max_profit,
+        'distribution': distribution,
+        'statistics': stats,
+        'profile': {'stages': stages},
+    }
+    if alternatives is not None:
+        stages['top_k'] = time.perf_counter() - finished
+        result['alternatives'] = alternatives
+    if curve is not None:
+        result['budget_curve'] = curve.points()
+        result['budget_curve_data'] = curve.to_bytes()
+    if state is not None:
+        result['dp_state_data'] = state.to_bytes()
+    return result
+
+
+def optimize_workbook(file_bytes, engine=OptimizationEngine.NUMPY, progress=None):
+    """
+    Полный цикл обработки книги: разбор, оптимизация и статистика.
+
+    Кроме результата возвращает content_hash — хэш нормализованной
+    таблицы прибыли, по которому ищутся уже посчитанные результаты,
+    и profile с длительностями всех этапов.
+
+    Raises:
+        ValueError: Если файл не удалось разобрать
+        RuntimeError: Если упала оптимизация
+    """
+    table, content_hash, profile = parse_workbook(file_bytes, progress)
+    result = optimize_table(table, engine, progress=progress)
+    profile['stages'].update(result['profile']['stages'])
+    result['profile'] = profile
+    result['content_hash'] = content_hash
+    return result
+
+
+# Маленькая таблица для прогрева: 3 уровня, 2 предприятия
+_WARM_UP_CSV = b"0,0,0\n10,1,2\n20,3,3\n"
+
+
+def warm_up(load_xlsx=True):
+    """
+    Прогревает оптимизатор в текущем процессе: загружает модули,
+    разбирает и оптимизирует крошечную таблицу. При load_xlsx=True
+    заранее импортирует openpyxl, который иначе грузится при первой книге.
+    """
+    table, _, _ = parse_workbook(_WARM_UP_CSV)
+    optimize_table(table)
+    if load_xlsx:
+        import openpyxl  # noqa: F401
+
+
+def what_if_table(state_data, enterprise, column):
+    """
+    Оптимум после замены столбца прибыли одного предприятия
+    по сохранённым таблицам ДП.
+
+    Raises:
+        ValueError: Если номер предприятия или длина столбца неверны
+    """
+    start = time.perf_counter()
+    state = DPState.from_bytes(state_data)
+    loaded = time.perf_counter()
+    table, max_profit, distribution = state.replace_column(enterprise, column)
+    optimized = time.perf_counter()
+    stats = InvestmentOptimizer.get_investment_stats(
+        table=table,
+        distribution=distribution
+    )
+    return {
+        'max_profit': max_profit,
+        'distribution': distribution,
+        'statistics': stats,
+        'profile': {
+            'stages': {
+                'load_state': loaded - start,
+                'optimize': optimized - loaded,
+                'stats': time.perf_counter() - optimized,
+            },
+        },
+    }
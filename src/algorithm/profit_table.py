@@ -0,0 +1,152 @@
+import hashlib
+import math
+
+import numpy as np
+
+
+class ProfitTable:
+    """
+    Таблица прибыли в компактном виде.
+
+    Хранит уровни инвестиций одномерным массивом, а прибыль — непрерывным
+    двумерным массивом формы (уровни, предприятия). Индекс
+    «сумма инвестиций → строка» строится один раз при создании,
+    поэтому поиск строки не требует прохода по списку.
+
+    Сетка может быть неравномерной, а у каждого предприятия — своя:
+    NaN в столбце прибыли означает, что такой точки у предприятия нет.
+    """
+
+    __slots__ = ("_row_by_investment", "investments", "profits")
+
+    def __init__(self, investments, profits):
+        self.investments = np.ascontiguousarray(investments)
+        self.profits = np.ascontiguousarray(profits)
+        if self.profits.ndim != 2:
+            raise ValueError("Таблица прибыли должна быть двумерной")
+        if self.profits.shape[0] != self.investments.shape[0]:
+            raise ValueError(
+                "Число уровней инвестиций не совпадает с числом строк прибыли"
+            )
+
+        self._row_by_investment = {}
+        for row, amount in enumerate(self.investments.tolist()):
+            # Как и list.index, при повторах берём первую строку
+            self._row_by_investment.setdefault(amount, row)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Строит таблицу из строк вида [инвестиция, прибыль_1, ..., прибыль_E].
+        """
+        table = np.asarray(rows)
+        if table.ndim != 2 or table.shape[1] < 2:
+            raise ValueError(
+                "Ожидается таблица с колонкой инвестиций и хотя бы одним предприятием"
+            )
+        if table.dtype.kind not in "iuf":
+            try:
+                table = table.astype(np.float64)
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Таблица содержит нечисловые значения: {e}")
+        return cls(table[:, 0], table[:, 1:])
+
+    @classmethod
+    def from_breakpoints(cls, breakpoints):
+        """
+        Строит таблицу из точек предприятий: [{сумма: прибыль}, ...].
+        Строки — объединение сумм всех предприятий, пропуски — NaN.
+        """
+        if not breakpoints:
+            raise ValueError("Нужно хотя бы одно предприятие")
+        investments = np.array(sorted(set().union(*breakpoints)))
+        if investments.size == 0:
+            raise ValueError("Файл не содержит данных")
+        row = {amount: i for i, amount in enumerate(investments.tolist())}
+        profits = np.full((investments.size, len(breakpoints)), np.nan)
+        for enterprise, points in enumerate(breakpoints):
+            for amount, profit in points.items():
+                profits[row[amount], enterprise] = profit
+        return cls(investments, profits)
+
+    @property
+    def is_sparse(self) -> bool:
+        """
+        Есть ли у предприятий пропущенные точки.
+        """
+        return self.profits.dtype.kind == "f" and bool(np.isnan(self.profits).any())
+
+    @property
+    def has_uniform_grid(self) -> bool:
+        """
+        Общая равномерная сетка 0, s, 2s, ... без пропусков — то, на что
+        рассчитаны движки с индексацией по j - k.
+        """
+        if self.is_sparse or self.num_levels < 1 or self.investments[0] != 0:
+            return False
+        if self.num_levels < 2:
+            return True
+        steps = np.diff(self.investments)
+        return bool(steps[0] > 0 and np.all(steps == steps[0]))
+
+    def breakpoints(self, enterprise: int):
+        """
+        Точки предприятия: (суммы, прибыли) без пропусков.
+
+        Нулевое вложение с нулевой прибылью доступно всегда, даже если
+        его нет в таблице.
+        """
+        column = self.profits[:, enterprise]
+        present = ~np.isnan(column) if column.dtype.kind == "f" else slice(None)
+        amounts = self.investments[present]
+        profits = column[present]
+        if not np.any(amounts == 0):
+            amounts = np.concatenate([[0], amounts]).astype(amounts.dtype)
+            profits = np.concatenate([[0], profits]).astype(profits.dtype)
+        return amounts, profits
+
+    @property
+    def num_levels(self) -> int:
+        return self.profits.shape[0]
+
+    @property
+    def num_enterprises(self) -> int:
+        return self.profits.shape[1]
+
+    def row_of(self, amount):
+        """
+        Возвращает номер строки для суммы инвестиций или None.
+        """
+        return self._row_by_investment.get(amount)
+
+    def get_profit(self, enterprise, amount):
+        """
+        Получает прибыль, если вложить amount в предприятие enterprise.
+        """
+        row = self._row_by_investment[amount]
+        profit = self.profits[row, enterprise].item()
+        if math.isnan(profit):
+            # Нулевое вложение доступно всегда, остальные пропуски — ошибка
+            if amount == 0:
+                return 0
+            raise KeyError(amount)
+        return profit
+
+    def fingerprint(self) -> str:
+        """
+        Хэш нормализованной таблицы.
+
+        Значения приводятся к float64, поэтому одна и та же таблица,
+        сохранённая целыми или дробными числами, даёт один и тот же хэш.
+        """
+        digest = hashlib.sha256()
+        digest.update(np.asarray(self.profits.shape, dtype=np.int64).tobytes())
+        digest.update(self.investments.astype(np.float64).tobytes())
+        digest.update(self.profits.astype(np.float64).tobytes())
+        return digest.hexdigest()
+
+    def __repr__(self) -> str:
+        return (
+            f"<ProfitTable(levels={self.num_levels}, "
+            f"enterprises={self.num_enterprises})>"
+        )
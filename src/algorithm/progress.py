@@ -0,0 +1,69 @@
+import time
+
+
+class OptimizationCancelled(Exception):
+    """Вычисление отменено клиентом."""
+
+
+class OptimizationTimeout(OptimizationCancelled):
+    """Вычисление прервано по таймауту."""
+
+
+class ProgressReporter:
+    """
+    Хук прогресса для оптимизатора.
+
+    Вызывается как progress(done, total) после каждого предприятия,
+    а stage(name) отмечает переход между этапами. Очередь и флаг отмены —
+    прокси multiprocessing.Manager, поэтому объект можно передать в пул
+    процессов. События прореживаются по времени, флаг отмены проверяется
+    при каждой отправке: если он выставлен, поднимается
+    OptimizationCancelled и вычисление прекращается.
+
+    deadline — момент по time.time(), после которого вычисление
+    прерывается с OptimizationTimeout. timeout задаёт срок относительно
+    первой проверки: она происходит уже в процессе вычислений, поэтому
+    ожидание в очереди пула в срок не входит. Без очереди хук только
+    следит за таймаутом.
+    """
+
+    def __init__(
+        self,
+        queue=None,
+        cancel_event=None,
+        deadline: float | None = None,
+        interval: float = 0.2,
+        timeout: float | None = None,
+    ):
+        self.queue = queue
+        self.cancel_event = cancel_event
+        self.deadline = deadline
+        self.timeout = timeout
+        self.interval = interval
+        self._last = 0.0
+
+    def check(self) -> None:
+        if self.deadline is None and self.timeout is not None:
+            self.deadline = time.time() + self.timeout
+        if self.deadline is not None and time.time() > self.deadline:
+            raise OptimizationTimeout("Превышено время вычисления")
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise OptimizationCancelled("Вычисление отменено клиентом")
+
+    def stage(self, name: str) -> None:
+        self.check()
+        self._send({'stage': name})
+
+    def __call__(self, done: int, total: int) -> None:
+        now = time.monotonic()
+        if done < total and now - self._last < self.interval:
+            if self.deadline is not None and time.time() > self.deadline:
+                self.check()
+            return
+        self._last = now
+        self.check()
+        self._send({'stage': 'optimize', 'done': done, 'total': total})
+
+    def _send(self, event: dict) -> None:
+        if self.queue is not None:
+            self.queue.put(event)
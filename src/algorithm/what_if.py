@@ -0,0 +1,164 @@
+import io
+
+import numpy as np
+
+from src.algorithm.budget_curve import BudgetCurve
+from src.algorithm.engines import (
+    backtrack,
+    forward_choices,
+    optimize_numpy,
+    step_column,
+)
+from src.algorithm.profit_table import ProfitTable
+
+
+class DPState:
+    """
+    Таблица прибыли вместе с префиксными и суффиксными строками ДП.
+
+    prefix[i] — оптимум по первым i предприятиям для каждого бюджета,
+    suffix[i] — по последним i. Замена столбца одного предприятия
+    пересчитывается одним шагом ДП поверх префикса и склейкой с суффиксом:
+    O(L²) вместо O(E·L²).
+    """
+
+    __slots__ = (
+        "prefix",
+        "prefix_choice",
+        "suffix",
+        "suffix_choice",
+        "table"
+    )
+
+    def __init__(self, table, prefix, prefix_choice, suffix, suffix_choice):
+        self.table = table
+        self.prefix = prefix
+        self.prefix_choice = prefix_choice
+        self.suffix = suffix
+        self.suffix_choice = suffix_choice
+
+    @classmethod
+    def from_table(cls, table: ProfitTable, progress=None) -> "DPState":
+        forward_progress = backward_progress = None
+        if progress is not None:
+            # Два прохода по E предприятий, всего шагов 2E
+            def forward_progress(done, total):
+                progress(done, 2 * total)
+
+            def backward_progress(done, total):
+                progress(total + done, 2 * total)
+
+        prefix, prefix_choice = forward_choices(
+            table, keep_rows=True, progress=forward_progress
+        )
+        # Суффиксы — это тот же прямой проход по предприятиям в обратном порядке
+        reversed_table = ProfitTable(table.investments, table.profits[:, ::-1])
+        suffix, suffix_choice = forward_choices(
+            reversed_table, keep_rows=True, progress=backward_progress
+        )
+        return cls(table, prefix, prefix_choice, suffix, suffix_choice)
+
+    def optimum(self):
+        """
+        Оптимум исходной таблицы — тот же, что у движка NumPy.
+        """
+        level = self.table.num_levels - 1
+        return (
+            self.prefix[-1, level].item(),
+            backtrack(self.table.investments, self.prefix_choice, level),
+        )
+
+    def budget_curve(self) -> BudgetCurve:
+        return BudgetCurve(
+            self.table.investments, self.prefix[-1], self.prefix_choice
+        )
+
+    def replace_column(self, enterprise: int, column):
+        """
+        Оптимум после замены столбца прибыли предприятия enterprise.
+
+        Returns:
+            tuple: (ProfitTable с новым столбцом, max_profit, distribution)
+
+        Raises:
+            ValueError: Если номер предприятия, длина столбца неверны
+                или в столбце есть NaN и бесконечности
+        """
+        table = self.table
+        num_invest_levels, num_enterprises = table.profits.shape
+        if not 0 <= enterprise < num_enterprises:
+            raise ValueError(
+                f"Номер предприятия должен быть от 0 до {num_enterprises - 1}"
+            )
+        column = np.asarray(column)
+        if column.shape != (num_invest_levels,):
+            raise ValueError(
+                f"Ожидается столбец из {num_invest_levels} значений, "
+                f"получено {column.size}"
+            )
+        if column.dtype.kind == "f" and not np.all(np.isfinite(column)):
+            raise ValueError("Прибыль должна быть конечным числом")
+        if column.dtype.kind == "f" and np.all(np.mod(column, 1) == 0):
+            column = column.astype(np.int64)
+        column = column.astype(np.result_type(table.profits, column))
+        profits = table.profits.astype(column.dtype)
+        profits[:, enterprise] = column
+        new_table = ProfitTable(table.investments, profits)
+
+        # Склейка префикса с суффиксом совпадает с полным пересчётом, только
+        # если вложение нулевого уровня ничего не приносит. Иначе считаем честно.
+        if np.any(profits[0] != 0):
+            return (new_table, *optimize_numpy(new_table))
+
+        head, head_k = step_column(self.prefix[enterprise], column)
+        tail = self.suffix[num_enterprises - 1 - enterprise]
+        # Строки ДП не убывают по бюджету, поэтому лучшее разбиение бюджета
+        # между «префикс + новое предприятие» и суффиксом ищется за O(L)
+        totals = head + tail[::-1]
+        split = int(totals.argmax())
+
+        k = int(head_k[split])
+        distribution = (
+            backtrack(table.investments, self.prefix_choice[:enterprise], split - k)
+            + [table.investments[k].item()]
+            + backtrack(
+                table.investments,
+                self.suffix_choice[:num_enterprises - 1 - enterprise],
+                num_invest_levels - 1 - split,
+            )[::-1]
+        )
+
+        return new_table, totals[split].item(), distribution
+
+    def to_bytes(self) -> bytes:
+        """
+        Сжатое представление для хранения в БД.
+        """
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            investments=self.table.investments,
+            profits=self.table.profits,
+            prefix=self.prefix,
+            prefix_choice=self.prefix_choice,
+            suffix=self.suffix,
+            suffix_choice=self.suffix_choice,
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "DPState":
+        with np.load(io.BytesIO(data), allow_pickle=False) as arrays:
+            return cls(
+                ProfitTable(arrays["investments"], arrays["profits"]),
+                arrays["prefix"],
+                arrays["prefix_choice"],
+                arrays["suffix"],
+                arrays["suffix_choice"],
+            )
+
+    def __repr__(self) -> str:
+        return (
+            f"<DPState(levels={self.table.num_levels}, "
+            f"enterprises={self.table.num_enterprises})>"
+        )
@@ -0,0 +1,105 @@
+import logging
+from enum import Enum
+
+from src.backend.config import config
+from src.backend.exceptions import PayloadTooLargeError, UnprocessableError
+from src.backend.metrics import ADMISSION_DECISIONS, ESTIMATED_COST
+
+logger = logging.getLogger(__name__)
+
+
+def check_upload_size(file_name: str, size: int | None) -> None:
+    """
+    Отклоняет файл больше config.appconfig.upload_max_bytes с 413.
+    size=None — размер неизвестен, проверка откладывается до чтения.
+    """
+    limit = config.appconfig.upload_max_bytes
+    if size is not None and size > limit:
+        raise PayloadTooLargeError(
+            f"Файл {file_name} больше допустимых {limit} байт"
+        )
+
+
+class Admission(str, Enum):
+    INLINE = "inline"
+    POOL = "pool"
+
+
+class AdmissionController:
+    """
+    Решает по оценке стоимости, где выполнять оптимизацию.
+
+    Дешёвые задачи на равномерной сетке считаются прямо в обработчике
+    запроса без передачи таблицы в пул, обычные — в пуле процессов,
+    а слишком большие отклоняются до начала вычислений: 422, если форма
+    таблицы вне допустимых пределов, 413, если превышен бюджет стоимости.
+    """
+
+    def __init__(
+        self,
+        inline_max_cost: float,
+        max_cost: float,
+        max_levels: int,
+        max_enterprises: int,
+    ):
+        self.inline_max_cost = inline_max_cost
+        self.max_cost = max_cost
+        self.max_levels = max_levels
+        self.max_enterprises = max_enterprises
+
+    def admit(self, table, cost: float) -> Admission:
+        """
+        Raises:
+            UnprocessableError: Слишком много уровней или предприятий
+            PayloadTooLargeError: Оценка стоимости выше max_cost
+        """
+        ESTIMATED_COST.observe(cost)
+        log_data = {
+            'levels': table.num_levels,
+            'enterprises': table.num_enterprises,
+            'cost': cost,
+        }
+
+        if table.num_levels > self.max_levels:
+            self._reject('rejected_shape', log_data)
+            raise UnprocessableError(
+                f"Слишком много уровней инвестиций: {table.num_levels}, "
+                f"допустимо не больше {self.max_levels}"
+            )
+        if table.num_enterprises > self.max_enterprises:
+            self._reject('rejected_shape', log_data)
+            raise UnprocessableError(
+                f"Слишком много предприятий: {table.num_enterprises}, "
+                f"допустимо не больше {self.max_enterprises}"
+            )
+        if cost > self.max_cost:
+            self._reject('rejected_cost', log_data)
+            raise PayloadTooLargeError(
+                f"Оценка объёма вычислений {cost:.3g} превышает "
+                f"допустимые {self.max_cost:.3g}; уменьшите таблицу "
+                f"или отключите дополнительные режимы"
+            )
+
+        # Для разреженной таблицы оценка — грубая граница сверху, а склейка
+        # границ Парето бывает дорогой: в обработчике её не считаем
+        inline = cost <= self.inline_max_cost and table.has_uniform_grid
+        decision = Admission.INLINE if inline else Admission.POOL
+        ADMISSION_DECISIONS.labels(decision=decision.value).inc()
+        return decision
+
+    @staticmethod
+    def _reject(reason: str, log_data: dict) -> None:
+        ADMISSION_DECISIONS.labels(decision=reason).inc()
+        logger.info({
+            'action': 'AdmissionController/admit',
+            'stage': reason,
+            'data': log_data,
+        })
+
+
+admission_controller = AdmissionController(
+    inline_max_cost=config.appconfig.inline_max_cost,
+    max_cost=config.appconfig.max_cost,
+    max_levels=config.appconfig.max_levels,
+    max_enterprises=config.appconfig.max_enterprises,
+)
@@ -1,7 +1,7 @@
 from fastapi import APIRouter
 from fastapi.responses import RedirectResponse
 
-from src.backend.api.endpoints import upload_file
+from src.backend.api.endpoints import jobs, progress, upload_file
 
 v1_router = APIRouter()
 
@@ -10,6 +10,21 @@ v1_router.include_router(
     prefix="/files",
     tags=["files"],
 )
+v1_router.include_router(
+    jobs.router,
+    prefix="/files",
+    tags=["jobs"],
+)
+v1_router.include_router(
+    progress.router,
+    prefix="/files",
+    tags=["progress"],
+)
+v1_router.include_router(
+    progress.ws_router,
+    prefix="/files",
+    tags=["progress"],
+)
 
 
 @v1_router.get("/redirect_dl", include_in_schema=False)
@@ -0,0 +1,81 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, File, Query, UploadFile, status
+
+from src.algorithm.cost import estimate_cost
+from src.algorithm.engines import OptimizationEngine
+from src.algorithm.pipeline import parse_workbook
+from src.algorithm.progress import ProgressReporter
+from src.backend.admission import admission_controller, check_upload_size
+from src.backend.compute import compute_stage
+from src.backend.config import config
+from src.backend.db.schemas.optimization_jobs import OptimizationJobSchema
+from src.backend.db.session import session_manager
+from src.backend.exceptions import BadRequestError, ServerError
+from src.backend.jobs import job_runner
+from src.backend.middlewares.auth import auth_user
+from src.backend.services.optimization_jobs import OptimizationJobService
+
+router = APIRouter(dependencies=[Depends(auth_user)])
+
+
+@router.post(
+    "/jobs/",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=OptimizationJobSchema
+)
+async def submit_job(
+    excel_file: UploadFile = File(...),
+    engine: OptimizationEngine = Query(OptimizationEngine.NUMPY),
+):
+    """
+    Эндпоинт для постановки оптимизации в фоновую очередь.
+    Сразу возвращает id задачи.
+
+    Размер файла и стоимость расчёта проверяются до постановки в очередь
+    так же, как в /upload_file: непосильная задача получает 413/422.
+    """
+    async_session = session_manager.async_session
+    check_upload_size(excel_file.filename, excel_file.size)
+    try:
+        file_bytes = await excel_file.read()
+    except Exception as e:
+        raise BadRequestError(f"Не удалось прочитать файл: {e}") from e
+    check_upload_size(excel_file.filename, len(file_bytes))
+
+    table, _, _ = await compute_stage(
+        parse_workbook,
+        file_bytes,
+        ProgressReporter(timeout=config.appconfig.compute_timeout),
+        pipeline="job",
+    )
+    cost = estimate_cost(table, engine, None, False, False)
+    admission_controller.admit(table, cost)
+
+    try:
+        job = await OptimizationJobService.submit_job(
+            async_session=async_session,
+            file_name=excel_file.filename,
+            engine=engine.value,
+            payload=file_bytes,
+        )
+    except Exception as e:
+        raise ServerError(f"Ошибка создания задачи: {e}") from e
+
+    job_runner.submit(job.id)
+    return job
+
+
+@router.get(
+    "/jobs/{job_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=OptimizationJobSchema
+)
+async def get_job(job_id: UUID):
+    """
+    Эндпоинт для получения статуса, таймингов и результата задачи.
+    """
+    return await OptimizationJobService.get_job(
+        async_session=session_manager.async_session,
+        job_id=job_id,
+    )
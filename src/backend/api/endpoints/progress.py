@@ -0,0 +1,76 @@
+import asyncio
+import json
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from src.backend.exceptions import NotFoundError
+from src.backend.middlewares.auth import auth_user, auth_websocket
+from src.backend.progress import progress_hub
+
+router = APIRouter(dependencies=[Depends(auth_user)])
+# Зависимость auth_user читает заголовок через Request и для WebSocket не подходит
+ws_router = APIRouter()
+
+
+@router.get(
+    "/progress/{progress_id}",
+    status_code=status.HTTP_200_OK,
+)
+async def stream_progress(progress_id: UUID):
+    """
+    Эндпоинт для получения этапов и прогресса вычисления
+    в формате Server-Sent Events. Поток закрывается событием finished.
+    """
+    async def events():
+        async for event in progress_hub.subscribe(str(progress_id)):
+            yield f"event: {event['stage']}\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.delete(
+    "/progress/{progress_id}",
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def cancel_progress(progress_id: UUID):
+    """
+    Эндпоинт для отмены идущего вычисления.
+    """
+    if not await progress_hub.cancel(str(progress_id)):
+        raise NotFoundError(f'Нет идущего вычисления {progress_id}')
+    return {'status': 'cancelling'}
+
+
+@ws_router.websocket("/progress/{progress_id}/ws")
+async def progress_websocket(websocket: WebSocket, progress_id: UUID):
+    """
+    Тот же поток событий по WebSocket. Сообщение "cancel" от клиента
+    отменяет вычисление.
+    """
+    if not auth_websocket(websocket):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    channel_id = str(progress_id)
+
+    async def listen():
+        while True:
+            message = await websocket.receive_text()
+            if message.strip().lower() == "cancel":
+                await progress_hub.cancel(channel_id)
+
+    listener = asyncio.create_task(listen())
+    try:
+        async for event in progress_hub.subscribe(channel_id):
+            await websocket.send_json(event)
+    except WebSocketDisconnect:
+        return
+    finally:
+        listener.cancel()
+    await websocket.close()
@@ -1,102 +1,400 @@
-from fastapi import APIRouter, Depends, File, UploadFile, status
+import asyncio
+import hashlib
+import io
+import zipfile
+from datetime import datetime
+from uuid import UUID
 
-from src.algorithm.algorithm import InvestmentOptimizer
+from fastapi import APIRouter, Depends, File, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
+
+from src.algorithm.cost import estimate_cost
+from src.algorithm.engines import OptimizationEngine
+from src.algorithm.pipeline import optimize_table, parse_workbook, what_if_table
+from src.algorithm.progress import ProgressReporter
+from src.backend.admission import Admission, admission_controller, check_upload_size
+from src.backend.compute import compute_stage
+from src.backend.config import config
 from src.backend.db.schemas.investments_results import (
-    InvestmentsResultCreateSchema, OptimizationResultSchema)
+    BatchResultSchema,
+    BudgetAllocationSchema,
+    InvestmentsResultPageSchema,
+    InvestmentsResultSchema,
+    InvestmentsStatisticsSchema,
+    OptimizationResultSchema,
+    StatisticsBucket,
+    WhatIfRequestSchema,
+)
 from src.backend.db.session import session_manager
-from src.backend.exceptions import BadRequestError, ServerError
+from src.backend.exceptions import BadRequestError, BaseAPIException, ServerError
+from src.backend.metrics import observe_profile, observe_stage
 from src.backend.middlewares.auth import auth_user
+from src.backend.progress import progress_hub
+from src.backend.responses import ORJSONResponse
 from src.backend.services.investments_results import InvestmentsResultService
 
 router = APIRouter(dependencies=[Depends(auth_user)])
 
-
 @router.post(
     "/upload_file/",
     status_code=status.HTTP_200_OK,
     response_model=OptimizationResultSchema
 )
 async def upload_file(
-    excel_file: UploadFile = File(...)
+    excel_file: UploadFile = File(...),
+    engine: OptimizationEngine = Query(OptimizationEngine.NUMPY),
+    top_k: int | None = Query(
+        None,
+        ge=1,
+        le=100,
+        description="Вернуть столько лучших различных распределений",
+    ),
+    budget_curve: bool = Query(
+        False,
+        description="Вернуть и сохранить оптимум для каждого уровня бюджета",
+    ),
+    what_if: bool = Query(
+        False,
+        description="Сохранить таблицы ДП для быстрых what-if пересчётов",
+    ),
+    progress_id: UUID | None = Query(
+        None,
+        description="id канала прогресса: /files/progress/{progress_id}",
+    ),
 ):
-    async_session = session_manager.async_session
     """
     Эндпоинт для загрузки Excel файла,
     оптимизации инвестиций и сохранения результатов в БД.
+
+    С progress_id этапы и прогресс ДП доступны через SSE или WebSocket
+    /files/progress/{progress_id}, там же вычисление можно отменить.
     """
+    channel_id = str(progress_id) if progress_id is not None else None
+    async with progress_hub.track(channel_id) as progress:
+        return await _optimize_upload(
+            excel_file=excel_file,
+            engine=engine,
+            top_k=top_k,
+            budget_curve=budget_curve,
+            what_if=what_if,
+            progress=progress,
+            channel_id=channel_id,
+        )
+
+
+async def _optimize_upload(
+    excel_file: UploadFile,
+    engine: OptimizationEngine,
+    top_k: int | None,
+    budget_curve: bool,
+    what_if: bool,
+    progress,
+    channel_id: str | None,
+) -> ORJSONResponse:
+    async_session = session_manager.async_session
+
+    async def stage(name):
+        if channel_id is not None:
+            await progress_hub.publish(channel_id, {'stage': name})
+
+    await stage('read')
+    check_upload_size(excel_file.filename, excel_file.size)
     try:
-        file_bytes = await excel_file.read()
+        with observe_stage("upload_file", "read"):
+            file_bytes = await excel_file.read()
     except Exception as e:
-        raise BadRequestError(f"Не удалось прочитать файл: {e}")
+        raise BadRequestError(f"Не удалось прочитать файл: {e}") from e
+    check_upload_size(excel_file.filename, len(file_bytes))
 
-    try:
-        investments, profits = InvestmentOptimizer.load_data_from_excel_bytes(
-            file_bytes=file_bytes
-        )
-    except ValueError as e:
-        raise BadRequestError(str(e))
+    # Альтернативы, кривая и таблицы ДП в кэше не хранятся,
+    # поэтому с ними он не используется
+    use_cache = top_k is None and not budget_curve and not what_if
+    file_hash = hashlib.sha256(file_bytes).hexdigest()
+    if use_cache:
+        await stage('cache_lookup')
+        with observe_stage("upload_file", "cache_lookup"):
+            cached = await InvestmentsResultService.get_cached_result(
+                async_session=async_session,
+                file_hash=file_hash
+            )
+        if cached is not None:
+            await stage('persist')
+            await _persist_upload(excel_file.filename, cached, file_hash)
+            return ORJSONResponse(cached)
+
+    # Срок отсчитывается в процессе вычислений с начала каждого этапа:
+    # воркер проверяет его сам, а пул страхует таймаутом с запасом
+    if progress is None:
+        progress = ProgressReporter()
+    progress.timeout = config.appconfig.compute_timeout
 
+    table, content_hash, profile = await compute_stage(
+        parse_workbook,
+        file_bytes,
+        progress
+    )
+    observe_profile("upload_file", profile)
+
+    if use_cache:
+        await stage('cache_lookup')
+        with observe_stage("upload_file", "cache_lookup"):
+            cached = await InvestmentsResultService.get_cached_result(
+                async_session=async_session,
+                content_hash=content_hash
+            )
+        if cached is not None:
+            await stage('persist')
+            await _persist_upload(
+                excel_file.filename, cached, file_hash, content_hash
+            )
+            return ORJSONResponse(cached)
+
+    cost = estimate_cost(table, engine, top_k, budget_curve, what_if)
+    admission = admission_controller.admit(table, cost)
+    inline = admission is Admission.INLINE
+    if inline and channel_id is not None:
+        # Хук канала ходит в Manager по IPC, а дешёвый расчёт идёт прямо
+        # в event loop: ему нужен хук без прокси, этап публикует хаб
+        await stage('optimize')
+        progress = ProgressReporter(timeout=config.appconfig.compute_timeout)
+    optimization = await compute_stage(
+        optimize_table,
+        table,
+        engine,
+        top_k,
+        budget_curve,
+        what_if,
+        progress,
+        inline=inline
+    )
+    observe_profile("upload_file", optimization.pop('profile'))
+    budget_curve_data = optimization.pop('budget_curve_data', None)
+    dp_state_data = optimization.pop('dp_state_data', None)
+
+    # Словарь оптимизатора уже содержит только JSON-совместимые типы:
+    # он сохраняется и отдаётся как есть, без промежуточных схем
+    await stage('persist')
+    await _persist_upload(
+        excel_file.filename,
+        optimization,
+        file_hash,
+        content_hash,
+        budget_curve_data,
+        dp_state_data
+    )
+    return ORJSONResponse(optimization)
+
+
+async def _persist_upload(
+    file_name: str,
+    result: dict,
+    file_hash: str,
+    content_hash: str | None = None,
+    budget_curve: bytes | None = None,
+    dp_state: bytes | None = None,
+) -> None:
+    """
+    Сохраняет результат загрузки. Результат из кэша тоже сохраняется:
+    как и в пакете, у каждой загруженной книги своя запись.
+    """
     try:
-        max_profit, distribution = InvestmentOptimizer.optimize_investments(
-            investments=investments,
-            profits=profits
-        )
-        stats = InvestmentOptimizer.get_investment_stats(
-            investments=investments,
-            profits=profits,
-            distribution=distribution
+        with observe_stage("upload_file", "persist"):
+            await InvestmentsResultService.save_optimization_result(
+                async_session=session_manager.async_session,
+                file_name=file_name,
+                result=result,
+                file_hash=file_hash,
+                content_hash=content_hash,
+                budget_curve=budget_curve,
+                dp_state=dp_state
+            )
+    except Exception as e:
+        raise ServerError(f"Ошибка сохранения результатов: {e}") from e
+
+
+def _expand_batch(uploads: list[tuple[str, bytes]]) -> list[tuple[str, bytes]]:
+    """
+    Раскрывает ZIP-архив с книгами, если он передан единственным файлом.
+
+    XLSX сам по себе ZIP, поэтому архивом считается только zip
+    без [Content_Types].xml. Число файлов и размер каждого после
+    распаковки проверяются по заголовкам до чтения: zipfile не
+    распакует больше заявленного file_size.
+    """
+    if len(uploads) != 1:
+        return uploads
+
+    _, data = uploads[0]
+    if not zipfile.is_zipfile(io.BytesIO(data)):
+        return uploads
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        names = archive.namelist()
+        if "[Content_Types].xml" in names:
+            return uploads
+        members = [
+            info for info in archive.infolist()
+            if not info.is_dir()
+            and not info.filename.startswith("__MACOSX/")
+            and not info.filename.rsplit("/", 1)[-1].startswith(".")
+        ]
+        if len(members) > config.appconfig.batch_max_files:
+            raise BadRequestError(
+                f"В архиве больше {config.appconfig.batch_max_files} файлов"
+            )
+        for info in members:
+            check_upload_size(info.filename, info.file_size)
+        return [
+            (info.filename, archive.read(info))
+            for info in sorted(members, key=lambda info: info.filename)
+        ]
+
+
+@router.post(
+    "/upload_batch/",
+    status_code=status.HTTP_200_OK,
+    response_model=BatchResultSchema
+)
+async def upload_batch(
+    files: list[UploadFile] = File(...),
+    engine: OptimizationEngine = Query(OptimizationEngine.NUMPY),
+):
+    """
+    Эндпоинт для пакетной загрузки: несколько книг или один ZIP-архив.
+    Книги оптимизируются параллельно, результаты сохраняются одной
+    транзакцией. Ответ содержит результат или ошибку для каждого файла
+    в порядке загрузки.
+    """
+    async_session = session_manager.async_session
+    if len(files) > config.appconfig.batch_max_files:
+        raise BadRequestError(
+            f"За раз можно загрузить не больше {config.appconfig.batch_max_files} файлов"
         )
+    for f in files:
+        check_upload_size(f.filename, f.size)
+    try:
+        uploads = [(f.filename, await f.read()) for f in files]
     except Exception as e:
-        raise ServerError(f"Ошибка оптимизации: {e}")
+        raise BadRequestError(f"Не удалось прочитать файл: {e}") from e
+
+    uploads = _expand_batch(uploads)
+    if len(uploads) > config.appconfig.batch_max_files:
+        raise BadRequestError(
+            f"За раз можно загрузить не больше {config.appconfig.batch_max_files} файлов"
+        )
 
-    result = OptimizationResultSchema(
-        max_profit=max_profit,
-        distribution=distribution,
-        statistics=stats
+    outcomes = await asyncio.gather(
+        *(
+            _optimize_batch_item(async_session, data, engine)
+            for _, data in uploads
+        ),
+        return_exceptions=True,
     )
 
-    # Преобразование данных для сохранения в БД
+    items = []
+    rows = []
+    for index, ((file_name, data), outcome) in enumerate(zip(uploads, outcomes)):
+        if isinstance(outcome, BaseException):
+            items.append({
+                'index': index,
+                'file_name': file_name,
+                'id': None,
+                'result': None,
+                'error': getattr(outcome, "detail", None) or str(outcome),
+            })
+            continue
+        outcome, file_hash, content_hash = outcome
+        # Результат из кэша тоже сохраняется, как и при одиночной загрузке:
+        # у каждой книги пакета своя запись
+        row = InvestmentsResultService.build_row(
+            file_name=file_name,
+            result=outcome,
+            file_hash=file_hash,
+            content_hash=content_hash,
+        )
+        rows.append(row)
+        items.append({
+            'index': index,
+            'file_name': file_name,
+            'id': row['id'],
+            'result': outcome,
+            'error': None,
+        })
+
     try:
-        # Конвертируем распределение в словарь {предприятие: сумма}
-        distribution_dict = {
-            str(i+1): amount
-            for i, amount in enumerate(result.distribution)
-        }
-
-        # Формируем детализацию по предприятиям
-        enterprise_details = {
-            str(ent.enterprise_id): {
-                "investment": ent.investment,
-                "profit": ent.profit,
-                "roi": ent.roi
-            }
-            for ent in result.statistics.enterprises
-        }
-
-        # Создаем объект для сохранения
-        create_data = InvestmentsResultCreateSchema(
-            file_name=excel_file.filename,
-            max_profit=result.max_profit,
-            total_investment=result.statistics.total_investment,
-            roi=result.statistics.roi,
-            distribution=distribution_dict,
-            enterprise_details=enterprise_details
+        with observe_stage("upload_batch", "persist"):
+            await InvestmentsResultService.save_optimization_results(
+                async_session=async_session,
+                rows=rows,
+            )
+    except Exception as e:
+        raise ServerError(f"Ошибка сохранения результатов: {e}") from e
+
+    succeeded = len(rows)
+    return ORJSONResponse({
+        'succeeded': succeeded,
+        'failed': len(items) - succeeded,
+        'items': items,
+    })
+
+
+async def _optimize_batch_item(async_session, data: bytes, engine):
+    """
+    Одна книга пакета тем же путём, что и одиночная загрузка: кэш по
+    хэшу файла, разбор, кэш по хэшу таблицы, допуск по стоимости,
+    оптимизация в обработчике или в пуле.
+
+    Returns:
+        tuple: (результат, file_hash, content_hash)
+    """
+    file_hash = hashlib.sha256(data).hexdigest()
+    with observe_stage("upload_batch", "cache_lookup"):
+        cached = await InvestmentsResultService.get_cached_result(
+            async_session=async_session,
+            file_hash=file_hash
         )
+    if cached is not None:
+        return cached, file_hash, None
+
+    progress = ProgressReporter(timeout=config.appconfig.compute_timeout)
+    table, content_hash, profile = await compute_stage(
+        parse_workbook,
+        data,
+        progress,
+        wait=True,
+        pipeline="upload_batch"
+    )
+    observe_profile("upload_batch", profile)
 
-        # Сохраняем в базу данных
-        await InvestmentsResultService.create_investment(
+    with observe_stage("upload_batch", "cache_lookup"):
+        cached = await InvestmentsResultService.get_cached_result(
             async_session=async_session,
-            data=create_data
+            content_hash=content_hash
         )
-    except Exception as e:
-        raise ServerError(f"Ошибка сохранения результатов: {e}")
+    if cached is not None:
+        return cached, file_hash, content_hash
 
-    return result
+    cost = estimate_cost(table, engine, None, False, False)
+    admission = admission_controller.admit(table, cost)
+    optimization = await compute_stage(
+        optimize_table,
+        table,
+        engine,
+        None,
+        False,
+        False,
+        progress,
+        inline=admission is Admission.INLINE,
+        wait=True,
+        pipeline="upload_batch"
+    )
+    observe_profile("upload_batch", optimization.pop('profile'))
+    return optimization, file_hash, content_hash
 
 
 @router.get(
     path='/last_investment/',
-    status_code=status.HTTP_200_OK
+    status_code=status.HTTP_200_OK,
+    response_model=InvestmentsResultSchema,
 )
 async def get_last_investment():
     async_session = session_manager.async_session
@@ -108,24 +406,149 @@ async def get_last_investment():
             async_session=async_session
         )
     except Exception as e:
-        raise ServerError(f"Ошибка получения последнего результата: {e}")
+        raise ServerError(f"Ошибка получения последнего результата: {e}") from e
 
-    return result
+    return ORJSONResponse(result)
 
 @router.get(
-    path='/investments/',
+    path='/investments/{investment_id}/budget/',
     status_code=status.HTTP_200_OK,
+    response_model=BudgetAllocationSchema,
 )
-async def get_all_investments():
+async def get_budget_allocation(
+    investment_id: UUID,
+    budget: float = Query(..., description="Бюджет для пересчёта"),
+):
+    """
+    Эндпоинт для получения оптимума при другом бюджете
+    по сохранённой кривой бюджета, без повторной загрузки файла.
+    """
     async_session = session_manager.async_session
+    try:
+        allocation = await InvestmentsResultService.get_budget_allocation(
+            async_session=async_session,
+            investment_id=investment_id,
+            budget=budget,
+        )
+    except BaseAPIException:
+        raise
+    except Exception as e:
+        raise ServerError(f"Ошибка получения кривой бюджета: {e}") from e
+    return ORJSONResponse(allocation)
+
+
+@router.post(
+    path='/investments/{investment_id}/what_if/',
+    status_code=status.HTTP_200_OK,
+    response_model=OptimizationResultSchema,
+)
+async def what_if_investment(
+    investment_id: UUID,
+    data: WhatIfRequestSchema,
+):
     """
-    Эндпоинт для получения всех сохраненных результатов оптимизации.
+    Эндпоинт для пересчёта оптимума после замены столбца прибыли
+    одного предприятия по сохранённым таблицам ДП (загрузка с what_if=true).
+    Результат не сохраняется.
     """
+    async_session = session_manager.async_session
     try:
-        results = await InvestmentsResultService.get_all_investments(
-            async_session=async_session
+        state_data = await InvestmentsResultService.get_dp_state(
+            async_session=async_session,
+            investment_id=investment_id,
+        )
+        optimization = await compute_stage(
+            what_if_table,
+            state_data,
+            data.enterprise_index,
+            data.new_column,
+            pipeline="what_if"
         )
+    except BaseAPIException:
+        raise
     except Exception as e:
-        raise ServerError(f"Ошибка получения всех результатов: {e}")
+        raise ServerError(f"Ошибка what-if пересчёта: {e}") from e
+    observe_profile("what_if", optimization.pop('profile'))
 
-    return results
\ No newline at end of file
+    return ORJSONResponse(optimization)
+
+
+@router.get(
+    path='/investments/statistics/',
+    status_code=status.HTTP_200_OK,
+    response_model=InvestmentsStatisticsSchema,
+)
+async def get_investments_statistics(
+    since: datetime | None = Query(None, description="Начало периода"),
+    until: datetime | None = Query(None, description="Конец периода (не включая)"),
+    bucket: StatisticsBucket = Query(
+        StatisticsBucket.DAY,
+        description="Интервал для средних по предприятиям",
+    ),
+):
+    """
+    Эндпоинт для статистики по сохранённым результатам за период:
+    число записей, перцентили ROI и прибыли и средние показатели
+    предприятий по интервалам. Всё считается агрегатами в Postgres.
+    """
+    async_session = session_manager.async_session
+    try:
+        statistics = await InvestmentsResultService.get_statistics(
+            async_session=async_session,
+            bucket=bucket,
+            since=since,
+            until=until,
+        )
+    except BaseAPIException:
+        raise
+    except Exception as e:
+        raise ServerError(f"Ошибка получения статистики: {e}") from e
+    return ORJSONResponse(statistics)
+
+
+@router.get(
+    path='/investments/',
+    status_code=status.HTTP_200_OK,
+    response_model=InvestmentsResultPageSchema,
+)
+async def get_all_investments(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None),
+    summary: bool = Query(
+        False,
+        description="Не возвращать distribution и enterprise_details",
+    ),
+    stream: bool = Query(
+        False,
+        description="Отдать все записи после курсора потоком NDJSON",
+    ),
+):
+    """
+    Эндпоинт для получения сохраненных результатов оптимизации
+    от новых к старым с пагинацией по курсору.
+    """
+    async_session = session_manager.async_session
+    if stream:
+        # Проверяем курсор до начала ответа, чтобы вернуть 400, а не оборванный поток
+        InvestmentsResultService.decode_cursor(cursor)
+        return StreamingResponse(
+            InvestmentsResultService.stream_investments(
+                async_session=async_session,
+                cursor=cursor,
+                summary=summary,
+            ),
+            media_type="application/x-ndjson",
+        )
+
+    try:
+        page = await InvestmentsResultService.get_investments_page(
+            async_session=async_session,
+            limit=limit,
+            cursor=cursor,
+            summary=summary,
+        )
+    except BaseAPIException:
+        raise
+    except Exception as e:
+        raise ServerError(f"Ошибка получения всех результатов: {e}") from e
+    return ORJSONResponse(page)
@@ -0,0 +1,279 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+from src.algorithm.progress import OptimizationCancelled, OptimizationTimeout
+from src.backend.config import config
+from src.backend.exceptions import (
+    BadRequestError,
+    BaseAPIException,
+    ComputeTimeoutError,
+    OptimizationCancelledError,
+    ServerError,
+    UnAvailableError,
+)
+from src.backend.metrics import COMPUTE_TIMEOUTS
+
+logger = logging.getLogger(__name__)
+
+# Запас жёсткого таймаута пула над сроком, который воркер проверяет сам
+TIMEOUT_GRACE = 5.0
+
+
+def _worker_main(conn) -> None:
+    """
+    Цикл процесса пула: принимает (func, args, kwargs), возвращает
+    ('ok', результат) или ('error', исключение). None — сигнал остановки.
+    """
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        func, args, kwargs = task
+        # Любая ошибка задачи или её сериализации уходит в родительский
+        # процесс и поднимается там, воркер продолжает работу
+        try:
+            reply = ('ok', func(*args, **kwargs))
+        except Exception as e:  # noqa: BLE001
+            reply = ('error', e)
+        try:
+            conn.send(reply)
+        except Exception as e:  # noqa: BLE001
+            # Результат или исключение не удалось сериализовать
+            conn.send(('error', RuntimeError(f"{type(e).__name__}: {e}")))
+
+
+class _Worker:
+    """
+    Процесс пула с собственным каналом задач: его можно завершить,
+    не затрагивая остальные процессы.
+    """
+
+    def __init__(self, context):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child,))
+        self.process.start()
+        child.close()
+
+    def call(self, func, args, kwargs):
+        self.conn.send((func, args, kwargs))
+        return self.conn.recv()
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout)
+        self.terminate()
+
+    def terminate(self) -> None:
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.conn.close()
+
+
+def _discard_result(future) -> None:
+    # Ответ завершённого процесса не нужен, но исключение надо забрать
+    if not future.cancelled():
+        future.exception()
+
+
+class ComputePool:
+    """
+    Пул процессов для тяжёлых вычислений вне event loop.
+
+    Одновременно принимается не больше max_workers + queue_size задач,
+    остальные запросы сразу получают 503, а не копятся в памяти.
+    Каждая задача занимает свободный процесс целиком, поэтому таймаут
+    отсчитывается от её начала, а зависший процесс завершается и
+    заменяется новым без остановки остальных.
+    """
+
+    def __init__(self, max_workers: int | None, queue_size: int):
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+        self.queue_size = queue_size
+        # spawn: форк процесса с запущенным event loop и потоками небезопасен
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: asyncio.Queue[_Worker] | None = None
+        self._workers: set[_Worker] = set()
+        # Потоки, которые ждут ответа процессов, не блокируя event loop
+        self._threads: ThreadPoolExecutor | None = None
+        self._slots = asyncio.Semaphore(self.max_workers + self.queue_size)
+
+    def start(self) -> None:
+        if self._idle is not None:
+            return
+        logger.info({
+            'action': 'ComputePool/start',
+            'data': {
+                'max_workers': self.max_workers,
+                'queue_size': self.queue_size,
+            }
+        })
+        self._threads = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="compute",
+        )
+        self._idle = asyncio.Queue()
+        for _ in range(self.max_workers):
+            self._idle.put_nowait(self._spawn())
+
+    def shutdown(self) -> None:
+        if self._idle is None:
+            return
+        logger.info({'action': 'ComputePool/shutdown'})
+        for worker in list(self._workers):
+            worker.stop()
+        self._workers.clear()
+        self._threads.shutdown(wait=True, cancel_futures=True)
+        self._threads = None
+        self._idle = None
+
+    async def warm_up(self, func, *args) -> None:
+        """
+        Выполняет func(*args) по разу на каждом процессе пула:
+        процессы заранее загружают модули вычислений.
+        """
+        if self._idle is None:
+            return
+        await asyncio.gather(*(
+            self.run(func, *args, wait=True)
+            for _ in range(self.max_workers)
+        ))
+
+    async def run(
+        self,
+        func,
+        *args,
+        wait: bool = False,
+        timeout: float | None = None,
+        **kwargs,
+    ):
+        """
+        Выполняет func(*args, **kwargs) в пуле процессов.
+
+        При wait=True переполненная очередь не приводит к 503:
+        вызов дожидается свободного места (нужно фоновым задачам).
+
+        timeout — жёсткий предел на само вычисление, без ожидания в
+        очереди. Процесс, который не уложился, завершается и заменяется
+        новым; остальные задачи пула продолжают считаться.
+        """
+        if self._idle is None:
+            raise UnAvailableError("Пул вычислений не запущен")
+        if not wait and self._slots.locked():
+            raise UnAvailableError("Очередь вычислений переполнена")
+
+        async with self._slots:
+            idle = self._idle
+            worker = await idle.get()
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                self._threads, worker.call, func, args, kwargs
+            )
+            try:
+                status, value = await asyncio.wait_for(
+                    asyncio.shield(future), timeout
+                )
+            except TimeoutError:
+                logger.error({
+                    'action': 'ComputePool/run',
+                    'stage': 'timeout',
+                    'data': {
+                        'func': func.__name__,
+                        'timeout': timeout,
+                        'pid': worker.process.pid,
+                    },
+                })
+                future.add_done_callback(_discard_result)
+                self._replace(idle, worker)
+                raise ComputeTimeoutError("Превышено время вычисления")
+            except (EOFError, OSError):
+                logger.error({
+                    'action': 'ComputePool/run',
+                    'stage': 'broken_worker',
+                    'data': {'func': func.__name__, 'pid': worker.process.pid},
+                })
+                self._replace(idle, worker)
+                raise UnAvailableError("Процесс вычислений аварийно завершился")
+            except asyncio.CancelledError:
+                # Задача уже в процессе: он вернётся в пул, когда досчитает
+                future.add_done_callback(
+                    lambda done: self._release(idle, worker, done)
+                )
+                raise
+            idle.put_nowait(worker)
+
+        if status == 'error':
+            raise value
+        return value
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self._context)
+        self._workers.add(worker)
+        return worker
+
+    def _replace(self, idle: asyncio.Queue, worker: _Worker) -> None:
+        worker.terminate()
+        self._workers.discard(worker)
+        # Пул могли остановить, пока задача считалась
+        if idle is self._idle:
+            idle.put_nowait(self._spawn())
+
+    def _release(self, idle: asyncio.Queue, worker: _Worker, future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            self._replace(idle, worker)
+        elif idle is self._idle:
+            idle.put_nowait(worker)
+
+
+compute_pool = ComputePool(
+    max_workers=config.appconfig.compute_workers,
+    queue_size=config.appconfig.compute_queue_size,
+)
+
+
+async def compute_stage(
+    func,
+    *args,
+    inline: bool = False,
+    wait: bool = False,
+    pipeline: str = "upload_file",
+):
+    """
+    Выполняет этап вычислений в пуле процессов или, если задача дешёвая,
+    прямо в обработчике, и переводит ошибки вычислений в ответы API.
+    В пуле действует жёсткий таймаут compute_timeout + TIMEOUT_GRACE.
+    """
+    try:
+        if inline:
+            return func(*args)
+        return await compute_pool.run(
+            func,
+            *args,
+            wait=wait,
+            timeout=config.appconfig.compute_timeout + TIMEOUT_GRACE
+        )
+    except ValueError as e:
+        raise BadRequestError(str(e))
+    except OptimizationTimeout as e:
+        COMPUTE_TIMEOUTS.labels(pipeline=pipeline).inc()
+        raise ComputeTimeoutError(str(e))
+    except OptimizationCancelled as e:
+        raise OptimizationCancelledError(str(e))
+    except ComputeTimeoutError:
+        COMPUTE_TIMEOUTS.labels(pipeline=pipeline).inc()
+        raise
+    except BaseAPIException:
+        raise
+    except Exception as e:
+        raise ServerError(str(e)) from e
@@ -15,6 +15,13 @@ class PostgresConfig(BaseSettings, env_prefix="DB_"):
     password: SecretStr
     name: str
     port: int
+    bulk_chunk_size: int = 1000
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    statement_cache_size: int = 100
 
     @property
     def get_dsn(self) -> str:
@@ -29,6 +36,28 @@ class AppConfig(BaseSettings, env_prefix="APP_"):
     secret_key: SecretStr
     api_version: str = "v1"
     debug: bool = False
+    compute_workers: int | None = None
+    compute_queue_size: int = 8
+    job_workers: int = 2
+    # Срок аренды задачи, секунды: обработчик продлевает его, пока считает,
+    # а задачи с истёкшей арендой забирают другие обработчики
+    job_lease: float = 60
+    result_cache_size: int = 256
+    batch_max_files: int = 500
+    # Предел размера одной книги, в том числе распакованной из архива
+    upload_max_bytes: int = 50 * 1024 * 1024
+    progress_retention: float = 60
+    read_cache_size: int = 1024
+    read_cache_ttl: float = 5
+    warmup: bool = True
+    # По умолчанию открывается pool_size соединений
+    warmup_db_connections: int | None = None
+    # Допуск оптимизации по оценке стоимости (src.algorithm.cost)
+    inline_max_cost: float = 2e6
+    max_cost: float = 2e11
+    max_levels: int = 100_000
+    max_enterprises: int = 10_000
+    compute_timeout: float = 300
 
     @property
     def api_version_prefix(self):
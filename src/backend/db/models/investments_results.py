@@ -1,7 +1,7 @@
-from typing import Any, Dict
+from typing import Any
 
-from sqlalchemy import Float, String
-from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy import Float, Index, LargeBinary, String
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base, TimeStampMixin
@@ -9,13 +9,39 @@ from .base import Base, TimeStampMixin
 
 class InvestmentsResult(Base, TimeStampMixin):
     __tablename__ = "investments_results"
+    __table_args__ = (
+        # Ведущий created_at покрывает и сортировку по времени, и окна статистики
+        Index("ix_investments_results_created_at_id", "created_at", "id"),
+        Index(
+            "ix_investments_results_distribution",
+            "distribution",
+            postgresql_using="gin",
+            postgresql_ops={"distribution": "jsonb_path_ops"},
+        ),
+        Index(
+            "ix_investments_results_enterprise_details",
+            "enterprise_details",
+            postgresql_using="gin",
+            postgresql_ops={"enterprise_details": "jsonb_path_ops"},
+        ),
+    )
 
     file_name: Mapped[str] = mapped_column(String, nullable=False)
     max_profit: Mapped[float] = mapped_column(Float, nullable=False)
     total_investment: Mapped[float] = mapped_column(Float, nullable=False)
     roi: Mapped[float] = mapped_column(Float, nullable=False)
-    distribution: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
-    enterprise_details: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+    distribution: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    enterprise_details: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    file_hash: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+    # Сжатая кривая бюджета (BudgetCurve.to_bytes), грузится только по запросу
+    budget_curve: Mapped[bytes | None] = mapped_column(
+        LargeBinary, nullable=True, deferred=True
+    )
+    # Таблица и префиксные/суффиксные строки ДП (DPState.to_bytes) для what-if
+    dp_state: Mapped[bytes | None] = mapped_column(
+        LargeBinary, nullable=True, deferred=True
+    )
 
     def __repr__(self) -> str:
         return f"<InvestmentResult(id={self.id}, max_profit={self.max_profit})>"
@@ -0,0 +1,32 @@
+import datetime
+import uuid
+from typing import Any
+
+from sqlalchemy import ForeignKey, LargeBinary, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base, TimeStampMixin
+
+
+class OptimizationJob(Base, TimeStampMixin):
+    __tablename__ = "optimization_jobs"
+
+    file_name: Mapped[str] = mapped_column(String, nullable=False)
+    engine: Mapped[str] = mapped_column(String, nullable=False)
+    status: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    payload: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    started_at: Mapped[datetime.datetime | None] = mapped_column(nullable=True)
+    finished_at: Mapped[datetime.datetime | None] = mapped_column(nullable=True)
+    # Аренда задачи обработчиком: пока срок не истёк, задача занята
+    locked_until: Mapped[datetime.datetime | None] = mapped_column(nullable=True)
+    result: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
+    result_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("investments_results.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+
+    def __repr__(self) -> str:
+        return f"<OptimizationJob(id={self.id}, status={self.status})>"
@@ -1,8 +1,9 @@
 from datetime import datetime
-from typing import Any, Dict, List
+from enum import Enum
+from typing import Any
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, FiniteFloat
 
 
 class EnterpriseStatsSchema(BaseModel):
@@ -16,13 +17,51 @@ class InvestmentStatisticsSchema(BaseModel):
     total_investment: float
     total_profit: float
     roi: float
-    enterprises: List[EnterpriseStatsSchema]
+    enterprises: list[EnterpriseStatsSchema]
+
+
+class AllocationSchema(BaseModel):
+    profit: float
+    distribution: list[float]
+
+
+class BudgetPointSchema(BaseModel):
+    budget: float
+    max_profit: float
+
+
+class BudgetAllocationSchema(BaseModel):
+    budget: float
+    max_profit: float
+    distribution: list[float]
+
+
+class WhatIfRequestSchema(BaseModel):
+    enterprise_index: int = Field(ge=0)
+    # NaN и бесконечности ломают ДП: отклоняются с 422 ещё при разборе
+    new_column: list[FiniteFloat]
 
 
 class OptimizationResultSchema(BaseModel):
     max_profit: float
-    distribution: List[float]
+    distribution: list[float]
     statistics: InvestmentStatisticsSchema
+    alternatives: list[AllocationSchema] | None = None
+    budget_curve: list[BudgetPointSchema] | None = None
+
+
+class BatchItemResultSchema(BaseModel):
+    index: int
+    file_name: str
+    id: UUID | None = None
+    result: OptimizationResultSchema | None = None
+    error: str | None = None
+
+
+class BatchResultSchema(BaseModel):
+    succeeded: int
+    failed: int
+    items: list[BatchItemResultSchema]
 
 
 class InvestmentsResultBaseSchema(BaseModel):
@@ -30,12 +69,15 @@ class InvestmentsResultBaseSchema(BaseModel):
     max_profit: float
     total_investment: float
     roi: float
-    distribution: Dict[str, Any]
-    enterprise_details: Dict[str, Any]
+    distribution: dict[str, Any]
+    enterprise_details: dict[str, Any]
 
 
 class InvestmentsResultCreateSchema(InvestmentsResultBaseSchema):
-    pass
+    file_hash: str | None = None
+    content_hash: str | None = None
+    budget_curve: bytes | None = None
+    dp_state: bytes | None = None
 
 
 class InvestmentsResultSchema(InvestmentsResultBaseSchema):
@@ -45,3 +87,56 @@ class InvestmentsResultSchema(InvestmentsResultBaseSchema):
 
     class Config:
         from_attributes = True
+
+
+class InvestmentsResultSummarySchema(BaseModel):
+    id: UUID
+    file_name: str
+    max_profit: float
+    total_investment: float
+    roi: float
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class InvestmentsResultPageSchema(BaseModel):
+    items: list[InvestmentsResultSchema | InvestmentsResultSummarySchema]
+    next_cursor: str | None = None
+
+
+class StatisticsBucket(str, Enum):
+    HOUR = "hour"
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class DistributionStatsSchema(BaseModel):
+    avg: float | None = None
+    min: float | None = None
+    p50: float | None = None
+    p90: float | None = None
+    p99: float | None = None
+    max: float | None = None
+
+
+class EnterpriseAverageSchema(BaseModel):
+    bucket: datetime
+    enterprise_id: int
+    count: int
+    avg_investment: float
+    avg_profit: float
+    avg_roi: float
+
+
+class InvestmentsStatisticsSchema(BaseModel):
+    since: datetime | None = None
+    until: datetime | None = None
+    bucket: StatisticsBucket
+    count: int
+    roi: DistributionStatsSchema
+    max_profit: DistributionStatsSchema
+    enterprises: list[EnterpriseAverageSchema]
@@ -0,0 +1,51 @@
+from datetime import datetime
+from enum import Enum
+from uuid import UUID
+
+from pydantic import BaseModel, computed_field
+
+from src.backend.db.schemas.investments_results import OptimizationResultSchema
+
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class OptimizationJobCreateSchema(BaseModel):
+    file_name: str
+    engine: str
+    status: str = JobStatus.PENDING.value
+    payload: bytes
+
+
+class OptimizationJobSchema(BaseModel):
+    id: UUID
+    file_name: str
+    engine: str
+    status: JobStatus
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    result_id: UUID | None = None
+    result: OptimizationResultSchema | None = None
+
+    class Config:
+        from_attributes = True
+
+    @computed_field
+    @property
+    def queue_seconds(self) -> float | None:
+        if self.started_at is None:
+            return None
+        return (self.started_at - self.created_at).total_seconds()
+
+    @computed_field
+    @property
+    def run_seconds(self) -> float | None:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return (self.finished_at - self.started_at).total_seconds()
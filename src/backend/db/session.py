@@ -1,23 +1,93 @@
-from typing import Callable
+import time
+from collections.abc import Callable
 
-from sqlalchemy.ext.asyncio import (AsyncSession, async_sessionmaker,
-                                    create_async_engine)
+import orjson
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.backend.config import PostgresConfig, config
+from src.backend.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_OVERFLOW,
+    DB_POOL_SIZE,
+    DB_POOL_WAIT_SECONDS,
+)
 
-from src.backend.config import config
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Пул соединений, который замеряет время ожидания свободного соединения."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT_SECONDS.observe(time.perf_counter() - start)
 
 
 class SessionManager:
-    """Класс, предоставляющий сессии для проекта."""
+    """
+    Класс, предоставляющий сессии для проекта.
 
-    def __init__(self, db_dsn: str, echo: bool = False):
-        self.engine = create_async_engine(
-            url=db_dsn,
-            echo=echo,
-        )
+    Движок и пул соединений создаются при первом обращении, поэтому импорт
+    модуля не тянет драйвер БД: его платят только процессы, которые
+    действительно ходят в базу.
+    """
+
+    def __init__(
+        self,
+        db_dsn: str,
+        pool_config: PostgresConfig,
+        echo: bool = False,
+    ):
+        self.db_dsn = db_dsn
+        self.pool_config = pool_config
+        self.echo = echo
+        self._engine: AsyncEngine | None = None
+        self._async_session: Callable[..., AsyncSession] | None = None
+
+    @property
+    def engine(self) -> AsyncEngine:
+        if self._engine is None:
+            self._engine = self.create_engine()
+        return self._engine
 
     @property
     def async_session(self) -> Callable[..., AsyncSession]:
-        return self.create_session_factory()
+        # Фабрика сессий создаётся один раз и переиспользуется всеми запросами
+        if self._async_session is None:
+            self._async_session = self.create_session_factory()
+        return self._async_session
+
+    def create_engine(self) -> AsyncEngine:
+        pool_config = self.pool_config
+        engine = create_async_engine(
+            url=self.db_dsn,
+            echo=self.echo,
+            poolclass=InstrumentedPool,
+            pool_size=pool_config.pool_size,
+            max_overflow=pool_config.max_overflow,
+            pool_timeout=pool_config.pool_timeout,
+            pool_recycle=pool_config.pool_recycle,
+            pool_pre_ping=pool_config.pool_pre_ping,
+            # JSONB-колонки кодируются тем же orjson, что и ответы API
+            json_serializer=lambda value: orjson.dumps(value).decode(),
+            json_deserializer=orjson.loads,
+            connect_args={
+                "statement_cache_size": pool_config.statement_cache_size,
+            },
+        )
+
+        pool = engine.sync_engine.pool
+        DB_POOL_SIZE.set_function(pool.size)
+        DB_POOL_CHECKED_OUT.set_function(pool.checkedout)
+        DB_POOL_OVERFLOW.set_function(lambda: max(pool.overflow(), 0))
+        return engine
 
     def create_session_factory(self) -> Callable[..., AsyncSession]:
         return async_sessionmaker(
@@ -32,4 +102,5 @@ class SessionManager:
 session_manager = SessionManager(
     db_dsn=config.postgres.get_dsn,
     echo=config.appconfig.debug,
+    pool_config=config.postgres,
 )
@@ -33,6 +33,11 @@ class UserNotAuthorised(BaseAPIException):
     error = "User is not authorized"
 
 
+class OptimizationCancelledError(BaseAPIException):
+    status_code = status.HTTP_409_CONFLICT
+    error = "cancelled"
+
+
 class GoneError(BaseAPIException):
     status_code = status.HTTP_410_GONE
     error = "expired or inactive"
@@ -43,6 +48,21 @@ class UnAvailableError(BaseAPIException):
     error = "service unaviable"
 
 
+class PayloadTooLargeError(BaseAPIException):
+    status_code = 413
+    error = "payload too large"
+
+
+class UnprocessableError(BaseAPIException):
+    status_code = 422
+    error = "unprocessable"
+
+
+class ComputeTimeoutError(BaseAPIException):
+    status_code = status.HTTP_504_GATEWAY_TIMEOUT
+    error = "timeout"
+
+
 class BadRequestError(BaseAPIException):
     status_code = status.HTTP_400_BAD_REQUEST
     error = "bad request"
@@ -0,0 +1,92 @@
+import asyncio
+import logging
+from uuid import UUID
+
+from src.backend.config import config
+from src.backend.db.session import session_manager
+from src.backend.services.optimization_jobs import OptimizationJobService
+
+logger = logging.getLogger(__name__)
+
+
+class JobRunner:
+    """
+    Локальная очередь фоновых задач оптимизации.
+
+    Состояние задач хранится в БД, в памяти лежат только их id. При старте
+    и затем раз в срок аренды в очередь ставятся ожидающие задачи и задачи,
+    чей обработчик перестал продлевать аренду (упал или был перезапущен).
+    Задачи, которые ещё считает живой обработчик, не трогаются.
+    """
+
+    def __init__(self, workers: int, recover_interval: float):
+        self.workers = workers
+        self.recover_interval = recover_interval
+        self._queue: asyncio.Queue[UUID] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        for _ in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker()))
+        recovered = await self._recover()
+        self._tasks.append(asyncio.create_task(self._recover_loop()))
+        logger.info({
+            'action': 'JobRunner/start',
+            'data': {'workers': self.workers, 'recovered': recovered}
+        })
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def submit(self, job_id: UUID) -> None:
+        self._queue.put_nowait(job_id)
+
+    async def _recover(self) -> int:
+        try:
+            job_ids = await OptimizationJobService.get_unfinished_job_ids(
+                async_session=session_manager.async_session
+            )
+        except Exception as e:
+            logger.error({
+                'action': 'JobRunner/recover',
+                'stage': 'failed',
+                'data': {'error': str(e)}
+            }, exc_info=e)
+            return 0
+        # Повтор id в очереди безопасен: claim отдаст задачу только раз
+        for job_id in job_ids:
+            self._queue.put_nowait(job_id)
+        return len(job_ids)
+
+    async def _recover_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.recover_interval)
+            # Пока свои задачи ждут в очереди, чужие не подбираем
+            if self._queue.empty():
+                await self._recover()
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await OptimizationJobService.run_job(
+                    async_session=session_manager.async_session,
+                    job_id=job_id,
+                )
+            except Exception as e:
+                logger.error({
+                    'action': 'JobRunner/worker',
+                    'stage': 'failed',
+                    'data': {'id': job_id, 'error': str(e)}
+                }, exc_info=e)
+            finally:
+                self._queue.task_done()
+
+
+job_runner = JobRunner(
+    workers=config.appconfig.job_workers,
+    recover_interval=config.appconfig.job_lease,
+)
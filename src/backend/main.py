@@ -1,7 +1,10 @@
 import logging
+import time
+from contextlib import asynccontextmanager
 
-import uvicorn
 from fastapi import FastAPI, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
@@ -9,8 +12,15 @@ from prometheus_fastapi_instrumentator import Instrumentator
 from pythonjsonlogger import jsonlogger
 
 from src.backend.api.api.v1 import v1_router
+from src.backend.compute import compute_pool
 from src.backend.config import config
 from src.backend.exceptions import BaseAPIException
+from src.backend.jobs import job_runner
+from src.backend.metrics import API_ERRORS, STARTUP_SECONDS
+from src.backend.progress import progress_hub
+from src.backend.responses import ORJSONResponse
+from src.backend.services.read_cache import invalidation_listener
+from src.backend.warmup import warm_up
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -24,31 +34,64 @@ logger.addHandler(logHandler)
 instrumentator = None
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start = time.perf_counter()
+    compute_pool.start()
+    if config.appconfig.warmup:
+        await warm_up()
+    await job_runner.start()
+    invalidation_listener.start()
+    STARTUP_SECONDS.labels(stage="total").set(time.perf_counter() - start)
+    yield
+    await invalidation_listener.stop()
+    await job_runner.stop()
+    compute_pool.shutdown()
+    progress_hub.shutdown()
+
+
 # Создаем FastAPI приложение
 app = FastAPI(
     title="Investment Optimizer API",
     description="API для оптимизации распределения инвестиций между предприятиями",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
 @app.exception_handler(BaseAPIException)
 async def unicorn_exception_handler(request: Request, exc: BaseAPIException):
     logger.error(str(exc))
+    API_ERRORS.labels(error=type(exc).__name__).inc()
     return JSONResponse(
         status_code=exc.status_code,
         content={"message": exc.__repr__()},
     )
 
 
-instrumentator = Instrumentator().instrument(app)
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(
+    request: Request, exc: RequestValidationError
+):
+    # Стандартный обработчик пишет ответ через json.dumps и падает с 500,
+    # если во входе были NaN или бесконечности; orjson отдаёт их как null
+    return ORJSONResponse(
+        status_code=422,
+        content={"detail": jsonable_encoder(exc.errors())},
+    )
+
+
+instrumentator = Instrumentator().instrument(app).expose(
+    app, include_in_schema=False
+)
 
 app.include_router(v1_router, prefix=config.appconfig.api_version_prefix)
 app.add_middleware(
     middleware_class=CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "PATCH", "OPTIONS", "HEAD"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "HEAD"],
     allow_headers=["*"],
 )
 
@@ -86,6 +129,8 @@ LOGGING_CONFIG = {
 
 app.mount("/", StaticFiles(directory="src/frontend/", html=True), name="html")
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run(
         app,
         host="0.0.0.0",
@@ -0,0 +1,144 @@
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from prometheus_client import Counter, Gauge, Histogram
+
+RESULT_CACHE_REQUESTS = Counter(
+    "investments_result_cache_requests_total",
+    "Обращения к кэшу результатов оптимизации",
+    ["tier", "outcome"],
+)
+
+STARTUP_SECONDS = Gauge(
+    "app_startup_seconds",
+    "Длительность этапов запуска воркера API",
+    ["stage"],
+)
+
+READ_CACHE_REQUESTS = Counter(
+    "investments_read_cache_requests_total",
+    "Обращения к кэшу чтений результатов (last_investment, get_by_id)",
+    ["method", "outcome"],
+)
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Размер пула соединений с БД",
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Соединения, выданные из пула",
+)
+
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "Соединения сверх pool_size",
+)
+
+DB_POOL_WAIT_SECONDS = Histogram(
+    "db_pool_wait_seconds",
+    "Время ожидания соединения из пула",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+
+PIPELINE_STAGE_SECONDS = Histogram(
+    "optimization_pipeline_stage_seconds",
+    "Длительность этапов конвейера разбор -> оптимизация -> сохранение",
+    ["pipeline", "stage"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+
+INPUT_ENTERPRISES = Histogram(
+    "optimization_input_enterprises",
+    "Число предприятий во входной таблице",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000),
+)
+
+INPUT_LEVELS = Histogram(
+    "optimization_input_levels",
+    "Число уровней инвестиций во входной таблице",
+    buckets=(2, 5, 10, 50, 100, 500, 1000, 5000, 10000, 100000),
+)
+
+INPUT_CELLS = Histogram(
+    "optimization_input_cells",
+    "Число ячеек прибыли во входной таблице",
+    buckets=(10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000),
+)
+
+REPOSITORY_OPERATION_SECONDS = Histogram(
+    "repository_operation_seconds",
+    "Длительность операций репозиториев",
+    ["repository", "operation"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+API_ERRORS = Counter(
+    "api_errors_total",
+    "Ошибки API по классам из src.backend.exceptions",
+    ["error"],
+)
+
+
+def observe_profile(pipeline: str, profile: dict | None) -> None:
+    """
+    Учитывает profile, который вернули функции src.algorithm.pipeline.
+    """
+    if not profile:
+        return
+    for stage, seconds in profile.get('stages', {}).items():
+        PIPELINE_STAGE_SECONDS.labels(pipeline=pipeline, stage=stage).observe(seconds)
+    if 'enterprises' in profile and 'levels' in profile:
+        INPUT_ENTERPRISES.observe(profile['enterprises'])
+        INPUT_LEVELS.observe(profile['levels'])
+        INPUT_CELLS.observe(profile['enterprises'] * profile['levels'])
+
+
+@contextmanager
+def observe_stage(pipeline: str, stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        PIPELINE_STAGE_SECONDS.labels(pipeline=pipeline, stage=stage).observe(
+            time.perf_counter() - start
+        )
+
+
+def observe_repository(func):
+    """
+    Декоратор для методов репозитория: пишет длительность вызова
+    с именами репозитория и метода. Ставится под @classmethod.
+    """
+    @wraps(func)
+    async def wrapper(cls, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await func(cls, *args, **kwargs)
+        finally:
+            REPOSITORY_OPERATION_SECONDS.labels(
+                repository=cls.__name__,
+                operation=func.__name__,
+            ).observe(time.perf_counter() - start)
+    return wrapper
+
+
+ADMISSION_DECISIONS = Counter(
+    "optimization_admission_decisions_total",
+    "Решения допуска оптимизации: inline, pool или причина отказа",
+    ["decision"],
+)
+
+ESTIMATED_COST = Histogram(
+    "optimization_estimated_cost",
+    "Оценка стоимости оптимизации в ячейках перебора",
+    buckets=(1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9, 1e10, 1e11, 1e12),
+)
+
+COMPUTE_TIMEOUTS = Counter(
+    "optimization_compute_timeouts_total",
+    "Вычисления, прерванные по таймауту",
+    ["pipeline"],
+)
@@ -1,4 +1,4 @@
-from fastapi import Depends
+from fastapi import Depends, WebSocket
 from fastapi.security import APIKeyHeader
 from pydantic import SecretStr
 
@@ -12,3 +12,15 @@ async def auth_user(token: str = Depends(auth)):
     if SecretStr(token) != config.appconfig.secret_key:
         raise UserNotAuthorised(token)
     return True
+
+
+def auth_websocket(websocket: WebSocket) -> bool:
+    """
+    Браузер не может задать заголовок для WebSocket, поэтому токен
+    принимается и из query-параметра token.
+    """
+    token = (
+        websocket.headers.get("access-token")
+        or websocket.query_params.get("token")
+    )
+    return token is not None and SecretStr(token) == config.appconfig.secret_key
@@ -0,0 +1,244 @@
+import asyncio
+import logging
+import multiprocessing
+import queue
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from src.algorithm.progress import (
+    OptimizationCancelled,
+    OptimizationTimeout,
+    ProgressReporter,
+)
+from src.backend.config import config
+from src.backend.exceptions import ComputeTimeoutError, OptimizationCancelledError
+
+logger = logging.getLogger(__name__)
+
+FINISHED = 'finished'
+
+
+class ProgressChannel:
+    """
+    События одного вычисления: история для поздних подписчиков,
+    очереди подписчиков и прокси для связи с процессом вычислений.
+    """
+
+    def __init__(self):
+        self.events: list[dict] = []
+        self.subscribers: set[asyncio.Queue] = set()
+        self.queue = None
+        self.cancel_event = None
+        self.pump: asyncio.Task | None = None
+        # Забор событий из очереди и их рассылка не должны перемежаться
+        self.drain_lock = asyncio.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return bool(self.events) and self.events[-1]['stage'] == FINISHED
+
+
+class ProgressHub:
+    """
+    Каналы прогресса длинных вычислений по id, который задаёт клиент.
+
+    Процесс вычислений пишет события в очередь multiprocessing.Manager,
+    фоновая задача перекладывает их подписчикам (SSE, WebSocket).
+    Отмена выставляет флаг, который проверяет ProgressReporter.
+    Manager запускается при первом вычислении с прогрессом. Обращения
+    к Manager — это IPC, поэтому они выполняются в пуле потоков, а не
+    в event loop.
+
+    Каналы живут в памяти процесса: подписка и отмена работают, только
+    если запрос попал в тот же процесс uvicorn, что и вычисление.
+    При нескольких воркерах uvicorn запросы одного progress_id нужно
+    направлять в один процесс (sticky-сессии) или запускать один воркер.
+    """
+
+    def __init__(self, retention: float, poll_interval: float = 0.1):
+        self.retention = retention
+        self.poll_interval = poll_interval
+        self._manager = None
+        self._channels: dict[str, ProgressChannel] = {}
+
+    def shutdown(self) -> None:
+        for channel in self._channels.values():
+            if channel.pump is not None:
+                channel.pump.cancel()
+        self._channels.clear()
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+    async def open(self, channel_id: str) -> ProgressReporter:
+        """
+        Открывает канал для вычисления и возвращает хук для оптимизатора.
+        """
+        loop = asyncio.get_running_loop()
+        if self._manager is None:
+            logger.info({'action': 'ProgressHub/start_manager'})
+            manager = await loop.run_in_executor(
+                None, multiprocessing.get_context("spawn").Manager
+            )
+            # Пока Manager запускался, его мог запустить другой запрос
+            if self._manager is None:
+                self._manager = manager
+            else:
+                manager.shutdown()
+        event_queue = await loop.run_in_executor(None, self._manager.Queue)
+        cancel_event = await loop.run_in_executor(None, self._manager.Event)
+        channel = self._channels.get(channel_id)
+        if channel is None or channel.finished or channel.queue is not None:
+            channel = self._channels[channel_id] = self._replace(channel)
+        channel.queue = event_queue
+        channel.cancel_event = cancel_event
+        channel.pump = asyncio.create_task(self._pump(channel))
+        return ProgressReporter(channel.queue, channel.cancel_event)
+
+    @staticmethod
+    def _replace(channel: ProgressChannel | None) -> ProgressChannel:
+        # Подписчики, пришедшие раньше вычисления, переходят в новый канал
+        fresh = ProgressChannel()
+        if channel is not None and not channel.finished:
+            fresh.subscribers = channel.subscribers
+        return fresh
+
+    async def publish(self, channel_id: str, event: dict) -> None:
+        """
+        Событие из основного процесса. Сначала забираются события
+        процесса вычислений, чтобы не нарушить порядок этапов.
+        """
+        channel = self._channels.get(channel_id)
+        if channel is None:
+            return
+        async with channel.drain_lock:
+            if channel.queue is not None:
+                await self._drain(channel)
+            self._emit(channel, event)
+
+    @staticmethod
+    def _emit(channel: ProgressChannel, event: dict) -> None:
+        channel.events.append(event)
+        for subscriber in channel.subscribers:
+            subscriber.put_nowait(event)
+
+    async def cancel(self, channel_id: str) -> bool:
+        """
+        Просит вычисление остановиться. False, если отменять нечего.
+        """
+        channel = self._channels.get(channel_id)
+        if channel is None or channel.cancel_event is None or channel.finished:
+            return False
+        await asyncio.get_running_loop().run_in_executor(
+            None, channel.cancel_event.set
+        )
+        return True
+
+    async def finish(
+        self,
+        channel_id: str,
+        status: str,
+        detail: str | None = None,
+    ) -> None:
+        channel = self._channels.get(channel_id)
+        if channel is None:
+            return
+        if channel.pump is not None:
+            # Под замком насос не посреди забора: уже полученные им
+            # события не потеряются
+            async with channel.drain_lock:
+                channel.pump.cancel()
+            await asyncio.gather(channel.pump, return_exceptions=True)
+        await self.publish(channel_id, {
+            'stage': FINISHED,
+            'status': status,
+            'detail': detail,
+        })
+        asyncio.get_running_loop().call_later(
+            self.retention, self._expire, channel_id, channel
+        )
+
+    @asynccontextmanager
+    async def track(self, channel_id: str | None):
+        """
+        Открывает канал на время вычисления и закрывает его со статусом
+        succeeded, cancelled, timeout или failed. Без channel_id отдаёт None.
+        """
+        if channel_id is None:
+            yield None
+            return
+        reporter = await self.open(channel_id)
+        try:
+            yield reporter
+        except (OptimizationTimeout, ComputeTimeoutError) as e:
+            await self.finish(
+                channel_id, 'timeout', getattr(e, 'detail', None) or str(e)
+            )
+            raise
+        except (OptimizationCancelled, OptimizationCancelledError) as e:
+            await self.finish(
+                channel_id, 'cancelled', getattr(e, 'detail', None) or str(e)
+            )
+            raise
+        except BaseException as e:
+            await self.finish(
+                channel_id, 'failed', getattr(e, 'detail', None) or str(e)
+            )
+            raise
+        else:
+            await self.finish(channel_id, 'succeeded')
+
+    async def subscribe(self, channel_id: str) -> AsyncIterator[dict]:
+        """
+        Отдаёт уже накопленные события, затем новые — до завершения.
+        Подписаться можно и до начала вычисления.
+        """
+        channel = self._channels.setdefault(channel_id, ProgressChannel())
+        subscriber: asyncio.Queue = asyncio.Queue()
+        for event in channel.events:
+            subscriber.put_nowait(event)
+        channel.subscribers.add(subscriber)
+        try:
+            while True:
+                event = await subscriber.get()
+                yield event
+                if event['stage'] == FINISHED:
+                    return
+        finally:
+            current = self._channels.get(channel_id)
+            if current is not None:
+                current.subscribers.discard(subscriber)
+                if current.queue is None and not current.subscribers:
+                    self._channels.pop(channel_id, None)
+
+    async def _pump(self, channel: ProgressChannel) -> None:
+        while True:
+            async with channel.drain_lock:
+                await self._drain(channel)
+            await asyncio.sleep(self.poll_interval)
+
+    async def _drain(self, channel: ProgressChannel) -> None:
+        events = await asyncio.get_running_loop().run_in_executor(
+            None, self._fetch, channel.queue
+        )
+        for event in events:
+            self._emit(channel, event)
+
+    @staticmethod
+    def _fetch(event_queue) -> list[dict]:
+        events = []
+        while True:
+            try:
+                events.append(event_queue.get_nowait())
+            except queue.Empty:
+                return events
+            except (EOFError, OSError):
+                # Manager уже остановлен
+                return events
+
+    def _expire(self, channel_id: str, channel: ProgressChannel) -> None:
+        if self._channels.get(channel_id) is channel:
+            del self._channels[channel_id]
+
+
+progress_hub = ProgressHub(retention=config.appconfig.progress_retention)
@@ -1,11 +1,18 @@
+import datetime
 import logging
 from abc import ABC
+from collections.abc import AsyncIterator, Iterable
 from typing import Generic, TypeVar
 from uuid import UUID
 
-from sqlalchemy import delete, insert, select, update
+import orjson
+from sqlalchemy import JSON, delete, func, insert, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.backend.config import config
+from src.backend.metrics import observe_repository
+
 logger = logging.getLogger(__name__)
 
 Model = TypeVar("Model")
@@ -21,6 +28,14 @@ class AbstractRepository(ABC):
     async def create(cls, async_session: AsyncSession, data: dict):
         raise NotImplementedError
 
+    @classmethod
+    async def create_many(cls, async_session: AsyncSession, data: list):
+        raise NotImplementedError
+
+    @classmethod
+    async def upsert_many(cls, async_session: AsyncSession, data: list):
+        raise NotImplementedError
+
     @classmethod
     async def update_by_id(
         cls,
@@ -43,6 +58,7 @@ class SQLAlchemyRepository(AbstractRepository, Generic[Model]):
     model: Model = None
 
     @classmethod
+    @observe_repository
     async def get_by_id(
         cls,
         async_session: AsyncSession,
@@ -66,6 +82,7 @@ class SQLAlchemyRepository(AbstractRepository, Generic[Model]):
             return result
 
     @classmethod
+    @observe_repository
     async def create(cls, async_session: AsyncSession, data: dict) -> Model:
         logger.info({
             'action': 'SQLAlchemyRepository/create',
@@ -86,6 +103,167 @@ class SQLAlchemyRepository(AbstractRepository, Generic[Model]):
             return obj
 
     @classmethod
+    @observe_repository
+    async def create_many(
+        cls,
+        async_session: AsyncSession,
+        data: list,
+        chunk_size: int | None = None,
+        returning: bool = True,
+        use_copy: bool = False,
+    ) -> list[Model] | int:
+        """
+        Вставляет много строк в одной транзакции.
+
+        Строки отправляются пачками по chunk_size через executemany.
+        При returning=False возвращается только число вставленных строк,
+        а с use_copy=True вставка идёт через COPY asyncpg — самый быстрый
+        путь для больших загрузок.
+        """
+        logger.info({
+            'action': 'SQLAlchemyRepository/create_many',
+            'stage': 'start',
+            'data': {'count': len(data), 'use_copy': use_copy}
+        })
+        if use_copy and returning:
+            raise ValueError("COPY не поддерживает returning")
+        data = cls._as_dicts(data)
+        if not data:
+            return [] if returning else 0
+
+        chunks = cls._chunks(data, chunk_size)
+        objs = []
+        async with async_session() as session:
+            for chunk in chunks:
+                if use_copy:
+                    await cls._copy_chunk(session, chunk)
+                elif returning:
+                    stmt = insert(cls.model).returning(
+                        cls.model, sort_by_parameter_order=True
+                    )
+                    objs.extend((await session.scalars(stmt, chunk)).all())
+                else:
+                    await session.execute(insert(cls.model), chunk)
+            await session.commit()
+
+        logger.info({
+            'action': 'SQLAlchemyRepository/create_many',
+            'stage': 'end',
+            'data': {'count': len(data)}
+        })
+        return objs if returning else len(data)
+
+    @classmethod
+    @observe_repository
+    async def upsert_many(
+        cls,
+        async_session: AsyncSession,
+        data: list,
+        index_elements: Iterable[str] = ("id",),
+        update_columns: Iterable[str] | None = None,
+        chunk_size: int | None = None,
+    ) -> list[Model]:
+        """
+        Вставляет строки или обновляет существующие (ON CONFLICT DO UPDATE)
+        в одной транзакции.
+
+        По умолчанию обновляются все переданные колонки, кроме index_elements;
+        updated_at обновлённых строк выставляется в now().
+        """
+        logger.info({
+            'action': 'SQLAlchemyRepository/upsert_many',
+            'stage': 'start',
+            'data': {'count': len(data)}
+        })
+        data = cls._as_dicts(data)
+        if not data:
+            return []
+
+        index_elements = list(index_elements)
+        if update_columns is None:
+            update_columns = [
+                key for key in data[0] if key not in index_elements
+            ]
+        stmt = pg_insert(cls.model)
+        set_ = {column: stmt.excluded[column] for column in update_columns}
+        if hasattr(cls.model, "updated_at") and "updated_at" not in set_:
+            set_["updated_at"] = func.now()
+        stmt = stmt.on_conflict_do_update(
+            index_elements=index_elements,
+            set_=set_,
+        ).returning(cls.model, sort_by_parameter_order=True)
+        chunks = cls._chunks(data, chunk_size)
+
+        objs = []
+        async with async_session() as session:
+            for chunk in chunks:
+                objs.extend((await session.scalars(stmt, chunk)).all())
+            await session.commit()
+
+        logger.info({
+            'action': 'SQLAlchemyRepository/upsert_many',
+            'stage': 'end',
+            'data': {'count': len(objs)}
+        })
+        return objs
+
+    @staticmethod
+    def _as_dicts(data: list) -> list[dict]:
+        return [
+            item if isinstance(item, dict) else item.model_dump()
+            for item in data
+        ]
+
+    @staticmethod
+    def _chunks(data: list, chunk_size: int | None) -> list[list]:
+        if chunk_size is None:
+            chunk_size = config.postgres.bulk_chunk_size
+        if chunk_size < 1:
+            raise ValueError("chunk_size должен быть положительным")
+        return [
+            data[start:start + chunk_size]
+            for start in range(0, len(data), chunk_size)
+        ]
+
+    @classmethod
+    async def _copy_chunk(cls, session, chunk: list[dict]) -> None:
+        """
+        Пишет пачку строк через COPY asyncpg.
+
+        Python-значения по умолчанию (например, uuid4 для id) подставляются
+        здесь, колонки с server_default пропускаются и заполняются базой.
+        JSON-колонки сериализуются в строку, как ожидает кодек asyncpg.
+        """
+        table = cls.model.__table__
+        columns = [
+            column for column in table.columns
+            if column.name in chunk[0]
+            or (column.default is not None and column.default.is_callable)
+        ]
+        records = []
+        for row in chunk:
+            record = []
+            for column in columns:
+                if column.name in row:
+                    value = row[column.name]
+                else:
+                    value = column.default.arg(None)
+                if isinstance(column.type, JSON) and value is not None:
+                    value = orjson.dumps(value).decode()
+                record.append(value)
+            records.append(record)
+
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            table.name,
+            records=records,
+            columns=[column.name for column in columns],
+            schema_name=table.schema,
+        )
+
+    @classmethod
+    @observe_repository
     async def update_by_id(
         cls, async_session: AsyncSession, id: UUID, data: dict
     ) -> Model | None:
@@ -113,6 +291,7 @@ class SQLAlchemyRepository(AbstractRepository, Generic[Model]):
             return obj
 
     @classmethod
+    @observe_repository
     async def delete_by_id(
         cls,
         async_session: AsyncSession,
@@ -138,6 +317,7 @@ class SQLAlchemyRepository(AbstractRepository, Generic[Model]):
             return obj
 
     @classmethod
+    @observe_repository
     async def get_all(cls, async_session: AsyncSession) -> list[Model] | None:
         logger.info({
             'action': 'SQLAlchemyRepository/get_all',
@@ -151,6 +331,79 @@ class SQLAlchemyRepository(AbstractRepository, Generic[Model]):
             logger.info({
                     'action': 'SQLAlchemyRepository/get_all',
                     'stage': 'end',
-                    'data': {'result': result}
+                    'data': {'count': len(result)}
             })
             return result
+
+    @classmethod
+    def _keyset_query(
+        cls,
+        after: tuple[datetime.datetime, UUID] | None = None,
+        columns: Iterable[str] | None = None,
+    ):
+        """
+        Запрос с сортировкой по (created_at, id) от новых к старым.
+
+        after — ключ последней строки предыдущей страницы, columns —
+        проекция: если задана, выбираются только эти колонки.
+        """
+        if columns:
+            stmt = select(*(getattr(cls.model, column) for column in columns))
+        else:
+            stmt = select(cls.model)
+        if hasattr(cls.model, "is_active"):
+            stmt = stmt.where(cls.model.is_active)
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(cls.model.created_at, cls.model.id) < tuple_(*after)
+            )
+        return stmt.order_by(cls.model.created_at.desc(), cls.model.id.desc())
+
+    @classmethod
+    @observe_repository
+    async def get_page(
+        cls,
+        async_session: AsyncSession,
+        limit: int,
+        after: tuple[datetime.datetime, UUID] | None = None,
+        columns: Iterable[str] | None = None,
+    ) -> list:
+        """
+        Страница по ключу (created_at, id). С columns возвращает словари
+        с выбранными колонками, без — объекты модели.
+        """
+        logger.info({
+            'action': 'SQLAlchemyRepository/get_page',
+            'stage': 'start',
+            'data': {'limit': limit, 'after': after}
+        })
+        stmt = cls._keyset_query(after=after, columns=columns).limit(limit)
+        async with async_session() as session:
+            result = await session.execute(stmt)
+            rows = result.mappings().all() if columns else result.scalars().all()
+            logger.info({
+                'action': 'SQLAlchemyRepository/get_page',
+                'stage': 'end',
+                'data': {'count': len(rows)}
+            })
+            return rows
+
+    @classmethod
+    async def stream(
+        cls,
+        async_session: AsyncSession,
+        after: tuple[datetime.datetime, UUID] | None = None,
+        columns: Iterable[str] | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator:
+        """
+        Отдаёт строки по одной через серверный курсор,
+        не загружая всю выборку в память.
+        """
+        stmt = cls._keyset_query(after=after, columns=columns)
+        stmt = stmt.execution_options(yield_per=batch_size)
+        async with async_session() as session:
+            result = await session.stream(stmt)
+            rows = result.mappings() if columns else result.scalars()
+            async for row in rows:
+                yield row
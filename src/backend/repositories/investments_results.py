@@ -1,18 +1,155 @@
+from datetime import datetime
+
 import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.backend.db.models.investments_results import InvestmentsResult
+from src.backend.metrics import observe_repository
 from src.backend.repositories.base import SQLAlchemyRepository
 
+PERCENTILES = {'p50': 0.5, 'p90': 0.9, 'p99': 0.99}
+
 
 class InvestmentsResultRepository(SQLAlchemyRepository):
     model = InvestmentsResult
-    
+
     @classmethod
+    @observe_repository
     async def get_last_investment(cls, async_session: AsyncSession):
         async with async_session() as session:
             query = (sa.select(cls.model)
-                     .order_by(cls.model.created_at.desc())
+                     .order_by(cls.model.created_at.desc(), cls.model.id.desc())
                      .limit(1))
             result = await session.execute(query)
             return result.scalars().first()
+
+    @classmethod
+    @observe_repository
+    async def get_by_hash(
+        cls,
+        async_session: AsyncSession,
+        file_hash: str | None = None,
+        content_hash: str | None = None,
+    ):
+        if file_hash is None and content_hash is None:
+            return None
+        async with async_session() as session:
+            query = sa.select(cls.model)
+            if file_hash is not None:
+                query = query.where(cls.model.file_hash == file_hash)
+            if content_hash is not None:
+                query = query.where(cls.model.content_hash == content_hash)
+            query = query.order_by(cls.model.created_at.desc()).limit(1)
+            result = await session.execute(query)
+            return result.scalars().first()
+
+    @classmethod
+    @observe_repository
+    async def get_blob(cls, async_session: AsyncSession, id, column: str):
+        """
+        Читает одну отложенную (deferred) бинарную колонку записи.
+
+        Returns:
+            tuple: (найдена ли запись, значение колонки или None)
+        """
+        async with async_session() as session:
+            query = sa.select(cls.model.id, getattr(cls.model, column)).where(
+                cls.model.id == id
+            )
+            row = (await session.execute(query)).first()
+            if row is None:
+                return False, None
+            return True, row[1]
+
+    @classmethod
+    def _in_window(cls, query, since: datetime | None, until: datetime | None):
+        if since is not None:
+            query = query.where(cls.model.created_at >= since)
+        if until is not None:
+            query = query.where(cls.model.created_at < until)
+        return query
+
+    @staticmethod
+    def _distribution(column, name: str) -> list:
+        """
+        Среднее, минимум, перцентили и максимум колонки одним проходом.
+        """
+        return [
+            sa.func.avg(column).label(f'{name}_avg'),
+            sa.func.min(column).label(f'{name}_min'),
+            *(
+                sa.func.percentile_cont(fraction)
+                .within_group(column)
+                .label(f'{name}_{key}')
+                for key, fraction in PERCENTILES.items()
+            ),
+            sa.func.max(column).label(f'{name}_max'),
+        ]
+
+    @classmethod
+    @observe_repository
+    async def get_statistics(
+        cls,
+        async_session: AsyncSession,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> dict:
+        """
+        Число записей и распределения ROI и прибыли за период.
+        """
+        async with async_session() as session:
+            query = sa.select(
+                sa.func.count().label('count'),
+                *cls._distribution(cls.model.roi, 'roi'),
+                *cls._distribution(cls.model.max_profit, 'max_profit'),
+            )
+            query = cls._in_window(query, since, until)
+            row = (await session.execute(query)).one()
+            return row._asdict()
+
+    @classmethod
+    @observe_repository
+    async def get_enterprise_averages(
+        cls,
+        async_session: AsyncSession,
+        bucket: str,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ):
+        """
+        Средние вложения, прибыль и ROI каждого предприятия по интервалам
+        времени. enterprise_details разворачивается через jsonb_each.
+        """
+        details = sa.func.jsonb_each(cls.model.enterprise_details).table_valued(
+            sa.column('key', sa.String),
+            sa.column('value', JSONB),
+        ).lateral('details')
+        # Единица усечения — значение enum, поэтому подставляется литералом:
+        # с bind-параметром выражения в SELECT и GROUP BY не совпали бы
+        period = sa.func.date_trunc(
+            sa.literal_column(f"'{bucket}'"), cls.model.created_at
+        )
+        enterprise_id = sa.cast(details.c.key, sa.Integer)
+
+        def average(field: str):
+            return sa.func.avg(details.c.value[field].astext.cast(sa.Float))
+
+        async with async_session() as session:
+            query = (
+                sa.select(
+                    period.label('bucket'),
+                    enterprise_id.label('enterprise_id'),
+                    sa.func.count().label('count'),
+                    average('investment').label('avg_investment'),
+                    average('profit').label('avg_profit'),
+                    average('roi').label('avg_roi'),
+                )
+                .select_from(cls.model)
+                .join(details, sa.true())
+                .group_by(period, enterprise_id)
+                .order_by(period, enterprise_id)
+            )
+            query = cls._in_window(query, since, until)
+            result = await session.execute(query)
+            return [row._asdict() for row in result]
@@ -0,0 +1,115 @@
+import datetime
+from uuid import UUID
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.db.models.optimization_jobs import OptimizationJob
+from src.backend.db.schemas.optimization_jobs import JobStatus
+from src.backend.metrics import observe_repository
+from src.backend.repositories.base import SQLAlchemyRepository
+
+
+class OptimizationJobRepository(SQLAlchemyRepository):
+    model = OptimizationJob
+
+    @classmethod
+    def _claimable(cls):
+        """
+        Задача свободна: ждёт в очереди или её обработчик перестал
+        продлевать аренду (упал или был перезапущен).
+        """
+        return sa.or_(
+            cls.model.status == JobStatus.PENDING.value,
+            sa.and_(
+                cls.model.status == JobStatus.RUNNING.value,
+                sa.or_(
+                    cls.model.locked_until.is_(None),
+                    cls.model.locked_until < sa.func.now(),
+                ),
+            ),
+        )
+
+    @classmethod
+    @observe_repository
+    async def claim(cls, async_session: AsyncSession, id: UUID, lease: float):
+        """
+        Атомарно переводит задачу в статус running и берёт её в аренду
+        на lease секунд.
+
+        Возвращает задачу, если она была свободна, иначе None — значит,
+        её уже забрал другой обработчик.
+        """
+        async with async_session() as session:
+            query = (
+                sa.update(cls.model)
+                .where(cls.model.id == id, cls._claimable())
+                .values(
+                    status=JobStatus.RUNNING.value,
+                    started_at=sa.func.now(),
+                    locked_until=sa.func.now() + datetime.timedelta(seconds=lease),
+                )
+                .returning(cls.model)
+            )
+            result = await session.scalar(query)
+            await session.commit()
+            return result
+
+    @classmethod
+    @observe_repository
+    async def extend_lease(
+        cls,
+        async_session: AsyncSession,
+        id: UUID,
+        lease: float,
+    ) -> bool:
+        """
+        Продлевает аренду выполняемой задачи. False — задача уже не в
+        статусе running.
+        """
+        async with async_session() as session:
+            query = (
+                sa.update(cls.model)
+                .where(
+                    cls.model.id == id,
+                    cls.model.status == JobStatus.RUNNING.value,
+                )
+                .values(
+                    locked_until=sa.func.now() + datetime.timedelta(seconds=lease)
+                )
+                .returning(cls.model.id)
+            )
+            result = await session.scalar(query)
+            await session.commit()
+            return result is not None
+
+    @classmethod
+    @observe_repository
+    async def finish(cls, async_session: AsyncSession, id: UUID, data: dict):
+        """
+        Записывает итог задачи и снимает аренду; время завершения
+        берётся по часам БД, как и время запуска.
+        """
+        async with async_session() as session:
+            query = (
+                sa.update(cls.model)
+                .where(cls.model.id == id)
+                .values(**data, finished_at=sa.func.now(), locked_until=None)
+            )
+            await session.execute(query)
+            await session.commit()
+
+    @classmethod
+    @observe_repository
+    async def get_unfinished_ids(cls, async_session: AsyncSession):
+        """
+        Id задач, которые можно забрать: ожидающие и с истёкшей арендой.
+        """
+        async with async_session() as session:
+            query = (
+                sa.select(cls.model.id)
+                .where(cls._claimable())
+                .order_by(cls.model.created_at)
+            )
+            result = await session.execute(query)
+            return result.scalars().all()
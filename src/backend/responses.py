@@ -0,0 +1,44 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any):
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, bytes):
+        # Блобы (кривая бюджета, таблицы ДП) в ответы не отдаются
+        return None
+    raise TypeError(f"Тип {type(value).__name__} не сериализуется в JSON")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Сериализует ответ в JSON одним проходом.
+
+    Pydantic-схемы пишутся их собственным сериализатором, остальное —
+    orjson: UUID, datetime и скаляры NumPy поддерживаются без jsonable_encoder.
+    """
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content)
+    return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON-ответ через orjson.
+
+    Эндпоинты с тяжёлыми ответами возвращают его напрямую: тогда FastAPI
+    не валидирует результат по response_model повторно и не гоняет его
+    через jsonable_encoder, а response_model остаётся для документации.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
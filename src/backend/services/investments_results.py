@@ -1,21 +1,155 @@
-from typing import List
-from uuid import UUID
+import base64
+import binascii
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from uuid import UUID, uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.algorithm.budget_curve import BudgetCurve
+from src.backend.db.models.investments_results import InvestmentsResult
 from src.backend.db.schemas.investments_results import (
-    InvestmentsResultCreateSchema, InvestmentsResultSchema)
-from src.backend.exceptions import NotFoundError
-from src.backend.repositories.investments_results import \
-    InvestmentsResultRepository
+    BudgetAllocationSchema,
+    DistributionStatsSchema,
+    EnterpriseAverageSchema,
+    InvestmentsResultCreateSchema,
+    InvestmentsResultPageSchema,
+    InvestmentsResultSchema,
+    InvestmentsResultSummarySchema,
+    InvestmentsStatisticsSchema,
+    StatisticsBucket,
+)
+from src.backend.exceptions import BadRequestError, NotFoundError
+from src.backend.metrics import RESULT_CACHE_REQUESTS
+from src.backend.repositories.investments_results import InvestmentsResultRepository
+from src.backend.services.read_cache import LAST_INVESTMENT_KEY, read_cache
+from src.backend.services.result_cache import result_cache
+
+SUMMARY_COLUMNS = tuple(InvestmentsResultSummarySchema.model_fields)
+CACHED_RESULT_KEYS = ('max_profit', 'distribution', 'statistics')
 
 
 class InvestmentsResultService:
+    @classmethod
+    async def get_investments_page(
+        cls,
+        async_session: AsyncSession,
+        limit: int,
+        cursor: str | None = None,
+        summary: bool = False,
+    ) -> InvestmentsResultPageSchema:
+        """
+        Страница результатов от новых к старым с курсором на следующую.
+        """
+        schema = cls._listing_schema(summary)
+        rows = await InvestmentsResultRepository.get_page(
+            async_session=async_session,
+            limit=limit,
+            after=cls.decode_cursor(cursor),
+            columns=SUMMARY_COLUMNS if summary else None,
+        )
+        items = [schema.model_validate(row) for row in rows]
+        next_cursor = None
+        if len(items) == limit:
+            next_cursor = cls.encode_cursor(items[-1].created_at, items[-1].id)
+        return InvestmentsResultPageSchema(items=items, next_cursor=next_cursor)
+
+    @classmethod
+    async def stream_investments(
+        cls,
+        async_session: AsyncSession,
+        cursor: str | None = None,
+        summary: bool = False,
+    ) -> AsyncIterator[str]:
+        """
+        Построчно отдаёт результаты в формате NDJSON.
+        """
+        schema = cls._listing_schema(summary)
+        async for row in InvestmentsResultRepository.stream(
+            async_session=async_session,
+            after=cls.decode_cursor(cursor),
+            columns=SUMMARY_COLUMNS if summary else None,
+        ):
+            yield schema.model_validate(row).model_dump_json() + "\n"
+
+    @staticmethod
+    def _listing_schema(summary: bool):
+        return InvestmentsResultSummarySchema if summary else InvestmentsResultSchema
+
+    @staticmethod
+    def encode_cursor(created_at: datetime, id: UUID) -> str:
+        raw = f"{created_at.isoformat()}|{id}".encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str | None) -> tuple[datetime, UUID] | None:
+        if cursor is None:
+            return None
+        try:
+            created_at, id = base64.urlsafe_b64decode(
+                cursor.encode()
+            ).decode().split("|")
+            return datetime.fromisoformat(created_at), UUID(id)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise BadRequestError(f"Некорректный курсор: {cursor}")
+
+    @classmethod
+    async def get_statistics(
+        cls,
+        async_session: AsyncSession,
+        bucket: StatisticsBucket,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> InvestmentsStatisticsSchema:
+        """
+        Сводная статистика за период, целиком посчитанная в Postgres:
+        число записей, распределения ROI и прибыли и средние
+        по предприятиям для каждого интервала bucket.
+        """
+        since, until = cls._naive_utc(since), cls._naive_utc(until)
+        if since is not None and until is not None and since >= until:
+            raise BadRequestError("Начало периода должно быть раньше конца")
+
+        totals = await InvestmentsResultRepository.get_statistics(
+            async_session=async_session,
+            since=since,
+            until=until,
+        )
+        enterprises = await InvestmentsResultRepository.get_enterprise_averages(
+            async_session=async_session,
+            bucket=bucket.value,
+            since=since,
+            until=until,
+        )
+
+        def distribution(name: str) -> DistributionStatsSchema:
+            return DistributionStatsSchema(**{
+                field: totals[f'{name}_{field}']
+                for field in DistributionStatsSchema.model_fields
+            })
+
+        return InvestmentsStatisticsSchema(
+            since=since,
+            until=until,
+            bucket=bucket,
+            count=totals['count'],
+            roi=distribution('roi'),
+            max_profit=distribution('max_profit'),
+            enterprises=[EnterpriseAverageSchema(**row) for row in enterprises],
+        )
+
+    @staticmethod
+    def _naive_utc(value: datetime | None) -> datetime | None:
+        # created_at хранится как timestamp without time zone в UTC
+        if value is None or value.tzinfo is None:
+            return value
+        return value.astimezone(UTC).replace(tzinfo=None)
+
     @classmethod
     async def get_all_investments(
         cls,
         async_session: AsyncSession,
-    ) -> List[InvestmentsResultSchema]:
+    ) -> list[InvestmentsResultSchema]:
         result = await InvestmentsResultRepository.get_all(
             async_session=async_session
         )
@@ -29,9 +163,15 @@ class InvestmentsResultService:
         async_session: AsyncSession,
         investment_id: UUID,
     ) -> InvestmentsResultSchema:
-        result = await InvestmentsResultRepository.get_by_id(
-            async_session=async_session,
-            id=investment_id,
+        async def load():
+            row = await InvestmentsResultRepository.get_by_id(
+                async_session=async_session,
+                id=investment_id,
+            )
+            return InvestmentsResultSchema.model_validate(row) if row else None
+
+        result = await read_cache.get_or_load(
+            str(investment_id), load, method="get_investment_by_id"
         )
         if not result:
             raise NotFoundError(f'Запись с {investment_id} не найдена')
@@ -47,8 +187,235 @@ class InvestmentsResultService:
             async_session=async_session,
             data=data.model_dump(),
         )
+        # Другие воркеры узнают об изменении через NOTIFY из триггера
+        read_cache.invalidate()
         return InvestmentsResultSchema.model_validate(result)
 
+    @classmethod
+    def build_row(
+        cls,
+        file_name: str,
+        result: dict,
+        file_hash: str | None = None,
+        content_hash: str | None = None,
+        budget_curve: bytes | None = None,
+        dp_state: bytes | None = None,
+    ) -> dict:
+        """
+        Строка investments_results прямо из результата оптимизатора,
+        без промежуточных схем. id назначается здесь, чтобы не читать
+        вставленную строку обратно.
+        """
+        statistics = result['statistics']
+        return {
+            'id': uuid4(),
+            'file_name': file_name,
+            'max_profit': result['max_profit'],
+            'total_investment': statistics['total_investment'],
+            'roi': statistics['roi'],
+            # Распределение в виде {предприятие: сумма}
+            'distribution': {
+                str(i + 1): amount
+                for i, amount in enumerate(result['distribution'])
+            },
+            'enterprise_details': {
+                str(ent['enterprise_id']): {
+                    'investment': ent['investment'],
+                    'profit': ent['profit'],
+                    'roi': ent['roi'],
+                }
+                for ent in statistics['enterprises']
+            },
+            'file_hash': file_hash,
+            'content_hash': content_hash,
+            'budget_curve': budget_curve,
+            'dp_state': dp_state,
+        }
+
+    @classmethod
+    async def save_optimization_result(
+        cls,
+        async_session: AsyncSession,
+        file_name: str,
+        result: dict,
+        file_hash: str | None = None,
+        content_hash: str | None = None,
+        budget_curve: bytes | None = None,
+        dp_state: bytes | None = None,
+    ) -> UUID:
+        """
+        Сохраняет результат оптимизации в БД и кладёт его в кэш по хэшам.
+
+        Returns:
+            UUID: id новой записи
+        """
+        row = cls.build_row(
+            file_name=file_name,
+            result=result,
+            file_hash=file_hash,
+            content_hash=content_hash,
+            budget_curve=budget_curve,
+            dp_state=dp_state
+        )
+        await InvestmentsResultRepository.create_many(
+            async_session=async_session,
+            data=[row],
+            returning=False,
+        )
+        read_cache.invalidate()
+        # Альтернативы и кривая бюджета в кэш не попадают
+        cached = {key: result[key] for key in CACHED_RESULT_KEYS}
+        for key in (file_hash, content_hash):
+            if key is not None:
+                result_cache.put(key, cached)
+        return row['id']
+
+    @classmethod
+    async def save_optimization_results(
+        cls,
+        async_session: AsyncSession,
+        rows: list[dict],
+    ) -> list[UUID]:
+        """
+        Сохраняет пачку строк из build_row одной транзакцией.
+        """
+        if not rows:
+            return []
+        await InvestmentsResultRepository.create_many(
+            async_session=async_session,
+            data=rows,
+            returning=False,
+        )
+        read_cache.invalidate()
+        return [row['id'] for row in rows]
+
+    @classmethod
+    async def get_budget_allocation(
+        cls,
+        async_session: AsyncSession,
+        investment_id: UUID,
+        budget: float,
+    ) -> BudgetAllocationSchema:
+        """
+        Оптимум при другом бюджете по сохранённой кривой, без пересчёта ДП.
+        """
+        found, data = await InvestmentsResultRepository.get_blob(
+            async_session=async_session,
+            id=investment_id,
+            column='budget_curve',
+        )
+        if not found:
+            raise NotFoundError(f'Запись с {investment_id} не найдена')
+        if data is None:
+            raise NotFoundError(
+                f'Для записи {investment_id} не сохранена кривая бюджета'
+            )
+
+        curve = BudgetCurve.from_bytes(data)
+        try:
+            level = curve.level_of(budget)
+        except ValueError as e:
+            raise BadRequestError(str(e))
+        max_profit, distribution = curve.allocation(level)
+        return BudgetAllocationSchema(
+            budget=curve.investments[level].item(),
+            max_profit=max_profit,
+            distribution=distribution,
+        )
+
+    @classmethod
+    async def get_dp_state(
+        cls,
+        async_session: AsyncSession,
+        investment_id: UUID,
+    ) -> bytes:
+        """
+        Сохранённые таблицы ДП для what-if пересчёта.
+        """
+        found, data = await InvestmentsResultRepository.get_blob(
+            async_session=async_session,
+            id=investment_id,
+            column='dp_state',
+        )
+        if not found:
+            raise NotFoundError(f'Запись с {investment_id} не найдена')
+        if data is None:
+            raise NotFoundError(
+                f'Для записи {investment_id} не сохранены таблицы ДП'
+            )
+        return data
+
+    @classmethod
+    async def get_cached_result(
+        cls,
+        async_session: AsyncSession,
+        file_hash: str | None = None,
+        content_hash: str | None = None,
+    ) -> dict | None:
+        """
+        Ищет уже посчитанный результат по хэшу файла или таблицы.
+
+        Сначала смотрит в in-process LRU, затем в БД.
+        """
+        key = file_hash if file_hash is not None else content_hash
+        if key is None:
+            return None
+
+        cached = result_cache.get(key)
+        if cached is not None:
+            RESULT_CACHE_REQUESTS.labels(tier="memory", outcome="hit").inc()
+            return cached
+        RESULT_CACHE_REQUESTS.labels(tier="memory", outcome="miss").inc()
+
+        row = await InvestmentsResultRepository.get_by_hash(
+            async_session=async_session,
+            file_hash=file_hash,
+            content_hash=content_hash,
+        )
+        if row is None:
+            RESULT_CACHE_REQUESTS.labels(tier="db", outcome="miss").inc()
+            return None
+        RESULT_CACHE_REQUESTS.labels(tier="db", outcome="hit").inc()
+
+        result = cls.to_optimization_result(row)
+        result_cache.put(key, result)
+        return result
+
+    @classmethod
+    def to_optimization_result(
+        cls,
+        row: InvestmentsResult,
+    ) -> dict:
+        """
+        Восстанавливает результат оптимизации (поля OptimizationResultSchema)
+        из сохранённой строки.
+        """
+        enterprises = [
+            {
+                'enterprise_id': int(enterprise_id),
+                **details,
+            }
+            for enterprise_id, details in sorted(
+                row.enterprise_details.items(), key=lambda item: int(item[0])
+            )
+        ]
+        distribution = [
+            amount
+            for _, amount in sorted(
+                row.distribution.items(), key=lambda item: int(item[0])
+            )
+        ]
+        return {
+            'max_profit': row.max_profit,
+            'distribution': distribution,
+            'statistics': {
+                'total_investment': row.total_investment,
+                'total_profit': sum(ent['profit'] for ent in enterprises),
+                'roi': row.roi,
+                'enterprises': enterprises,
+            },
+        }
+
     @classmethod
     async def update_investment(
         cls,
@@ -61,6 +428,8 @@ class InvestmentsResultService:
             id=investment_id,
             data=data.model_dump()
         )
+        read_cache.invalidate(str(investment_id))
+        result_cache.clear()
         if not result:
             raise NotFoundError(f'Запись с {investment_id} не найдена')
         return InvestmentsResultSchema.model_validate(result)
@@ -84,12 +453,25 @@ class InvestmentsResultService:
             async_session=async_session,
             id=investment_id,
         )
+        read_cache.invalidate(str(investment_id))
+        # Записи кэша результатов не знают id строки: после удаления
+        # повторная загрузка должна найти результат только в БД
+        result_cache.clear()
 
     @classmethod
-    async def get_last_investment(cls, async_session: AsyncSession):
-        result = await InvestmentsResultRepository.get_last_investment(
-            async_session=async_session
+    async def get_last_investment(
+        cls,
+        async_session: AsyncSession,
+    ) -> InvestmentsResultSchema:
+        async def load():
+            row = await InvestmentsResultRepository.get_last_investment(
+                async_session=async_session
+            )
+            return InvestmentsResultSchema.model_validate(row) if row else None
+
+        result = await read_cache.get_or_load(
+            LAST_INVESTMENT_KEY, load, method="get_last_investment"
         )
         if not result:
             raise NotFoundError('Нет ни одного результата инвестирования')
-        return result
\ No newline at end of file
+        return result
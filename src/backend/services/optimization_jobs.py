@@ -0,0 +1,170 @@
+import asyncio
+import hashlib
+import logging
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.algorithm.pipeline import optimize_workbook
+from src.backend.compute import compute_stage
+from src.backend.config import config
+from src.backend.db.schemas.optimization_jobs import (
+    JobStatus,
+    OptimizationJobCreateSchema,
+    OptimizationJobSchema,
+)
+from src.backend.exceptions import NotFoundError
+from src.backend.metrics import observe_profile, observe_stage
+from src.backend.progress import progress_hub
+from src.backend.repositories.optimization_jobs import OptimizationJobRepository
+from src.backend.services.investments_results import InvestmentsResultService
+
+logger = logging.getLogger(__name__)
+
+
+class OptimizationJobService:
+    @classmethod
+    async def submit_job(
+        cls,
+        async_session: AsyncSession,
+        file_name: str,
+        engine: str,
+        payload: bytes,
+    ) -> OptimizationJobSchema:
+        job = await OptimizationJobRepository.create(
+            async_session=async_session,
+            data=OptimizationJobCreateSchema(
+                file_name=file_name,
+                engine=engine,
+                payload=payload,
+            ),
+        )
+        return OptimizationJobSchema.model_validate(job)
+
+    @classmethod
+    async def get_job(
+        cls,
+        async_session: AsyncSession,
+        job_id: UUID,
+    ) -> OptimizationJobSchema:
+        job = await OptimizationJobRepository.get_by_id(
+            async_session=async_session,
+            id=job_id,
+        )
+        if not job:
+            raise NotFoundError(f'Задача {job_id} не найдена')
+        return OptimizationJobSchema.model_validate(job)
+
+    @classmethod
+    async def get_unfinished_job_ids(
+        cls,
+        async_session: AsyncSession,
+    ) -> list[UUID]:
+        return await OptimizationJobRepository.get_unfinished_ids(
+            async_session=async_session
+        )
+
+    @classmethod
+    async def run_job(cls, async_session: AsyncSession, job_id: UUID) -> None:
+        """
+        Выполняет задачу: оптимизация в пуле процессов и сохранение результата.
+
+        Задача берётся в аренду на config.appconfig.job_lease секунд и
+        продлевается, пока выполняется: если обработчик упадёт, после
+        истечения аренды задачу заберёт другой.
+        """
+        lease = config.appconfig.job_lease
+        job = await OptimizationJobRepository.claim(
+            async_session=async_session,
+            id=job_id,
+            lease=lease,
+        )
+        if job is None:
+            return
+
+        heartbeat = asyncio.create_task(
+            cls._keep_lease(async_session, job_id, lease)
+        )
+        try:
+            await cls._execute(async_session, job)
+        finally:
+            heartbeat.cancel()
+
+    @classmethod
+    async def _keep_lease(
+        cls,
+        async_session: AsyncSession,
+        job_id: UUID,
+        lease: float,
+    ) -> None:
+        while True:
+            await asyncio.sleep(lease / 3)
+            try:
+                await OptimizationJobRepository.extend_lease(
+                    async_session=async_session,
+                    id=job_id,
+                    lease=lease,
+                )
+            except Exception as e:
+                # Следующая попытка успеет до истечения аренды
+                logger.warning({
+                    'action': 'OptimizationJobService/keep_lease',
+                    'stage': 'failed',
+                    'data': {'id': job_id, 'error': str(e)}
+                }, exc_info=e)
+
+    @classmethod
+    async def _execute(cls, async_session: AsyncSession, job) -> None:
+        job_id = job.id
+        try:
+            # Канал прогресса задачи — её id: /files/progress/{job_id}
+            async with progress_hub.track(str(job_id)) as progress:
+                # Воркер следит за сроком сам, пул страхует таймаутом
+                # с запасом: зависшая задача не держит воркер и аренду
+                progress.timeout = config.appconfig.compute_timeout
+                optimization = await compute_stage(
+                    optimize_workbook,
+                    job.payload,
+                    job.engine,
+                    progress,
+                    wait=True,
+                    pipeline="job",
+                )
+                observe_profile("job", optimization.pop('profile'))
+                content_hash = optimization.pop('content_hash')
+                await progress_hub.publish(str(job_id), {'stage': 'persist'})
+                with observe_stage("job", "persist"):
+                    result_id = await InvestmentsResultService.save_optimization_result(
+                        async_session=async_session,
+                        file_name=job.file_name,
+                        result=optimization,
+                        file_hash=hashlib.sha256(job.payload).hexdigest(),
+                        content_hash=content_hash,
+                    )
+        except Exception as e:
+            logger.error({
+                'action': 'OptimizationJobService/run_job',
+                'stage': 'failed',
+                'data': {'id': job_id, 'error': str(e)}
+            }, exc_info=e)
+            await OptimizationJobRepository.finish(
+                async_session=async_session,
+                id=job_id,
+                data={
+                    'status': JobStatus.FAILED.value,
+                    'error': str(e),
+                    'payload': None,
+                },
+            )
+            return
+
+        await OptimizationJobRepository.finish(
+            async_session=async_session,
+            id=job_id,
+            data={
+                'status': JobStatus.SUCCEEDED.value,
+                'result': optimization,
+                'result_id': result_id,
+                'payload': None,
+            },
+        )
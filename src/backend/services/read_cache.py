@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from src.backend.config import config
+from src.backend.metrics import READ_CACHE_REQUESTS
+from src.backend.services.result_cache import ResultCache, result_cache
+
+logger = logging.getLogger(__name__)
+
+# Канал, в который триггер на investments_results шлёт NOTIFY
+# (миграция 6b8d0f2a4c37): пустая строка после вставки, id записи
+# после изменения или удаления
+INVALIDATION_CHANNEL = "investments_results_changed"
+LAST_INVESTMENT_KEY = "last"
+
+
+class ReadCache:
+    """
+    TTL + LRU кэш чтений InvestmentsResultService в пределах воркера.
+
+    Записи живут не дольше ttl секунд, даже если уведомление
+    об изменении потерялось. Счётчик поколений защищает от гонки:
+    значение, прочитанное из БД до инвалидации, в кэш не попадает.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._generation = 0
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        method: str,
+    ) -> Any:
+        """
+        Значение из кэша или результат loader(). None не кэшируется.
+        """
+        item = self._items.get(key)
+        if item is not None and item[0] > time.monotonic():
+            self._items.move_to_end(key)
+            READ_CACHE_REQUESTS.labels(method=method, outcome="hit").inc()
+            return item[1]
+        READ_CACHE_REQUESTS.labels(method=method, outcome="miss").inc()
+
+        generation = self._generation
+        value = await loader()
+        if value is not None and generation == self._generation:
+            self._put(key, value)
+        return value
+
+    def _put(self, key: str, value: Any) -> None:
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        self._items[key] = (time.monotonic() + self.ttl, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def invalidate(self, id: str | None = None) -> None:
+        """
+        Сбрасывает последний результат и, если задан id, запись с этим id.
+        """
+        self._generation += 1
+        self._items.pop(LAST_INVESTMENT_KEY, None)
+        if id is not None:
+            self._items.pop(id, None)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._items.clear()
+
+
+class InvalidationListener:
+    """
+    Слушает LISTEN/NOTIFY Postgres и сбрасывает ReadCache, чтобы
+    несколько воркеров uvicorn видели изменения друг друга. Правка или
+    удаление записи сбрасывает и ResultCache: его записи не знают id строк.
+
+    Использует отдельное соединение asyncpg вне пула SQLAlchemy.
+    При обрыве кэш очищается целиком (уведомления могли потеряться),
+    а подключение повторяется с задержкой retry_interval.
+    """
+
+    def __init__(
+        self,
+        cache: ReadCache,
+        dsn: str,
+        results: ResultCache | None = None,
+        retry_interval: float = 5.0,
+    ):
+        self.cache = cache
+        self.results = results
+        self.dsn = dsn
+        self.retry_interval = retry_interval
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning({
+                    'action': 'InvalidationListener/run',
+                    'stage': 'disconnected',
+                    'data': {'error': str(e)},
+                }, exc_info=e)
+            self._clear()
+            await asyncio.sleep(self.retry_interval)
+
+    async def _listen(self) -> None:
+        import asyncpg
+
+        connection = await asyncpg.connect(self.dsn)
+        lost = asyncio.Event()
+        try:
+            connection.add_termination_listener(lambda _: lost.set())
+            await connection.add_listener(INVALIDATION_CHANNEL, self._notify)
+            # Всё, что изменилось до подписки, могло пройти мимо
+            self._clear()
+            logger.info({
+                'action': 'InvalidationListener/listen',
+                'data': {'channel': INVALIDATION_CHANNEL},
+            })
+            await lost.wait()
+        finally:
+            if not connection.is_closed():
+                await connection.close()
+
+    def _clear(self) -> None:
+        self.cache.clear()
+        if self.results is not None:
+            self.results.clear()
+
+    def _notify(self, connection, pid, channel, payload: str) -> None:
+        self.cache.invalidate(payload or None)
+        if payload and self.results is not None:
+            self.results.clear()
+
+
+read_cache = ReadCache(
+    max_size=config.appconfig.read_cache_size,
+    ttl=config.appconfig.read_cache_ttl,
+)
+invalidation_listener = InvalidationListener(
+    cache=read_cache,
+    dsn=config.postgres.get_sync_dsn,
+    results=result_cache,
+)
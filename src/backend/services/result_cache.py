@@ -0,0 +1,36 @@
+from collections import OrderedDict
+
+from src.backend.config import config
+
+
+class ResultCache:
+    """
+    In-process LRU результатов оптимизации по хэшу книги.
+    Значения — готовые к отдаче словари (поля OptimizationResultSchema).
+
+    Стоит перед поиском по хэшу в БД и работает в пределах одного воркера.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items: OrderedDict[str, dict] = OrderedDict()
+
+    def get(self, key: str) -> dict | None:
+        value = self._items.get(key)
+        if value is not None:
+            self._items.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: dict) -> None:
+        if self.max_size <= 0:
+            return
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+
+result_cache = ResultCache(max_size=config.appconfig.result_cache_size)
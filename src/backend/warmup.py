@@ -0,0 +1,65 @@
+import asyncio
+import logging
+import time
+
+import sqlalchemy as sa
+
+from src.algorithm.pipeline import warm_up as warm_up_optimizer
+from src.backend.compute import compute_pool
+from src.backend.config import config
+from src.backend.db.session import session_manager
+from src.backend.metrics import STARTUP_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up_db(connections: int) -> None:
+    """
+    Открывает connections соединений одновременно: после возврата
+    они остаются в пуле, и первые запросы не ждут подключения к БД.
+    """
+    engine = session_manager.engine
+
+    async def ping():
+        async with engine.connect() as connection:
+            await connection.execute(sa.text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(connections)))
+
+
+async def _timed(stage: str, coro) -> None:
+    start = time.perf_counter()
+    try:
+        await coro
+    except Exception as e:
+        # Прогрев не должен мешать запуску: без него первые запросы
+        # просто будут медленнее
+        logger.warning({
+            'action': 'warm_up',
+            'stage': stage,
+            'data': {'error': str(e)},
+        }, exc_info=e)
+    finally:
+        STARTUP_SECONDS.labels(stage=stage).set(time.perf_counter() - start)
+
+
+async def warm_up() -> None:
+    """
+    Прогрев воркера при старте: соединения с БД, процессы пула вычислений
+    и оптимизатор в основном процессе (на нём считаются дешёвые задачи).
+    """
+    start = time.perf_counter()
+    warm_up_optimizer(load_xlsx=False)
+    STARTUP_SECONDS.labels(stage="optimizer").set(time.perf_counter() - start)
+
+    connections = (
+        config.appconfig.warmup_db_connections or config.postgres.pool_size
+    )
+    await asyncio.gather(
+        _timed("db_pool", warm_up_db(connections)),
+        _timed("compute_pool", compute_pool.warm_up(warm_up_optimizer)),
+    )
+    logger.info({
+        'action': 'warm_up',
+        'data': {'seconds': time.perf_counter() - start},
+    })
@@ -0,0 +1,92 @@
+import argparse
+import sys
+
+from src.algorithm.engines import OptimizationEngine
+from src.batch.runner import (
+    DatabaseLoader,
+    OutputFormat,
+    collect_inputs,
+    detect_format,
+    run_batch,
+)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.batch",
+        description="Пакетная оптимизация книг из каталога или по шаблону",
+    )
+    parser.add_argument("sources", nargs="+",
+                        help="Каталоги, glob-шаблоны или пути к книгам")
+    parser.add_argument("--output", default="batch_output.jsonl",
+                        help="Файл JSONL или каталог Parquet для результатов")
+    parser.add_argument("--format", choices=[f.value for f in OutputFormat],
+                        default=None,
+                        help="Формат вывода, по умолчанию — по --output")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Число процессов, по умолчанию — по числу CPU")
+    parser.add_argument("--engine", choices=[e.value for e in OptimizationEngine],
+                        default=OptimizationEngine.NUMPY.value)
+    parser.add_argument("--top-k", type=int, default=None,
+                        help="Добавить столько лучших распределений")
+    parser.add_argument("--resume", action="store_true",
+                        help="Пропустить книги, уже обработанные в --output")
+    parser.add_argument("--load-db", action="store_true",
+                        help="Загрузить результаты в investments_results")
+    parser.add_argument("--copy", action="store_true",
+                        help="Загружать в БД через COPY")
+    parser.add_argument("--flush-every", type=int, default=100,
+                        help="Размер пачки для загрузки в БД")
+    args = parser.parse_args(argv)
+    if args.copy and not args.load_db:
+        parser.error("--copy работает только вместе с --load-db")
+
+    try:
+        paths = collect_inputs(args.sources)
+    except ValueError as e:
+        parser.error(str(e))
+    if not paths:
+        print("Книги не найдены")
+        return 0
+
+    output_format = (
+        OutputFormat(args.format) if args.format else detect_format(args.output)
+    )
+
+    def report(record, summary):
+        done = summary['succeeded'] + summary['failed'] + summary['skipped']
+        status = (
+            f"ошибка: {record['error']}" if record['error']
+            else f"прибыль {record['result']['max_profit']}"
+        )
+        print(f"[{done}/{summary['total']}] {record['path']:<45} "
+              f"{record['seconds'] * 1000:>9.1f} ms  {status}")
+
+    loader = DatabaseLoader(use_copy=args.copy) if args.load_db else None
+    try:
+        summary = run_batch(
+            paths,
+            output=args.output,
+            output_format=output_format,
+            workers=args.workers,
+            engine=OptimizationEngine(args.engine),
+            top_k=args.top_k,
+            resume=args.resume,
+            loader=loader,
+            flush_every=args.flush_every,
+            on_record=report,
+        )
+    except ValueError as e:
+        # Например, для вывода в Parquet не установлен pyarrow
+        parser.error(str(e))
+    finally:
+        if loader is not None:
+            loader.close()
+
+    print(f"Готово: {summary['succeeded']} успешно, {summary['failed']} с ошибкой, "
+          f"{summary['skipped']} пропущено")
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,347 @@
+import glob
+import hashlib
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from enum import Enum
+
+import orjson
+
+from src.algorithm.engines import OptimizationEngine
+from src.algorithm.pipeline import optimize_table, parse_workbook
+
+logger = logging.getLogger(__name__)
+
+# Расширения, которые берутся из каталога; формат всё равно
+# определяется по содержимому файла
+INPUT_SUFFIXES = (".xlsx", ".csv", ".parquet", ".npy")
+
+# Сколько задач держать в пуле на один процесс
+_IN_FLIGHT_PER_WORKER = 2
+
+
+class OutputFormat(str, Enum):
+    JSONL = "jsonl"
+    PARQUET = "parquet"
+
+
+def collect_inputs(sources: list[str]) -> list[str]:
+    """
+    Раскрывает каталоги, glob-шаблоны и пути к файлам в отсортированный
+    список книг без повторов. Каталоги обходятся рекурсивно.
+    """
+    paths = set()
+    for source in sources:
+        if os.path.isdir(source):
+            for root, _, files in os.walk(source):
+                paths.update(
+                    os.path.join(root, name) for name in files
+                    if name.lower().endswith(INPUT_SUFFIXES)
+                    and not name.startswith((".", "~$"))
+                )
+        elif glob.has_magic(source):
+            paths.update(
+                path for path in glob.glob(source, recursive=True)
+                if os.path.isfile(path)
+            )
+        elif os.path.isfile(source):
+            paths.add(source)
+        else:
+            raise ValueError(f"Файл или каталог не найден: {source}")
+    return sorted(os.path.normpath(path) for path in paths)
+
+
+def optimize_file(path: str, engine=OptimizationEngine.NUMPY, top_k=None) -> dict:
+    """
+    Оптимизирует одну книгу в процессе пула.
+
+    Ошибка разбора или оптимизации не прерывает прогон, а попадает
+    в запись с полем error.
+    """
+    start = time.perf_counter()
+    record = {'path': path, 'error': None}
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        table, content_hash, _ = parse_workbook(data)
+        result = optimize_table(table, engine, top_k)
+    except Exception as e:  # noqa: BLE001
+        # Любая ошибка книги попадает в отчёт, прогон идёт дальше
+        record['error'] = str(e)
+    else:
+        result.pop('profile')
+        record.update(
+            file_hash=hashlib.sha256(data).hexdigest(),
+            content_hash=content_hash,
+            result=result,
+        )
+    record['seconds'] = time.perf_counter() - start
+    return record
+
+
+class JsonlWriter:
+    """
+    Пишет по строке JSON на книгу. Файл открывается на каждую запись
+    и закрывается сразу после неё, чтобы прерванный прогон можно было
+    продолжить с --resume.
+    """
+
+    def __init__(self, path: str, append: bool):
+        self.path = path
+        if not append and os.path.exists(path):
+            os.remove(path)
+
+    def write(self, records: list[dict]) -> None:
+        with open(self.path, "ab") as f:
+            f.write(b"".join(orjson.dumps(record) + b"\n" for record in records))
+
+    def close(self) -> None:
+        pass
+
+    @staticmethod
+    def completed(path: str) -> set[str]:
+        if not os.path.exists(path):
+            return set()
+        done = set()
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    record = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    # Строка, оборванная при аварийной остановке
+                    continue
+                if record.get('error') is None:
+                    done.add(record['path'])
+        return done
+
+
+class ParquetWriter:
+    """
+    Пишет результаты в каталог Parquet: каждый прогон добавляет свой
+    файл part-*.parquet, записи сбрасываются группами строк.
+
+    В колонках — основные показатели и распределение; полный результат
+    со статистикой по предприятиям есть только в JSONL.
+    """
+
+    def __init__(self, path: str, append: bool):
+        pa, pq = self._import()
+        os.makedirs(path, exist_ok=True)
+        if not append:
+            for name in os.listdir(path):
+                if name.startswith("part-") and name.endswith(".parquet"):
+                    os.remove(os.path.join(path, name))
+        self.path = path
+        self._pa = pa
+        self._schema = pa.schema([
+            ('path', pa.string()),
+            ('error', pa.string()),
+            ('file_hash', pa.string()),
+            ('content_hash', pa.string()),
+            ('max_profit', pa.float64()),
+            ('total_investment', pa.float64()),
+            ('total_profit', pa.float64()),
+            ('roi', pa.float64()),
+            ('distribution', pa.list_(pa.float64())),
+            ('seconds', pa.float64()),
+        ])
+        part = os.path.join(
+            path, f"part-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.parquet"
+        )
+        self._writer = pq.ParquetWriter(part, self._schema)
+
+    @staticmethod
+    def _import():
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError(
+                "Для записи Parquet нужен пакет pyarrow (extra parquet)"
+            )
+        return pa, pq
+
+    def write(self, records: list[dict]) -> None:
+        rows = []
+        for record in records:
+            result = record.get('result') or {}
+            statistics = result.get('statistics') or {}
+            rows.append({
+                'path': record['path'],
+                'error': record['error'],
+                'file_hash': record.get('file_hash'),
+                'content_hash': record.get('content_hash'),
+                'max_profit': result.get('max_profit'),
+                'total_investment': statistics.get('total_investment'),
+                'total_profit': statistics.get('total_profit'),
+                'roi': statistics.get('roi'),
+                'distribution': result.get('distribution'),
+                'seconds': record['seconds'],
+            })
+        self._writer.write_table(
+            self._pa.Table.from_pylist(rows, schema=self._schema)
+        )
+
+    def close(self) -> None:
+        self._writer.close()
+
+    @classmethod
+    def completed(cls, path: str) -> set[str]:
+        if not os.path.isdir(path):
+            return set()
+        pa, pq = cls._import()
+        done = set()
+        for name in sorted(os.listdir(path)):
+            if not (name.startswith("part-") and name.endswith(".parquet")):
+                continue
+            try:
+                table = pq.read_table(
+                    os.path.join(path, name), columns=['path', 'error']
+                )
+            except (OSError, pa.ArrowException) as e:
+                # Файл прогона, оборванного до записи футера: его книги
+                # будут посчитаны заново
+                logger.warning({
+                    'action': 'ParquetWriter/completed',
+                    'stage': 'skipped',
+                    'data': {'file': name, 'error': str(e)},
+                })
+                continue
+            for record in table.to_pylist():
+                if record['error'] is None:
+                    done.add(record['path'])
+        return done
+
+
+_WRITERS = {
+    OutputFormat.JSONL: JsonlWriter,
+    OutputFormat.PARQUET: ParquetWriter,
+}
+
+
+def detect_format(output: str) -> OutputFormat:
+    if output.endswith((".jsonl", ".ndjson")):
+        return OutputFormat.JSONL
+    return OutputFormat.PARQUET
+
+
+class DatabaseLoader:
+    """
+    Догружает успешные результаты в investments_results пачками через
+    create_many, по желанию — через COPY. Бэкенд импортируется только
+    здесь: без --load-db настройки БД не нужны.
+    """
+
+    def __init__(self, use_copy: bool = False):
+        import asyncio
+
+        from src.backend.db.session import session_manager
+        from src.backend.repositories.investments_results import (
+            InvestmentsResultRepository,
+        )
+        from src.backend.services.investments_results import InvestmentsResultService
+
+        self.use_copy = use_copy
+        self._loop = asyncio.new_event_loop()
+        self._session_manager = session_manager
+        self._repository = InvestmentsResultRepository
+        self._service = InvestmentsResultService
+
+    def load(self, records: list[dict]) -> int:
+        rows = [
+            self._service.build_row(
+                file_name=record['path'],
+                result=record['result'],
+                file_hash=record['file_hash'],
+                content_hash=record['content_hash'],
+            )
+            for record in records
+            if record['error'] is None
+        ]
+        if not rows:
+            return 0
+        return self._loop.run_until_complete(self._repository.create_many(
+            async_session=self._session_manager.async_session,
+            data=rows,
+            returning=False,
+            use_copy=self.use_copy,
+        ))
+
+    def close(self) -> None:
+        self._loop.run_until_complete(self._session_manager.engine.dispose())
+        self._loop.close()
+
+
+def run_batch(
+    paths: list[str],
+    output: str,
+    output_format: OutputFormat,
+    workers: int | None = None,
+    engine=OptimizationEngine.NUMPY,
+    top_k=None,
+    resume: bool = False,
+    loader: DatabaseLoader | None = None,
+    flush_every: int = 100,
+    on_record=None,
+) -> dict:
+    """
+    Оптимизирует книги в пуле процессов и пишет результаты по мере готовности.
+
+    С resume уже успешно обработанные книги пропускаются, а новые записи
+    дописываются к результатам прошлого прогона. С loader записи сначала
+    загружаются в БД пачками по flush_every и только потом попадают
+    в вывод, поэтому после сбоя resume не создаст в БД дубликатов
+    (кроме пачки, упавшей между загрузкой и записью).
+
+    Returns:
+        dict: число книг по исходам: total, skipped, succeeded, failed
+    """
+    writer_class = _WRITERS[output_format]
+    done = writer_class.completed(output) if resume else set()
+    pending = [path for path in paths if path not in done]
+    summary = {
+        'total': len(paths),
+        'skipped': len(paths) - len(pending),
+        'succeeded': 0,
+        'failed': 0,
+    }
+
+    writer = writer_class(output, append=resume)
+    buffer = []
+
+    def flush():
+        if loader is not None:
+            loader.load(buffer)
+        writer.write(buffer)
+        buffer.clear()
+
+    # Без БД строки сбрасываются сразу, с БД — пачками для create_many
+    batch_size = flush_every if loader is not None else 1
+    workers = workers or os.cpu_count() or 1
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            window = workers * _IN_FLIGHT_PER_WORKER
+            queue = iter(pending)
+            in_flight = set()
+            while True:
+                for path in queue:
+                    in_flight.add(executor.submit(optimize_file, path, engine, top_k))
+                    if len(in_flight) >= window:
+                        break
+                if not in_flight:
+                    break
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    record = future.result()
+                    summary['failed' if record['error'] else 'succeeded'] += 1
+                    if on_record is not None:
+                        on_record(record, summary)
+                    buffer.append(record)
+                    if len(buffer) >= batch_size:
+                        flush()
+        if buffer:
+            flush()
+    finally:
+        writer.close()
+    return summary
@@ -0,0 +1,66 @@
+import argparse
+import os
+import sys
+
+from src.benchmarks.suite import (
+    build_cases,
+    compare_with_baseline,
+    dump_json,
+    load_json,
+    run_suite,
+    tracked_baseline,
+)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.benchmarks",
+        description="Замеры оптимизатора и загрузчиков на синтетических книгах",
+    )
+    parser.add_argument("--output", default="bench_output.json",
+                        help="Куда записать результаты (JSON)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="Файл базовой линии для проверки регрессий")
+    parser.add_argument("--threshold", type=float, default=0.5,
+                        help="Допустимое замедление, доля от базовой линии")
+    parser.add_argument("--min-time", type=float, default=0.001,
+                        help="Не сравнивать замеры быстрее этого времени, с")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Перезаписать базовую линию текущими замерами")
+    parser.add_argument("--quick", action="store_true",
+                        help="Только небольшие сетки")
+    parser.add_argument("--filter", default=None,
+                        help="Запускать только замеры, содержащие подстроку")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results = run_suite(
+        build_cases(quick=args.quick, seed=args.seed),
+        name_filter=args.filter,
+    )
+    dump_json(results, args.output)
+
+    if args.update_baseline:
+        dump_json(tracked_baseline(results), args.baseline)
+        print(f"Базовая линия обновлена: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"Базовая линия не найдена: {args.baseline}")
+        return 0
+
+    regressions = compare_with_baseline(
+        results, load_json(args.baseline), args.threshold, args.min_time
+    )
+    if regressions:
+        print("Регрессии производительности:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
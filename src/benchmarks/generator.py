@@ -0,0 +1,78 @@
+import io
+
+import numpy as np
+
+DISTRIBUTIONS = ("concave", "convex", "monotone", "noisy")
+
+
+def generate_profit_matrix(
+    num_enterprises: int,
+    num_levels: int,
+    distribution: str = "concave",
+    seed: int = 0,
+    step: int = 10,
+) -> np.ndarray:
+    """
+    Генерирует таблицу в формате книги: [инвестиция, прибыль_1, ..., прибыль_E].
+
+    Первая строка — нулевые инвестиции и нулевая прибыль, шаг сетки
+    одинаковый. Вид столбцов прибыли задаётся distribution:
+
+    - concave: убывающие приросты (типичный случай с насыщением);
+    - convex: возрастающие приросты;
+    - monotone: неубывающая прибыль со случайными приростами;
+    - noisy: произвольные значения без монотонности.
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Неизвестное распределение: {distribution}")
+
+    rng = np.random.default_rng(seed)
+    shape = (num_levels - 1, num_enterprises)
+    if distribution == "concave":
+        increments = -np.sort(-rng.integers(0, 100, size=shape), axis=0)
+    elif distribution == "convex":
+        increments = np.sort(rng.integers(0, 100, size=shape), axis=0)
+    elif distribution == "monotone":
+        increments = rng.integers(0, 100, size=shape)
+    else:
+        increments = rng.integers(-50, 100, size=shape)
+
+    profits = np.zeros((num_levels, num_enterprises), dtype=np.int64)
+    if distribution == "noisy":
+        profits[1:] = increments
+    else:
+        profits[1:] = np.cumsum(increments, axis=0)
+
+    investments = np.arange(num_levels, dtype=np.int64)[:, None] * step
+    return np.hstack([investments, profits])
+
+
+def write_workbook(matrix: np.ndarray, target=None):
+    """
+    Записывает таблицу в XLSX без заголовка. Без target возвращает байты.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    for row in matrix.tolist():
+        sheet.append(row)
+
+    if target is not None:
+        workbook.save(target)
+        return None
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def write_csv(matrix: np.ndarray) -> bytes:
+    return "\n".join(
+        ",".join(str(value) for value in row) for row in matrix.tolist()
+    ).encode()
+
+
+def write_npy(matrix: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    np.save(buffer, matrix)
+    return buffer.getvalue()
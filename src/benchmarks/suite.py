@@ -0,0 +1,304 @@
+import json
+import math
+import platform
+import statistics
+import time
+from collections.abc import Callable
+
+import numpy as np
+from fastapi.encoders import jsonable_encoder
+
+from src.algorithm.algorithm import InvestmentOptimizer
+from src.algorithm.engines import OptimizationEngine, optimize_numpy
+from src.algorithm.pipeline import optimize_table
+from src.algorithm.profit_table import ProfitTable
+from src.backend.db.schemas.investments_results import OptimizationResultSchema
+from src.backend.responses import dumps
+from src.benchmarks.generator import (
+    DISTRIBUTIONS,
+    generate_profit_matrix,
+    write_csv,
+    write_npy,
+    write_workbook,
+)
+
+# (предприятия, уровни инвестиций)
+SIZES = ((10, 50), (50, 200), (200, 1000))
+QUICK_SIZES = ((10, 50), (50, 200))
+
+# Эталонный движок на чистом Python слишком медленный для больших сеток
+PYTHON_ENGINE_MAX_LEVELS = 200
+
+# Быстрые замеры повторяются в цикле, пока один цикл не займёт столько
+# секунд: иначе шум таймера сопоставим с самим временем
+TARGET_TIME = 0.01
+
+# Вогнутая таблица для пути «разделяй и властвуй»: он включается
+# только на целых данных и от 256 уровней (engines._CONCAVE_MIN_LEVELS)
+CONCAVE_SIZE = (20, 1024)
+
+
+class BenchmarkCase:
+    """
+    Один замер: setup готовит входные данные вне замера, run их обрабатывает.
+
+    Если один вызов run короче TARGET_TIME, каждый повтор вызывает его
+    number раз подряд; median и min — время одного вызова.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        setup: Callable[[], object],
+        run: Callable[[object], object],
+        params: dict,
+        tracked: bool = False,
+        repeats: int = 5,
+    ):
+        self.name = name
+        self.setup = setup
+        self.run = run
+        self.params = params
+        self.tracked = tracked
+        self.repeats = repeats
+
+    def measure(self) -> dict:
+        data = self.setup()
+        # Первый вызов заодно прогревает кэши и подбирает число вызовов
+        start = time.perf_counter()
+        self.run(data)
+        elapsed = time.perf_counter() - start
+        if elapsed >= TARGET_TIME:
+            number, timings = 1, [elapsed]
+        else:
+            number, timings = math.ceil(TARGET_TIME / max(elapsed, 1e-7)), []
+        while len(timings) < self.repeats:
+            start = time.perf_counter()
+            for _ in range(number):
+                self.run(data)
+            timings.append((time.perf_counter() - start) / number)
+        return {
+            'params': self.params,
+            'tracked': self.tracked,
+            'repeats': self.repeats,
+            'number': number,
+            'min': min(timings),
+            'median': statistics.median(timings),
+        }
+
+
+def _table(num_enterprises, num_levels, distribution, seed):
+    return lambda: ProfitTable.from_rows(
+        generate_profit_matrix(num_enterprises, num_levels, distribution, seed)
+    )
+
+
+def build_cases(quick: bool = False, seed: int = 0) -> list[BenchmarkCase]:
+    sizes = QUICK_SIZES if quick else SIZES
+    cases = []
+
+    for num_enterprises, num_levels in sizes:
+        size = f"e{num_enterprises}_l{num_levels}"
+        is_large = num_levels > PYTHON_ENGINE_MAX_LEVELS
+        repeats = 1 if is_large else 5
+
+        # Полный перебор распределений — только на небольших сетках
+        distributions = ("concave",) if is_large else DISTRIBUTIONS
+        for distribution in distributions:
+            for engine in OptimizationEngine:
+                if engine == OptimizationEngine.PYTHON and is_large:
+                    continue
+                cases.append(BenchmarkCase(
+                    name=f"optimize/{engine.value}/{distribution}/{size}",
+                    setup=_table(num_enterprises, num_levels, distribution, seed),
+                    run=lambda table, engine=engine: (
+                        InvestmentOptimizer.optimize_investments(table, engine=engine)
+                    ),
+                    params={
+                        'engine': engine.value,
+                        'distribution': distribution,
+                        'enterprises': num_enterprises,
+                        'levels': num_levels,
+                    },
+                    tracked=engine != OptimizationEngine.PYTHON and not is_large,
+                    repeats=1 if engine == OptimizationEngine.PYTHON else repeats,
+                ))
+
+        cases.append(BenchmarkCase(
+            name=f"stats/{size}",
+            setup=lambda e=num_enterprises, levels=num_levels: _stats_input(
+                e, levels, seed
+            ),
+            run=lambda data: InvestmentOptimizer.get_investment_stats(*data),
+            params={'enterprises': num_enterprises, 'levels': num_levels},
+            tracked=not is_large,
+        ))
+
+        # Ответ загрузки: прежний путь через схему и jsonable_encoder
+        # против отдачи словаря оптимизатора через orjson
+        for path, serialize in (
+            ("schema", _serialize_schema),
+            ("orjson", dumps),
+        ):
+            cases.append(BenchmarkCase(
+                name=f"serialize/{path}/{size}",
+                setup=lambda e=num_enterprises, levels=num_levels: (
+                    _response_input(e, levels, seed)
+                ),
+                run=serialize,
+                params={
+                    'path': path,
+                    'enterprises': num_enterprises,
+                    'levels': num_levels,
+                },
+                tracked=path == "orjson" and not is_large,
+                repeats=repeats,
+            ))
+
+        for fmt, writer in (
+            ("xlsx", write_workbook),
+            ("csv", write_csv),
+            ("npy", write_npy),
+        ):
+            cases.append(BenchmarkCase(
+                name=f"load/{fmt}/{size}",
+                setup=lambda e=num_enterprises, levels=num_levels, writer=writer: (
+                    writer(generate_profit_matrix(e, levels, "concave", seed))
+                ),
+                run=lambda data: InvestmentOptimizer.load_data_from_excel_bytes(data),
+                params={
+                    'format': fmt,
+                    'enterprises': num_enterprises,
+                    'levels': num_levels,
+                },
+                tracked=not is_large,
+                repeats=repeats,
+            ))
+
+    # Без этого замера путь для вогнутых столбцов не попадал бы в сравнение:
+    # на сетках до 200 уровней работает только полный перебор
+    num_enterprises, num_levels = CONCAVE_SIZE
+    size = f"e{num_enterprises}_l{num_levels}"
+    concave_table = _table(num_enterprises, num_levels, "concave", seed)
+    cases.append(BenchmarkCase(
+        name=f"optimize/numpy/concave/{size}",
+        setup=concave_table,
+        run=optimize_numpy,
+        params={
+            'engine': OptimizationEngine.NUMPY.value,
+            'distribution': "concave",
+            'enterprises': num_enterprises,
+            'levels': num_levels,
+        },
+        tracked=True,
+    ))
+    if not quick:
+        cases.append(BenchmarkCase(
+            name=f"optimize/numpy-dense/concave/{size}",
+            setup=concave_table,
+            run=lambda table: optimize_numpy(table, concave_fast_path=False),
+            params={
+                'engine': OptimizationEngine.NUMPY.value,
+                'distribution': "concave",
+                'enterprises': num_enterprises,
+                'levels': num_levels,
+                'concave_fast_path': False,
+            },
+            repeats=1,
+        ))
+
+    return cases
+
+
+def _stats_input(num_enterprises, num_levels, seed):
+    table = _table(num_enterprises, num_levels, "concave", seed)()
+    _, distribution = InvestmentOptimizer.optimize_investments(table)
+    return table, distribution
+
+
+def _response_input(num_enterprises, num_levels, seed):
+    table = _table(num_enterprises, num_levels, "concave", seed)()
+    # Перебор top-K на больших сетках занял бы большую часть прогона
+    top_k = 10 if num_levels <= PYTHON_ENGINE_MAX_LEVELS else None
+    result = optimize_table(table, top_k=top_k, budget_curve=True)
+    for key in ('profile', 'budget_curve_data'):
+        result.pop(key)
+    return result
+
+
+def _serialize_schema(result):
+    payload = OptimizationResultSchema(**result)
+    return json.dumps(jsonable_encoder(payload)).encode()
+
+
+def run_suite(cases: list[BenchmarkCase], name_filter: str | None = None) -> dict:
+    results = {}
+    for case in cases:
+        if name_filter and name_filter not in case.name:
+            continue
+        results[case.name] = case.measure()
+        print(f"{case.name:<45} {results[case.name]['median'] * 1000:>10.2f} ms")
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+        },
+        'cases': results,
+    }
+
+
+def compare_with_baseline(
+    results: dict,
+    baseline: dict,
+    threshold: float,
+    min_time: float = 0.001,
+) -> list[str]:
+    """
+    Возвращает отслеживаемые замеры, которые медленнее базовой линии
+    больше чем в (1 + threshold) раз.
+
+    Замеры, у которых один повтор (number вызовов) короче min_time
+    секунд, не сравниваются: на них шум таймера сопоставим с самим
+    временем.
+    """
+    regressions = []
+    for name, reference in baseline.get('cases', {}).items():
+        current = results['cases'].get(name)
+        if current is None:
+            continue
+        if reference['median'] * reference.get('number', 1) < min_time:
+            continue
+        ratio = current['median'] / reference['median']
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: {reference['median'] * 1000:.2f} ms -> "
+                f"{current['median'] * 1000:.2f} ms (x{ratio:.2f})"
+            )
+    return regressions
+
+
+def tracked_baseline(results: dict) -> dict:
+    return {
+        'meta': results['meta'],
+        'cases': {
+            name: {
+                'median': case['median'],
+                'number': case['number'],
+                'params': case['params'],
+            }
+            for name, case in results['cases'].items()
+            if case['tracked']
+        },
+    }
+
+
+def load_json(path) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def dump_json(data: dict, path) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write("\n")
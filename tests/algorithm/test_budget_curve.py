@@ -0,0 +1,54 @@
+import pytest
+
+from src.algorithm.budget_curve import BudgetCurve
+from src.algorithm.engines import optimize_numpy
+from src.algorithm.profit_table import ProfitTable
+from src.benchmarks.generator import generate_profit_matrix
+
+
+def _table(seed=0):
+    return ProfitTable.from_rows(generate_profit_matrix(4, 12, "noisy", seed))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_each_level_matches_truncated_table(seed):
+    table = _table(seed)
+    curve = BudgetCurve.from_table(table)
+
+    for level in range(table.num_levels):
+        truncated = ProfitTable(
+            table.investments[:level + 1], table.profits[:level + 1]
+        )
+        assert curve.allocation(level) == optimize_numpy(truncated)
+
+
+def test_last_level_is_full_optimum():
+    table = _table()
+    curve = BudgetCurve.from_table(table)
+
+    assert curve.allocation(curve.num_levels - 1) == optimize_numpy(table)
+    assert [point['budget'] for point in curve.points()] == (
+        table.investments.tolist()
+    )
+
+
+def test_level_of_rounds_down():
+    curve = BudgetCurve.from_table(_table())
+
+    assert curve.level_of(0) == 0
+    assert curve.level_of(25) == 2
+    assert curve.level_of(30) == 3
+    assert curve.level_of(10**6) == curve.num_levels - 1
+    with pytest.raises(ValueError):
+        curve.level_of(-1)
+
+
+def test_bytes_round_trip():
+    curve = BudgetCurve.from_table(_table())
+
+    restored = BudgetCurve.from_bytes(curve.to_bytes())
+
+    assert restored.points() == curve.points()
+    assert restored.choice.dtype == curve.choice.dtype
+    for level in range(curve.num_levels):
+        assert restored.allocation(level) == curve.allocation(level)
@@ -0,0 +1,56 @@
+import numpy as np
+
+from src.algorithm.cost import PYTHON_ENGINE_WEIGHT, estimate_cost
+from src.algorithm.engines import OptimizationEngine
+from src.algorithm.profit_table import ProfitTable
+
+
+def _dense(levels, enterprises):
+    profits = np.tile(np.arange(levels)[:, None], (1, enterprises))
+    return ProfitTable(np.arange(levels) * 10, profits)
+
+
+def _sparse(levels, enterprises, points, seed=0):
+    rng = np.random.default_rng(seed)
+    investments = np.concatenate([
+        [0], np.sort(rng.choice(np.arange(1, 10**6), levels - 1, replace=False))
+    ])
+    profits = np.full((levels, enterprises), np.nan)
+    for enterprise in range(enterprises):
+        rows = rng.choice(levels, points, replace=False)
+        profits[rows, enterprise] = np.sort(rng.integers(0, 10**6, points))
+    return ProfitTable(investments, profits)
+
+
+def test_dense_cost_is_full_scan():
+    table = _dense(100, 4)
+
+    assert estimate_cost(table) == 4 * 100 * 101 / 2
+    assert estimate_cost(table, OptimizationEngine.PYTHON) == (
+        4 * 100 * 101 / 2 * PYTHON_ENGINE_WEIGHT
+    )
+    assert estimate_cost(table, top_k=3) == 4 * 100 * 101 / 2 * 4
+
+
+def test_sparse_cost_counts_pareto_merge():
+    # Прежняя оценка L · (точки + E) не видела склейки границ Парето
+    few = estimate_cost(_sparse(500, 20, 5))
+    many = estimate_cost(_sparse(500, 20, 60))
+
+    assert few > 500 * (20 * 5 + 20)
+    assert many > 10 * few
+    assert many > 2e6
+
+
+def test_sparse_cost_frontier_is_bounded_by_spend_grid():
+    # Суммы кратны 10 до 990: на границе не больше 100 состояний
+    investments = np.array([0, *range(10, 1000, 20)])
+    profits = np.arange(investments.size, dtype=np.float64)[:, None].repeat(
+        30, axis=1
+    )
+    profits[1::2, ::2] = np.nan
+    table = ProfitTable(investments, profits)
+
+    assert not table.has_uniform_grid
+    cost = estimate_cost(table)
+    assert cost < 30 * 100 * (investments.size + 1) * 20
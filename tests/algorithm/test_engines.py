@@ -0,0 +1,193 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from src.algorithm.algorithm import InvestmentOptimizer
+from src.algorithm.engines import (
+    OptimizationEngine,
+    _Stepper,
+    choice_dtype,
+    is_concave,
+    optimize_numpy,
+    optimize_sparse,
+    top_k_allocations,
+)
+from src.algorithm.profit_table import ProfitTable
+from src.benchmarks.generator import DISTRIBUTIONS, generate_profit_matrix
+
+
+def _table(num_enterprises, num_levels, distribution="monotone", seed=0):
+    return ProfitTable.from_rows(
+        generate_profit_matrix(num_enterprises, num_levels, distribution, seed)
+    )
+
+
+def _brute_force(table):
+    """Перебор всех распределений с суммой номеров уровней не больше L - 1."""
+    best = 0
+    levels = range(table.num_levels)
+    for ks in itertools.product(levels, repeat=table.num_enterprises):
+        if sum(ks) < table.num_levels:
+            profit = sum(table.profits[k, i] for i, k in enumerate(ks))
+            best = max(best, profit)
+    return best
+
+
+@pytest.mark.parametrize("distribution", DISTRIBUTIONS)
+@pytest.mark.parametrize("seed", range(3))
+def test_numpy_engine_matches_python_reference(distribution, seed):
+    table = _table(6, 30, distribution, seed)
+
+    expected = InvestmentOptimizer.optimize_investments(
+        table, engine=OptimizationEngine.PYTHON
+    )
+
+    assert optimize_numpy(table) == expected
+
+
+def test_optimum_matches_brute_force():
+    for seed in range(5):
+        table = _table(3, 8, "noisy", seed)
+        max_profit, distribution = optimize_numpy(table)
+
+        assert max_profit == _brute_force(table)
+        assert sum(distribution) <= table.investments[-1]
+        assert max_profit == sum(
+            table.get_profit(i, amount) for i, amount in enumerate(distribution)
+        )
+
+
+def test_ties_take_smallest_investment():
+    # Вложение во второе предприятие ничего не добавляет
+    table = ProfitTable(
+        np.array([0, 10, 20]), np.array([[0, 0], [5, 0], [5, 0]])
+    )
+
+    assert optimize_numpy(table) == (5, [10, 0])
+    assert InvestmentOptimizer.optimize_investments(
+        table, engine=OptimizationEngine.PYTHON
+    ) == (5, [10, 0])
+
+
+def test_progress_is_reported_per_enterprise():
+    calls = []
+
+    optimize_numpy(_table(4, 10), progress=lambda *args: calls.append(args))
+
+    assert calls == [(1, 4), (2, 4), (3, 4), (4, 4)]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_concave_fast_path_matches_dense(seed):
+    # Нулевые приросты в генераторе дают ничьи, где важно правило выбора
+    table = _table(4, 300, "concave", seed)
+
+    assert optimize_numpy(table) == optimize_numpy(table, concave_fast_path=False)
+
+
+def test_concave_fast_path_needs_exact_arithmetic():
+    exact = _table(2, 300, "concave").profits
+    inexact = exact / 3
+
+    assert _Stepper(exact, concave_fast_path=True).fast_path
+    assert not _Stepper(inexact, concave_fast_path=True).fast_path
+    assert not _Stepper(exact[:10], concave_fast_path=True).fast_path
+    assert not _Stepper(exact, concave_fast_path=False).fast_path
+
+
+def test_is_concave():
+    assert is_concave(np.array([0, 5, 9, 12, 12]))
+    assert is_concave(np.array([0, 1]))
+    assert not is_concave(np.array([0, 1, 3]))
+
+
+@pytest.mark.parametrize("distribution", DISTRIBUTIONS)
+def test_low_memory_matches_full_choice_matrix(distribution):
+    table = _table(7, 40, distribution, seed=1)
+
+    assert optimize_numpy(table, low_memory=True) == optimize_numpy(
+        table, low_memory=False
+    )
+
+
+def test_choice_dtype_is_narrow():
+    assert choice_dtype(256) == np.uint8
+    assert choice_dtype(257) == np.uint16
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_top_allocations_match_brute_force(seed):
+    table = _table(3, 6, "noisy", seed)
+    levels = range(table.num_levels)
+    all_profits = sorted(
+        (
+            sum(table.profits[k, i].item() for i, k in enumerate(ks))
+            for ks in itertools.product(levels, repeat=table.num_enterprises)
+            if sum(ks) < table.num_levels
+        ),
+        reverse=True,
+    )
+
+    allocations = top_k_allocations(table, 10)
+
+    assert [profit for profit, _ in allocations] == all_profits[:10]
+    assert allocations[0] == optimize_numpy(table)
+    distributions = [tuple(distribution) for _, distribution in allocations]
+    assert len(set(distributions)) == len(distributions)
+    for profit, distribution in allocations:
+        assert profit == sum(
+            table.get_profit(i, amount) for i, amount in enumerate(distribution)
+        )
+
+
+def test_top_allocations_stop_at_all_distributions():
+    table = _table(2, 2)
+
+    assert len(top_k_allocations(table, 10)) == 3
+    with pytest.raises(ValueError):
+        top_k_allocations(table, 0)
+
+
+def _check_distribution(table, max_profit, distribution):
+    assert sum(distribution) <= table.investments.max()
+    assert max_profit == sum(
+        table.get_profit(i, amount) for i, amount in enumerate(distribution)
+    )
+
+
+@pytest.mark.parametrize("distribution", DISTRIBUTIONS)
+def test_sparse_engine_matches_dense_on_uniform_grid(distribution):
+    table = _table(5, 25, distribution, seed=2)
+
+    max_profit, result = optimize_sparse(table)
+
+    assert max_profit == optimize_numpy(table)[0]
+    _check_distribution(table, max_profit, result)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_sparse_engine_matches_dense_with_missing_points(seed):
+    dense = _table(4, 20, "noisy", seed)
+    profits = dense.profits.astype(np.float64)
+    missing = np.random.default_rng(seed).random(profits.shape) < 0.3
+    missing[0] = False
+    sparse = ProfitTable(dense.investments, np.where(missing, np.nan, profits))
+    # Пропуск в плотной таблице — точка, которую невыгодно выбирать
+    penalized = ProfitTable(dense.investments, np.where(missing, -1e9, profits))
+
+    max_profit, result = InvestmentOptimizer.optimize_investments(sparse)
+
+    assert sparse.is_sparse
+    assert max_profit == optimize_numpy(penalized)[0]
+    _check_distribution(sparse, max_profit, result)
+
+
+def test_sparse_engine_on_uneven_grid():
+    table = ProfitTable.from_breakpoints([
+        {10: 4, 25: 9, 40: 12},
+        {15: 6, 30: 10},
+    ])
+
+    # 10 + 30 = 40 даёт 14, 25 + 15 — 15
+    assert InvestmentOptimizer.optimize_investments(table) == (15, [25, 15])
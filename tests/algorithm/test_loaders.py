@@ -0,0 +1,113 @@
+import io
+
+import numpy as np
+import pytest
+from openpyxl import Workbook
+
+from src.algorithm.loaders import load_profit_table
+
+
+def _xlsx(rows) -> bytes:
+    workbook = Workbook()
+    sheet = workbook.active
+    for row in rows:
+        sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def _npy(array) -> bytes:
+    buffer = io.BytesIO()
+    np.save(buffer, np.asarray(array))
+    return buffer.getvalue()
+
+
+def test_xlsx_dense_table():
+    table = load_profit_table(_xlsx([[0, 0, 0], [10, 5, 6], [20, 8, 9]]))
+
+    assert table.investments.tolist() == [0, 10, 20]
+    assert table.profits.tolist() == [[0, 0], [5, 6], [8, 9]]
+    assert table.profits.dtype == np.int64
+
+
+def test_xlsx_blank_trailing_cell_in_first_row_keeps_columns():
+    table = load_profit_table(
+        _xlsx([[0, 0, 0, None], [10, 5, 6, 7], [20, 8, 9, 10]])
+    )
+
+    assert table.num_enterprises == 3
+    assert table.is_sparse
+    assert table.profits[1:].tolist() == [[5, 6, 7], [8, 9, 10]]
+
+
+def test_xlsx_drops_empty_trailing_columns():
+    table = load_profit_table(
+        _xlsx([[0, 0, 0, None], [10, 5, 6, None], [20, 8, 9, None]])
+    )
+
+    assert table.num_enterprises == 2
+    assert not table.is_sparse
+
+
+def test_csv_matches_xlsx():
+    rows = [[0, 0, 0], [10, 5, 6], [20, 8, 9]]
+    csv = "\n".join(";".join(map(str, row)) for row in rows).encode()
+
+    from_csv = load_profit_table(csv)
+    from_xlsx = load_profit_table(_xlsx(rows))
+
+    assert from_csv.fingerprint() == from_xlsx.fingerprint()
+
+
+def test_csv_blank_profit_is_missing_point():
+    table = load_profit_table(b"0,0,0\n10,5,\n20,8,9\n")
+
+    assert table.is_sparse
+    assert np.isnan(table.profits[1, 1])
+
+
+@pytest.mark.parametrize("content", [
+    b"0,0\n,5\n",
+    b"0,0\nnan,5\n",
+    b"0,0\ninf,5\n",
+    b"0,0\n10,inf\n",
+    b"0,0\n10,abc\n",
+])
+def test_csv_rejects_bad_values(content):
+    with pytest.raises(ValueError):
+        load_profit_table(content)
+
+
+def test_npy_table():
+    table = load_profit_table(_npy([[0, 0, 0], [10, 5, 6]]))
+
+    assert table.investments.tolist() == [0, 10]
+    assert table.profits.tolist() == [[0, 0], [5, 6]]
+
+
+@pytest.mark.parametrize("array", [
+    [[0.0, 0.0], [np.nan, 5.0]],
+    [[0.0, 0.0], [np.inf, 5.0]],
+    [[0.0, 0.0], [10.0, -np.inf]],
+])
+def test_npy_rejects_non_finite(array):
+    with pytest.raises(ValueError):
+        load_profit_table(_npy(array))
+
+
+def test_parquet_rejects_non_finite_investments():
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    buffer = io.BytesIO()
+    pq.write_table(
+        pa.table({"investments": [0.0, float("inf")], "a": [0.0, 5.0]}), buffer
+    )
+
+    with pytest.raises(ValueError):
+        load_profit_table(buffer.getvalue())
+
+
+def test_xls_is_rejected():
+    with pytest.raises(ValueError):
+        load_profit_table(b"\xd0\xcf\x11\xe0" + b"\x00" * 16)
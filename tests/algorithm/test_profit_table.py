@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from src.algorithm.profit_table import ProfitTable
+
+
+def _sparse():
+    return ProfitTable(
+        np.array([0, 10, 25]),
+        np.array([[0, np.nan], [5, 7], [np.nan, 9]]),
+    )
+
+
+def test_get_profit_dense():
+    table = ProfitTable(np.array([0, 10]), np.array([[0, 1], [5, 6]]))
+
+    assert table.get_profit(1, 10) == 6
+    assert isinstance(table.get_profit(1, 10), int)
+
+
+def test_get_profit_missing_point():
+    table = _sparse()
+
+    assert table.get_profit(0, 10) == 5
+    # Нулевое вложение доступно всегда, даже если точки нет
+    assert table.get_profit(1, 0) == 0
+    with pytest.raises(KeyError):
+        table.get_profit(0, 25)
+    with pytest.raises(KeyError):
+        table.get_profit(0, 15)
+
+
+def test_breakpoints_add_zero_investment():
+    amounts, profits = _sparse().breakpoints(1)
+
+    assert amounts.tolist() == [0, 10, 25]
+    assert profits.tolist() == [0, 7, 9]
+
+
+def test_uniform_grid():
+    assert ProfitTable(
+        np.array([0, 10, 20]), np.zeros((3, 2))
+    ).has_uniform_grid
+    assert not _sparse().has_uniform_grid
+
+
+def test_fingerprint_ignores_number_type():
+    ints = ProfitTable(np.array([0, 10]), np.array([[0, 1], [5, 6]]))
+    floats = ProfitTable(np.array([0.0, 10.0]), np.array([[0.0, 1.0], [5.0, 6.0]]))
+
+    assert ints.fingerprint() == floats.fingerprint()
+
+
+def test_from_rows_splits_investment_column():
+    table = ProfitTable.from_rows([[0, 0, 0], [10, 5, 6], [20, 8, 9]])
+
+    assert table.investments.tolist() == [0, 10, 20]
+    assert table.profits.tolist() == [[0, 0], [5, 6], [8, 9]]
+    assert table.profits.flags['C_CONTIGUOUS']
+    assert (table.num_levels, table.num_enterprises) == (3, 2)
+
+
+def test_from_rows_converts_numeric_strings():
+    table = ProfitTable.from_rows([['0', '0'], ['10', '2.5']])
+
+    assert table.profits.dtype == np.float64
+    assert table.get_profit(0, 10) == 2.5
+
+
+@pytest.mark.parametrize('rows', [
+    [[0], [10]],
+    [0, 10],
+    [['0', 'x'], ['10', '1']],
+])
+def test_from_rows_rejects_bad_shape_and_values(rows):
+    with pytest.raises(ValueError):
+        ProfitTable.from_rows(rows)
+
+
+def test_row_of_takes_first_duplicate():
+    table = ProfitTable(np.array([0, 10, 10]), np.array([[0], [1], [2]]))
+
+    assert table.row_of(10) == 1
+    assert table.row_of(15) is None
+    assert table.get_profit(0, 10) == 1
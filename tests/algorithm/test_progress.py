@@ -0,0 +1,57 @@
+import queue
+import threading
+import time
+
+import pytest
+
+from src.algorithm.progress import (
+    OptimizationCancelled,
+    OptimizationTimeout,
+    ProgressReporter,
+)
+
+
+def _events(event_queue):
+    events = []
+    while not event_queue.empty():
+        events.append(event_queue.get_nowait())
+    return events
+
+
+def test_events_are_throttled_but_last_is_sent():
+    event_queue = queue.Queue()
+    reporter = ProgressReporter(event_queue, interval=60)
+
+    reporter.stage('parse')
+    for done in range(1, 6):
+        reporter(done, 5)
+
+    assert _events(event_queue) == [
+        {'stage': 'parse'},
+        {'stage': 'optimize', 'done': 1, 'total': 5},
+        {'stage': 'optimize', 'done': 5, 'total': 5},
+    ]
+
+
+def test_cancel_event_stops_computation():
+    cancel_event = threading.Event()
+    reporter = ProgressReporter(queue.Queue(), cancel_event, interval=0)
+
+    reporter(1, 3)
+    cancel_event.set()
+
+    with pytest.raises(OptimizationCancelled):
+        reporter(2, 3)
+
+
+def test_timeout_counts_from_first_check():
+    reporter = ProgressReporter(timeout=0.05)
+    time.sleep(0.1)
+
+    # Ожидание до первой проверки в срок не входит
+    reporter(1, 3)
+    time.sleep(0.1)
+
+    # Между отправками срок тоже проверяется
+    with pytest.raises(OptimizationTimeout):
+        reporter(2, 3)
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from src.algorithm.engines import optimize_numpy
+from src.algorithm.profit_table import ProfitTable
+from src.algorithm.what_if import DPState
+
+
+def _table():
+    rng = np.random.default_rng(0)
+    profits = np.cumsum(rng.integers(0, 10, (12, 4)), axis=0)
+    profits[0] = 0
+    return ProfitTable(np.arange(12) * 10, profits)
+
+
+def test_replace_column_matches_full_recompute():
+    table = _table()
+    state = DPState.from_bytes(DPState.from_table(table).to_bytes())
+    column = np.arange(12) * 3
+
+    new_table, max_profit, distribution = state.replace_column(1, column)
+
+    expected_profit, expected_distribution = optimize_numpy(new_table)
+    assert max_profit == expected_profit
+    assert list(distribution) == list(expected_distribution)
+    assert new_table.profits[:, 1].tolist() == column.tolist()
+
+
+@pytest.mark.parametrize("bad", [float("nan"), float("inf"), float("-inf")])
+def test_replace_column_rejects_non_finite(bad):
+    state = DPState.from_table(_table())
+    column = [float(i) for i in range(12)]
+    column[5] = bad
+
+    with pytest.raises(ValueError, match="конечным"):
+        state.replace_column(0, column)
+
+
+def test_replace_column_rejects_wrong_length():
+    state = DPState.from_table(_table())
+
+    with pytest.raises(ValueError):
+        state.replace_column(0, [0.0] * 11)
@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+# Настройки читаются при импорте src.backend, поэтому задаются заранее.
+# Postgres в тестах не нужен: репозитории подменяются в самих тестах
+for key, value in {
+    'DB_HOST': 'localhost',
+    'DB_USER': 'test',
+    'DB_PASSWORD': 'test',
+    'DB_NAME': 'test',
+    'DB_PORT': '5432',
+    'APP_SECRET_KEY': 'test-key',
+    'APP_WARMUP': 'false',
+    'APP_COMPUTE_WORKERS': '1',
+}.items():
+    os.environ.setdefault(key, value)
+
+
+@pytest.fixture(scope='session')
+def client():
+    from fastapi.testclient import TestClient
+
+    from src.backend.main import app
+
+    headers = {'access-token': os.environ['APP_SECRET_KEY']}
+    with TestClient(app, headers=headers) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def saved_rows(monkeypatch):
+    """
+    Подменяет запись результатов и поиск по хэшу: БД пуста,
+    вставленные строки копятся в списке. Кэши начинают пустыми.
+    """
+    from src.backend.repositories.investments_results import InvestmentsResultRepository
+    from src.backend.services.read_cache import read_cache
+    from src.backend.services.result_cache import result_cache
+
+    rows = []
+
+    async def get_by_hash(cls, async_session, file_hash=None,
+                          content_hash=None):
+        return None
+
+    async def create_many(cls, async_session, data, returning=True):
+        rows.extend(data)
+
+    monkeypatch.setattr(
+        InvestmentsResultRepository, 'get_by_hash', classmethod(get_by_hash)
+    )
+    monkeypatch.setattr(
+        InvestmentsResultRepository, 'create_many', classmethod(create_many)
+    )
+    result_cache.clear()
+    read_cache.clear()
+    yield rows
+    result_cache.clear()
+    read_cache.clear()
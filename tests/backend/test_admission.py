@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from src.algorithm.cost import estimate_cost
+from src.algorithm.profit_table import ProfitTable
+from src.backend.admission import Admission, AdmissionController, check_upload_size
+from src.backend.config import config
+from src.backend.exceptions import PayloadTooLargeError, UnprocessableError
+
+
+def _controller(**limits):
+    return AdmissionController(**{
+        'inline_max_cost': 1e3,
+        'max_cost': 1e6,
+        'max_levels': 1000,
+        'max_enterprises': 100,
+        **limits,
+    })
+
+
+def _dense(levels, enterprises):
+    profits = np.tile(np.arange(levels)[:, None], (1, enterprises))
+    return ProfitTable(np.arange(levels) * 10, profits)
+
+
+def test_cheap_dense_table_runs_inline():
+    table = _dense(10, 2)
+
+    assert _controller().admit(table, estimate_cost(table)) is Admission.INLINE
+
+
+def test_costly_dense_table_goes_to_pool():
+    table = _dense(100, 2)
+
+    assert _controller().admit(table, estimate_cost(table)) is Admission.POOL
+
+
+def test_sparse_table_never_runs_inline():
+    table = ProfitTable(
+        np.array([0, 10, 25]), np.array([[0, 0], [5, np.nan], [8, 9.0]])
+    )
+    cost = estimate_cost(table)
+
+    assert cost < 1e3
+    assert _controller().admit(table, cost) is Admission.POOL
+
+
+@pytest.mark.parametrize("limits", [
+    {'max_levels': 50},
+    {'max_enterprises': 1},
+])
+def test_table_outside_shape_limits_is_unprocessable(limits):
+    table = _dense(100, 2)
+
+    with pytest.raises(UnprocessableError):
+        _controller(**limits).admit(table, estimate_cost(table))
+
+
+def test_table_over_cost_budget_is_too_large():
+    table = _dense(100, 2)
+
+    with pytest.raises(PayloadTooLargeError):
+        _controller(max_cost=1e3).admit(table, estimate_cost(table))
+
+
+def test_check_upload_size():
+    limit = config.appconfig.upload_max_bytes
+
+    check_upload_size('table.csv', None)
+    check_upload_size('table.csv', limit)
+    with pytest.raises(PayloadTooLargeError):
+        check_upload_size('table.csv', limit + 1)
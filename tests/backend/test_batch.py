@@ -0,0 +1,59 @@
+import io
+import zipfile
+
+from src.backend.config import config
+
+URL = '/api/v1/files/upload_batch/'
+CSV = b"0,0,0\n10,5,6\n20,8,9\n"
+
+
+def _zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def test_batch_reports_errors_per_file(client, saved_rows):
+    response = client.post(URL, files=[
+        ('files', ('good.csv', CSV)),
+        ('files', ('bad.csv', b"0,x\n")),
+    ])
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body['succeeded'], body['failed']) == (1, 1)
+    good, bad = body['items']
+    assert good['result']['max_profit'] == 11
+    assert bad['id'] is None and bad['error']
+    assert [row['file_name'] for row in saved_rows] == ['good.csv']
+
+
+def test_batch_expands_zip_archive(client, saved_rows):
+    archive = _zip({
+        'b.csv': CSV,
+        'a.csv': CSV,
+        '__MACOSX/._a.csv': b'',
+        '.hidden.csv': b'',
+    })
+
+    response = client.post(URL, files=[('files', ('books.zip', archive))])
+
+    assert response.status_code == 200
+    assert [item['file_name'] for item in response.json()['items']] == [
+        'a.csv', 'b.csv'
+    ]
+
+
+def test_batch_limits_number_of_files(client, saved_rows, monkeypatch):
+    monkeypatch.setattr(config.appconfig, 'batch_max_files', 1)
+    archive = _zip({'a.csv': CSV, 'b.csv': CSV})
+
+    responses = [
+        client.post(URL, files=[('files', ('books.zip', archive))]),
+        client.post(URL, files=[('files', ('a.csv', CSV)), ('files', ('b.csv', CSV))]),
+    ]
+
+    assert [response.status_code for response in responses] == [400, 400]
+    assert saved_rows == []
@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+import pytest
+
+from src.algorithm.progress import OptimizationCancelled, OptimizationTimeout
+from src.backend.compute import ComputePool, compute_stage
+from src.backend.exceptions import (
+    BadRequestError,
+    ComputeTimeoutError,
+    OptimizationCancelledError,
+    ServerError,
+    UnAvailableError,
+)
+
+
+def _run(pool, scenario):
+    async def main():
+        pool.start()
+        try:
+            return await scenario(pool)
+        finally:
+            pool.shutdown()
+
+    return asyncio.run(main())
+
+
+def test_pool_returns_results_and_raises_task_errors():
+    async def scenario(pool):
+        assert await pool.run(abs, -3) == 3
+        with pytest.raises(ValueError):
+            await pool.run(int, "x")
+        # Ошибка задачи не ломает процесс
+        assert await pool.run(abs, -4) == 4
+
+    _run(ComputePool(max_workers=1, queue_size=1), scenario)
+
+
+def test_pool_rejects_calls_before_start():
+    async def scenario():
+        with pytest.raises(UnAvailableError):
+            await ComputePool(max_workers=1, queue_size=1).run(abs, -1)
+
+    asyncio.run(scenario())
+
+
+def test_timeout_replaces_worker():
+    async def scenario(pool):
+        await pool.run(abs, -1)
+        (first,) = pool._workers
+
+        with pytest.raises(ComputeTimeoutError):
+            await pool.run(time.sleep, 30, timeout=0.5)
+
+        assert not first.is_alive()
+        assert first not in pool._workers
+        assert await pool.run(abs, -2) == 2
+
+    _run(ComputePool(max_workers=1, queue_size=0), scenario)
+
+
+def test_overflow_without_wait_is_rejected():
+    async def scenario(pool):
+        await pool.run(abs, -1)
+        busy = asyncio.create_task(pool.run(time.sleep, 0.5))
+        await asyncio.sleep(0.1)
+
+        with pytest.raises(UnAvailableError):
+            await pool.run(abs, -2)
+        # Фоновые задачи ждут места в очереди
+        assert await pool.run(abs, -3, wait=True) == 3
+        await busy
+
+    _run(ComputePool(max_workers=1, queue_size=0), scenario)
+
+
+@pytest.mark.parametrize(("error", "expected"), [
+    (ValueError("bad"), BadRequestError),
+    (OptimizationTimeout("slow"), ComputeTimeoutError),
+    (OptimizationCancelled("stop"), OptimizationCancelledError),
+    (RuntimeError("boom"), ServerError),
+])
+def test_compute_stage_maps_errors(error, expected):
+    def fail():
+        raise error
+
+    with pytest.raises(expected):
+        asyncio.run(compute_stage(fail, inline=True))
@@ -0,0 +1,152 @@
+import asyncio
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from src.backend.admission import admission_controller
+from src.backend.config import config
+from src.backend.db.schemas.optimization_jobs import JobStatus, OptimizationJobSchema
+from src.backend.jobs import JobRunner, job_runner
+from src.backend.repositories.optimization_jobs import OptimizationJobRepository
+from src.backend.services.optimization_jobs import OptimizationJobService
+
+CSV = b"0,0,0\n10,5,6\n20,8,9\n"
+
+
+@pytest.fixture
+def submitted(monkeypatch):
+    jobs = []
+
+    async def submit_job(cls, async_session, file_name, engine, payload):
+        jobs.append(payload)
+        return OptimizationJobSchema(
+            id=uuid.uuid4(),
+            file_name=file_name,
+            engine=engine,
+            status=JobStatus.PENDING,
+            created_at=datetime.now(),
+        )
+
+    monkeypatch.setattr(
+        OptimizationJobService, 'submit_job', classmethod(submit_job)
+    )
+    monkeypatch.setattr(job_runner, 'submit', lambda job_id: None)
+    return jobs
+
+
+def _submit(client, payload):
+    return client.post(
+        '/api/v1/files/jobs/',
+        files=[('excel_file', ('table.csv', payload))],
+    )
+
+
+def test_submit_job_accepts_table(client, submitted):
+    response = _submit(client, CSV)
+
+    assert response.status_code == 202
+    assert submitted == [CSV]
+
+
+def test_submit_job_rejects_oversize_file(client, submitted, monkeypatch):
+    monkeypatch.setattr(config.appconfig, 'upload_max_bytes', len(CSV) - 1)
+
+    response = _submit(client, CSV)
+
+    assert response.status_code == 413
+    assert submitted == []
+
+
+def test_submit_job_rejects_table_over_admission_limits(
+    client, submitted, monkeypatch
+):
+    monkeypatch.setattr(admission_controller, 'max_levels', 2)
+
+    assert _submit(client, CSV).status_code == 422
+
+    monkeypatch.setattr(admission_controller, 'max_levels', 100)
+    monkeypatch.setattr(admission_controller, 'max_cost', 1)
+
+    assert _submit(client, CSV).status_code == 413
+    assert submitted == []
+
+
+def test_run_job_fails_when_compute_deadline_passes(client, monkeypatch):
+    finished = {}
+
+    async def finish(cls, async_session, id, data):
+        finished.update(data)
+
+    monkeypatch.setattr(
+        OptimizationJobRepository, 'finish', classmethod(finish)
+    )
+    monkeypatch.setattr(config.appconfig, 'compute_timeout', 0)
+    job = SimpleNamespace(
+        id=uuid.uuid4(), file_name='table.csv', engine='numpy', payload=CSV
+    )
+
+    client.portal.call(OptimizationJobService._execute, None, job)
+
+    assert finished['status'] == JobStatus.FAILED.value
+    assert finished['error'].startswith('504')
+    assert finished['payload'] is None
+
+
+def test_runner_recovers_unfinished_jobs_and_survives_failures(monkeypatch):
+    pending = [uuid.uuid4(), uuid.uuid4()]
+    submitted_id = uuid.uuid4()
+    started = []
+
+    async def get_unfinished_job_ids(cls, async_session):
+        return pending
+
+    async def run_job(cls, async_session, job_id):
+        started.append(job_id)
+        if job_id == pending[0]:
+            raise RuntimeError("boom")
+
+    monkeypatch.setattr(
+        OptimizationJobService,
+        'get_unfinished_job_ids',
+        classmethod(get_unfinished_job_ids),
+    )
+    monkeypatch.setattr(OptimizationJobService, 'run_job', classmethod(run_job))
+    monkeypatch.setattr(
+        'src.backend.jobs.session_manager', SimpleNamespace(async_session=None)
+    )
+
+    async def scenario():
+        runner = JobRunner(workers=1, recover_interval=60)
+        await runner.start()
+        runner.submit(submitted_id)
+        await asyncio.wait_for(runner._queue.join(), 5)
+        await runner.stop()
+
+    asyncio.run(scenario())
+
+    # Упавшая задача не останавливает обработчик
+    assert started == [*pending, submitted_id]
+
+
+def test_runner_starts_when_recovery_fails(monkeypatch):
+    async def get_unfinished_job_ids(cls, async_session):
+        raise ConnectionRefusedError
+
+    monkeypatch.setattr(
+        OptimizationJobService,
+        'get_unfinished_job_ids',
+        classmethod(get_unfinished_job_ids),
+    )
+    monkeypatch.setattr(
+        'src.backend.jobs.session_manager', SimpleNamespace(async_session=None)
+    )
+
+    async def scenario():
+        runner = JobRunner(workers=1, recover_interval=60)
+        assert await runner._recover() == 0
+        await runner.start()
+        await runner.stop()
+
+    asyncio.run(scenario())
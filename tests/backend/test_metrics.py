@@ -0,0 +1,52 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from src.backend.metrics import observe_profile, observe_stage
+
+
+def _value(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_observe_profile_records_stages_and_input_size():
+    stage = _value(
+        'optimization_pipeline_stage_seconds_count',
+        pipeline='test', stage='optimize',
+    )
+    cells = _value('optimization_input_cells_sum')
+
+    observe_profile('test', {
+        'stages': {'optimize': 0.5, 'stats': 0.1},
+        'enterprises': 3,
+        'levels': 10,
+    })
+    observe_profile('test', None)
+
+    assert _value(
+        'optimization_pipeline_stage_seconds_count',
+        pipeline='test', stage='optimize',
+    ) == stage + 1
+    assert _value('optimization_input_cells_sum') == cells + 30
+
+
+def test_observe_stage_records_failed_stage():
+    before = _value(
+        'optimization_pipeline_stage_seconds_count',
+        pipeline='test', stage='save',
+    )
+
+    with pytest.raises(RuntimeError), observe_stage('test', 'save'):
+        raise RuntimeError
+
+    assert _value(
+        'optimization_pipeline_stage_seconds_count',
+        pipeline='test', stage='save',
+    ) == before + 1
+
+
+def test_api_errors_are_counted_by_class(client):
+    before = _value('api_errors_total', error='BadRequestError')
+
+    client.get('/api/v1/files/investments/', params={'cursor': '////'})
+
+    assert _value('api_errors_total', error='BadRequestError') == before + 1
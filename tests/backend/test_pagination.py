@@ -0,0 +1,89 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.backend.exceptions import BadRequestError
+from src.backend.repositories.investments_results import InvestmentsResultRepository
+from src.backend.services.investments_results import InvestmentsResultService
+
+
+def _summary(index):
+    created_at = datetime(2024, 1, 1) - timedelta(minutes=index)
+    return {
+        'id': uuid.UUID(int=index + 1),
+        'file_name': f'{index}.xlsx',
+        'max_profit': 10.0,
+        'total_investment': 20.0,
+        'roi': 0.5,
+        'created_at': created_at,
+        'updated_at': created_at,
+    }
+
+
+@pytest.fixture
+def stored_rows(monkeypatch):
+    """
+    Подменяет выборку страницы: строки от новых к старым, как в БД.
+    """
+    rows = [_summary(index) for index in range(5)]
+    calls = []
+
+    async def get_page(cls, async_session, limit, after=None, columns=None):
+        calls.append((after, columns))
+        older = [
+            row for row in rows
+            if after is None or (row['created_at'], row['id']) < after
+        ]
+        return older[:limit]
+
+    monkeypatch.setattr(
+        InvestmentsResultRepository, 'get_page', classmethod(get_page)
+    )
+    return calls
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 1, 2, 3, 4, 5, 678)
+    record_id = uuid.uuid4()
+
+    cursor = InvestmentsResultService.encode_cursor(created_at, record_id)
+
+    assert InvestmentsResultService.decode_cursor(cursor) == (
+        created_at, record_id
+    )
+    assert InvestmentsResultService.decode_cursor(None) is None
+
+
+@pytest.mark.parametrize('cursor', ['not base64!', 'bm8tc2VwYXJhdG9y', '////'])
+def test_bad_cursor_is_rejected(cursor):
+    with pytest.raises(BadRequestError):
+        InvestmentsResultService.decode_cursor(cursor)
+
+
+def test_pages_follow_cursor(client, stored_rows):
+    seen = []
+    cursor = None
+    while True:
+        params = {'limit': 2, 'summary': True}
+        if cursor is not None:
+            params['cursor'] = cursor
+        response = client.get('/api/v1/files/investments/', params=params)
+        assert response.status_code == 200
+        page = response.json()
+        seen.extend(item['file_name'] for item in page['items'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+
+    assert seen == [f'{index}.xlsx' for index in range(5)]
+    assert 'distribution' not in page['items'][0]
+    assert stored_rows[0][1] is not None
+
+
+def test_bad_cursor_gives_400(client):
+    response = client.get(
+        '/api/v1/files/investments/', params={'cursor': 'not base64!'}
+    )
+
+    assert response.status_code == 400
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from src.algorithm.progress import OptimizationCancelled
+from src.backend.progress import ProgressHub
+
+
+async def _collect(hub, channel_id):
+    return [event async for event in hub.subscribe(channel_id)]
+
+
+def test_hub_relays_progress_and_cancellation():
+    async def scenario():
+        hub = ProgressHub(retention=60, poll_interval=0.01)
+        try:
+            # Подписчик, пришедший до вычисления, получает все события
+            early = asyncio.create_task(_collect(hub, 'done'))
+            await asyncio.sleep(0)
+            async with hub.track('done') as reporter:
+                reporter.stage('parse')
+                reporter(1, 1)
+            late = await _collect(hub, 'done')
+
+            assert await early == late
+            assert late[0] == {'stage': 'parse'}
+            assert late[1] == {'stage': 'optimize', 'done': 1, 'total': 1}
+            assert late[-1]['status'] == 'succeeded'
+            assert not await hub.cancel('done')
+
+            with pytest.raises(OptimizationCancelled):
+                async with hub.track('cancelled') as reporter:
+                    assert await hub.cancel('cancelled')
+                    reporter(1, 2)
+            events = await _collect(hub, 'cancelled')
+            assert events[-1]['status'] == 'cancelled'
+        finally:
+            hub.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_track_without_id_is_a_no_op():
+    async def scenario():
+        hub = ProgressHub(retention=60)
+        async with hub.track(None) as reporter:
+            assert reporter is None
+        assert not await hub.cancel('missing')
+
+    asyncio.run(scenario())
@@ -0,0 +1,86 @@
+import asyncio
+
+from src.backend.services.read_cache import LAST_INVESTMENT_KEY, ReadCache
+
+
+class _Loader:
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def _get(cache, key, loader):
+    return asyncio.run(cache.get_or_load(key, loader, 'test'))
+
+
+def test_hits_skip_loader_until_ttl():
+    cache = ReadCache(max_size=4, ttl=60)
+    loader = _Loader({'id': 'a'})
+
+    assert _get(cache, 'a', loader) == {'id': 'a'}
+    assert _get(cache, 'a', loader) == {'id': 'a'}
+    assert loader.calls == 1
+
+    expired = ReadCache(max_size=4, ttl=0.01)
+    _get(expired, 'a', loader)
+    asyncio.run(asyncio.sleep(0.02))
+    _get(expired, 'a', loader)
+    assert loader.calls == 3
+
+
+def test_none_is_not_cached():
+    cache = ReadCache(max_size=4, ttl=60)
+    loader = _Loader(None)
+
+    _get(cache, 'a', loader)
+    _get(cache, 'a', loader)
+
+    assert loader.calls == 2
+
+
+def test_least_recently_used_is_evicted():
+    cache = ReadCache(max_size=2, ttl=60)
+    loaders = {key: _Loader(key) for key in 'abc'}
+
+    _get(cache, 'a', loaders['a'])
+    _get(cache, 'b', loaders['b'])
+    _get(cache, 'a', loaders['a'])
+    _get(cache, 'c', loaders['c'])
+    _get(cache, 'a', loaders['a'])
+    _get(cache, 'b', loaders['b'])
+
+    assert loaders['a'].calls == 1
+    assert loaders['b'].calls == 2
+
+
+def test_invalidate_drops_last_and_record():
+    cache = ReadCache(max_size=4, ttl=60)
+    loaders = {key: _Loader(key) for key in (LAST_INVESTMENT_KEY, 'a', 'b')}
+    for key, loader in loaders.items():
+        _get(cache, key, loader)
+
+    cache.invalidate('a')
+    for key, loader in loaders.items():
+        _get(cache, key, loader)
+
+    assert loaders[LAST_INVESTMENT_KEY].calls == 2
+    assert loaders['a'].calls == 2
+    assert loaders['b'].calls == 1
+
+
+def test_value_read_before_invalidation_is_not_cached():
+    cache = ReadCache(max_size=4, ttl=60)
+
+    async def stale():
+        # Запись изменилась, пока читали старое значение
+        cache.invalidate('a')
+        return 'old'
+
+    assert _get(cache, 'a', stale) == 'old'
+    loader = _Loader('new')
+    assert _get(cache, 'a', loader) == 'new'
+    assert loader.calls == 1
@@ -0,0 +1,82 @@
+import asyncio
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.backend.repositories.investments_results import InvestmentsResultRepository
+
+
+class _Session:
+    """
+    Сессия без БД: запоминает пачки параметров executemany и коммиты.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.commits = 0
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, stmt, params):
+        self.chunks.append(params)
+
+    async def commit(self):
+        self.commits += 1
+
+
+def _rows(count):
+    return [{'file_name': f'{index}.xlsx'} for index in range(count)]
+
+
+def test_create_many_sends_chunks_in_one_transaction():
+    session = _Session()
+
+    inserted = asyncio.run(InvestmentsResultRepository.create_many(
+        session, _rows(5), chunk_size=2, returning=False
+    ))
+
+    assert inserted == 5
+    assert [len(chunk) for chunk in session.chunks] == [2, 2, 1]
+    assert session.commits == 1
+
+
+def test_create_many_checks_arguments():
+    session = _Session()
+
+    assert asyncio.run(InvestmentsResultRepository.create_many(
+        session, [], returning=False
+    )) == 0
+    with pytest.raises(ValueError):
+        asyncio.run(InvestmentsResultRepository.create_many(
+            session, _rows(1), use_copy=True
+        ))
+    with pytest.raises(ValueError):
+        asyncio.run(InvestmentsResultRepository.create_many(
+            session, _rows(1), chunk_size=0, returning=False
+        ))
+    assert session.commits == 0
+
+
+def test_keyset_query_orders_newest_first_after_cursor():
+    stmt = InvestmentsResultRepository._keyset_query(
+        after=(datetime(2024, 1, 1), uuid.UUID(int=1)),
+        columns=('id', 'file_name'),
+    )
+
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    assert 'distribution' not in sql
+    assert '(investments_results.created_at, investments_results.id) <' in sql
+    assert sql.endswith(
+        'ORDER BY investments_results.created_at DESC, '
+        'investments_results.id DESC'
+    )
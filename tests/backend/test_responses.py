@@ -0,0 +1,53 @@
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+import orjson
+import pytest
+from pydantic import BaseModel
+
+from src.backend.responses import ORJSONResponse, dumps
+
+
+class _Point(BaseModel):
+    budget: int
+    max_profit: float
+
+
+def test_dumps_handles_numpy_decimal_uuid_and_datetime():
+    record_id = uuid.UUID(int=1)
+
+    content = orjson.loads(dumps({
+        'id': record_id,
+        'created_at': datetime(2024, 1, 2, 3, 4, 5),
+        'max_profit': np.int64(7),
+        'distribution': np.array([10, 0]),
+        'ratio': Decimal('1.5'),
+        'curve': [_Point(budget=10, max_profit=2.5)],
+        'blob': b'\x00',
+        1: 'key',
+    }))
+
+    assert content == {
+        'id': str(record_id),
+        'created_at': '2024-01-02T03:04:05',
+        'max_profit': 7,
+        'distribution': [10, 0],
+        'ratio': 1.5,
+        'curve': [{'budget': 10, 'max_profit': 2.5}],
+        'blob': None,
+        '1': 'key',
+    }
+
+
+def test_dumps_model_uses_its_serializer():
+    point = _Point(budget=10, max_profit=2.5)
+
+    assert orjson.loads(dumps(point)) == point.model_dump(mode="json")
+    assert ORJSONResponse(point).body == dumps(point)
+
+
+def test_dumps_rejects_unknown_types():
+    with pytest.raises(TypeError):
+        dumps({'value': object()})
@@ -0,0 +1,106 @@
+import asyncio
+import uuid
+
+from src.backend.repositories.investments_results import InvestmentsResultRepository
+from src.backend.services.investments_results import InvestmentsResultService
+from src.backend.services.read_cache import InvalidationListener, ReadCache
+from src.backend.services.result_cache import ResultCache, result_cache
+
+CSV = b"0,0,0\n10,5,6\n20,8,9\n"
+
+
+def _upload(client, name, payload):
+    return client.post(
+        '/api/v1/files/upload_file/',
+        files=[('excel_file', (name, payload))],
+    )
+
+
+def test_result_cache_evicts_least_recently_used():
+    cache = ResultCache(max_size=2)
+    cache.put('a', {'max_profit': 1})
+    cache.put('b', {'max_profit': 2})
+    cache.get('a')
+    cache.put('c', {'max_profit': 3})
+
+    assert cache.get('a') == {'max_profit': 1}
+    assert cache.get('b') is None
+    assert cache.get('c') == {'max_profit': 3}
+
+
+def test_repeated_upload_is_served_from_cache_and_saved(client, saved_rows):
+    first = _upload(client, 'a.csv', CSV)
+    # Тот же текст с другим переводом строк: другой файл, та же таблица
+    second = _upload(client, 'b.csv', CSV.replace(b"\n", b"\r\n"))
+    third = _upload(client, 'a.csv', CSV)
+
+    assert first.status_code == second.status_code == third.status_code == 200
+    assert first.json() == second.json() == third.json()
+    assert [row['file_name'] for row in saved_rows] == [
+        'a.csv', 'b.csv', 'a.csv'
+    ]
+    assert saved_rows[1]['content_hash'] == saved_rows[0]['content_hash']
+
+
+def test_batch_saves_cache_hits_like_single_upload(client, saved_rows):
+    _upload(client, 'a.csv', CSV)
+
+    response = client.post(
+        '/api/v1/files/upload_batch/',
+        files=[
+            ('files', ('a.csv', CSV)),
+            ('files', ('b.csv', b"0,0\n10,1\n")),
+        ],
+    )
+
+    assert response.status_code == 200
+    items = response.json()['items']
+    assert [item['error'] for item in items] == [None, None]
+    assert [row['file_name'] for row in saved_rows] == [
+        'a.csv', 'a.csv', 'b.csv'
+    ]
+    assert [row['id'] for row in saved_rows[1:]] == [
+        uuid.UUID(item['id']) for item in items
+    ]
+
+
+def test_delete_investment_drops_cached_results(
+    client, saved_rows, monkeypatch
+):
+    async def get_investment_by_id(cls, async_session, investment_id):
+        return object()
+
+    async def delete_by_id(cls, async_session, id):
+        return None
+
+    monkeypatch.setattr(
+        InvestmentsResultService,
+        'get_investment_by_id',
+        classmethod(get_investment_by_id),
+    )
+    monkeypatch.setattr(
+        InvestmentsResultRepository, 'delete_by_id', classmethod(delete_by_id)
+    )
+    _upload(client, 'a.csv', CSV)
+    assert saved_rows[0]['file_hash'] is not None
+    assert result_cache.get(saved_rows[0]['file_hash']) is not None
+
+    asyncio.run(InvestmentsResultService.delete_investment(
+        async_session=None, investment_id=saved_rows[0]['id']
+    ))
+
+    assert result_cache.get(saved_rows[0]['file_hash']) is None
+
+
+def test_invalidation_listener_clears_results_on_change_only():
+    results = ResultCache(max_size=4)
+    listener = InvalidationListener(
+        cache=ReadCache(max_size=4, ttl=60), dsn='', results=results
+    )
+
+    results.put('hash', {'max_profit': 1})
+    listener._notify(None, 0, 'channel', '')
+    assert results.get('hash') is not None
+
+    listener._notify(None, 0, 'channel', str(uuid.uuid4()))
+    assert results.get('hash') is None
@@ -0,0 +1,43 @@
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+
+from prometheus_client import REGISTRY
+
+from src.backend.warmup import _timed
+
+ROOT = Path(__file__).resolve().parents[2]
+HEAVY_MODULES = ('asyncpg', 'openpyxl', 'pyarrow', 'uvicorn')
+
+
+def test_app_import_skips_heavy_modules():
+    # Отдельный процесс: в этом модули могли загрузить другие тесты
+    code = (
+        "import sys\n"
+        "from src.backend.main import app\n"
+        "from src.backend.db.session import session_manager\n"
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])\n"
+        "print(session_manager._engine)\n"
+    )
+
+    output = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=ROOT,
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout.splitlines()
+
+    assert output == ['[]', 'None']
+
+
+def test_failed_warm_up_stage_does_not_stop_startup():
+    async def unreachable_db():
+        raise ConnectionRefusedError
+
+    asyncio.run(_timed('test_stage', unreachable_db()))
+
+    assert REGISTRY.get_sample_value(
+        'app_startup_seconds', {'stage': 'test_stage'}
+    ) is not None
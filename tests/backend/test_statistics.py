@@ -0,0 +1,72 @@
+from datetime import datetime
+
+import pytest
+
+from src.backend.repositories.investments_results import InvestmentsResultRepository
+
+URL = '/api/v1/files/investments/statistics/'
+FIELDS = ('avg', 'min', 'p50', 'p90', 'p99', 'max')
+
+
+@pytest.fixture
+def aggregates(monkeypatch):
+    """
+    Подменяет агрегаты Postgres и запоминает переданные границы периода.
+    """
+    calls = []
+
+    async def get_statistics(cls, async_session, since=None, until=None):
+        calls.append(('totals', since, until))
+        totals = {'count': 2}
+        for name in ('roi', 'max_profit'):
+            totals.update({f'{name}_{field}': 1.0 for field in FIELDS})
+        return totals
+
+    async def get_enterprise_averages(
+        cls, async_session, bucket, since=None, until=None
+    ):
+        calls.append((bucket, since, until))
+        return [{
+            'bucket': datetime(2024, 1, 1),
+            'enterprise_id': 1,
+            'count': 2,
+            'avg_investment': 10.0,
+            'avg_profit': 5.0,
+            'avg_roi': 0.5,
+        }]
+
+    monkeypatch.setattr(
+        InvestmentsResultRepository, 'get_statistics',
+        classmethod(get_statistics),
+    )
+    monkeypatch.setattr(
+        InvestmentsResultRepository, 'get_enterprise_averages',
+        classmethod(get_enterprise_averages),
+    )
+    return calls
+
+
+def test_statistics_period_is_converted_to_utc(client, aggregates):
+    response = client.get(URL, params={
+        'since': '2024-01-01T03:00:00+03:00',
+        'until': '2024-01-02T00:00:00',
+        'bucket': 'week',
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body['count'] == 2
+    assert body['roi']['p90'] == 1.0
+    assert body['enterprises'][0]['avg_roi'] == 0.5
+    period = (datetime(2024, 1, 1), datetime(2024, 1, 2))
+    assert aggregates == [('totals', *period), ('week', *period)]
+
+
+def test_statistics_rejects_empty_period(client, aggregates):
+    response = client.get(URL, params={
+        'since': '2024-01-02T00:00:00',
+        'until': '2024-01-01T00:00:00',
+    })
+
+    assert response.status_code == 400
+    assert aggregates == []
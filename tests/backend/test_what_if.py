@@ -0,0 +1,42 @@
+import json
+import uuid
+
+import numpy as np
+
+from src.algorithm.profit_table import ProfitTable
+from src.algorithm.what_if import DPState
+from src.backend.services.investments_results import InvestmentsResultService
+
+STATE = DPState.from_table(
+    ProfitTable(np.array([0, 10, 20]), np.array([[0, 0], [5, 6], [8, 9]]))
+).to_bytes()
+
+
+def _what_if(client, monkeypatch, column):
+    async def get_dp_state(cls, async_session, investment_id):
+        return STATE
+
+    monkeypatch.setattr(
+        InvestmentsResultService, 'get_dp_state', classmethod(get_dp_state)
+    )
+    # json.dumps пишет NaN и Infinity как есть — так их пришлёт и клиент
+    return client.post(
+        f'/api/v1/files/investments/{uuid.uuid4()}/what_if/',
+        content=json.dumps({'enterprise_index': 0, 'new_column': column}),
+        headers={'content-type': 'application/json'},
+    )
+
+
+def test_what_if_recomputes_optimum(client, monkeypatch):
+    response = _what_if(client, monkeypatch, [0, 1, 20])
+
+    assert response.status_code == 200
+    assert response.json()['max_profit'] == 20
+
+
+def test_what_if_rejects_non_finite_column(client, monkeypatch):
+    for bad in (float('nan'), float('inf'), float('-inf')):
+        response = _what_if(client, monkeypatch, [0, bad, 2])
+        assert response.status_code == 422
+        detail = response.json()['detail']
+        assert detail[0]['loc'] == ['body', 'new_column', 1]
@@ -0,0 +1,88 @@
+import logging
+
+import orjson
+import pytest
+
+from src.batch.__main__ import main
+from src.batch.runner import (
+    OutputFormat,
+    ParquetWriter,
+    collect_inputs,
+    detect_format,
+    run_batch,
+)
+
+
+@pytest.fixture
+def books(tmp_path):
+    source = tmp_path / "books"
+    (source / "nested").mkdir(parents=True)
+    (source / "a.csv").write_text("0,0,0\n10,5,6\n20,8,9\n")
+    (source / "nested" / "b.csv").write_text("0,0\n10,1\n")
+    (source / "broken.csv").write_text("0,0\n10,x\n")
+    (source / "notes.txt").write_text("не книга")
+    (source / "~$a.xlsx").write_bytes(b"")
+    return source
+
+
+def test_collect_inputs_walks_directories(books):
+    paths = collect_inputs([str(books), str(books / "a.csv")])
+
+    assert [path.split("books")[-1] for path in paths] == [
+        "/a.csv", "/broken.csv", "/nested/b.csv"
+    ]
+
+
+def test_collect_inputs_rejects_missing_source(tmp_path):
+    with pytest.raises(ValueError):
+        collect_inputs([str(tmp_path / "missing")])
+
+
+def test_detect_format():
+    assert detect_format("out.jsonl") is OutputFormat.JSONL
+    assert detect_format("out.ndjson") is OutputFormat.JSONL
+    assert detect_format("out") is OutputFormat.PARQUET
+
+
+def test_run_batch_records_errors_and_resumes(books, tmp_path):
+    output = str(tmp_path / "out.jsonl")
+    paths = collect_inputs([str(books)])
+
+    summary = run_batch(paths, output, OutputFormat.JSONL, workers=1)
+
+    assert summary == {'total': 3, 'skipped': 0, 'succeeded': 2, 'failed': 1}
+    lines = (tmp_path / "out.jsonl").read_bytes().splitlines()
+    records = [orjson.loads(line) for line in lines]
+    by_name = {record['path'].rsplit("/", 1)[-1]: record for record in records}
+    assert by_name['a.csv']['result']['max_profit'] == 11
+    assert by_name['broken.csv']['error']
+
+    summary = run_batch(
+        paths, output, OutputFormat.JSONL, workers=1, resume=True
+    )
+
+    # Успешные книги пропускаются, книга с ошибкой считается заново
+    assert summary == {'total': 3, 'skipped': 2, 'succeeded': 0, 'failed': 1}
+    assert len((tmp_path / "out.jsonl").read_bytes().splitlines()) == 4
+
+
+def test_parquet_resume_skips_truncated_part(books, tmp_path, caplog):
+    pytest.importorskip("pyarrow")
+    output = tmp_path / "out"
+    paths = collect_inputs([str(books / "a.csv")])
+    run_batch(paths, str(output), OutputFormat.PARQUET, workers=1)
+    (output / "part-truncated.parquet").write_bytes(b"PAR1")
+
+    with caplog.at_level(logging.WARNING):
+        done = ParquetWriter.completed(str(output))
+
+    assert done == set(paths)
+    assert "part-truncated.parquet" in caplog.text
+
+
+def test_cli_exit_code_reflects_failures(books, tmp_path, capsys):
+    output = str(tmp_path / "out.jsonl")
+
+    assert main([str(books / "a.csv"), "--output", output, "--workers", "1"]) == 0
+    assert main([str(books), "--output", output, "--workers", "1"]) == 1
+    assert "1 с ошибкой" in capsys.readouterr().out
@@ -0,0 +1,60 @@
+from src.algorithm.engines import _CONCAVE_MIN_LEVELS, _is_exact, is_concave
+from src.benchmarks.__main__ import DEFAULT_BASELINE
+from src.benchmarks.suite import (
+    BenchmarkCase,
+    build_cases,
+    compare_with_baseline,
+    load_json,
+)
+
+
+def test_every_tracked_baseline_case_passes_min_time():
+    baseline = load_json(DEFAULT_BASELINE)
+
+    assert baseline['cases']
+    for name, case in baseline['cases'].items():
+        assert case['median'] * case['number'] >= 0.001, name
+
+
+def test_quick_suite_covers_concave_fast_path():
+    cases = {case.name: case for case in build_cases(quick=True)}
+    concave = [
+        case for case in cases.values()
+        if case.tracked
+        and case.params.get('distribution') == "concave"
+        and case.params['levels'] >= _CONCAVE_MIN_LEVELS
+    ]
+
+    assert concave
+    table = concave[0].setup()
+    assert _is_exact(table.profits)
+    assert all(
+        is_concave(table.profits[:, i]) for i in range(table.num_enterprises)
+    )
+
+
+def test_fast_case_is_looped_to_target_time():
+    calls = []
+    case = BenchmarkCase("noop", lambda: None, calls.append, {}, repeats=3)
+
+    result = case.measure()
+
+    assert result['number'] > 1
+    assert len(calls) == 1 + 3 * result['number']
+
+
+def test_compare_with_baseline_gates_on_loop_time():
+    baseline = {'cases': {
+        'slow': {'median': 0.002, 'number': 1},
+        'looped': {'median': 0.0001, 'number': 50},
+        'tiny': {'median': 0.0001, 'number': 1},
+    }}
+    results = {'cases': {
+        name: {'median': case['median'] * 3}
+        for name, case in baseline['cases'].items()
+    }}
+
+    regressions = compare_with_baseline(results, baseline, threshold=0.5)
+
+    assert [line.split(":")[0] for line in regressions] == ['slow', 'looped']
+    assert regressions[0].endswith("(x3.00)")